@@ -1,6 +1,7 @@
-from ._api import load, prop_dataset
+from ._api import load, load_delta2_batch, prop_dataset
 from ._stats_tools import effsize as effsize
 from ._effsize_objects import TwoGroupsEffectSize, PermutationTest
 from ._dabest_object import Dabest
+from ._delta_objects import DeltaDeltaBatch
 
 __version__ = "2024.03.29"
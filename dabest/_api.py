@@ -1,7 +1,7 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/API/load.ipynb.
 
 # %% auto 0
-__all__ = ['load', 'prop_dataset']
+__all__ = ['load', 'load_delta2_batch', 'prop_dataset']
 
 # %% ../nbs/API/load.ipynb 4
 def load(
@@ -20,6 +20,14 @@ def load(
     experiment_label=None,
     x1_level=None,
     mini_meta=False,
+    per_group_resamples=False,
+    all_pairs=False,
+    sequential_permutations=False,
+    exact_permutations=False,
+    weights=None,
+    legacy_rng=True,
+    resamples_tolerance=0.01,
+    time_budget=None,
 ):
     """
     Loads data in preparation for estimation statistics.
@@ -47,17 +55,38 @@ def load(
         'sequential', then in each tuple of x, each group will be paired up with
         its previous group (as control).
     id_col : default None.
-        Required if `paired` is True.
-    ci : integer, default 95
+        Required if `paired` is True. The observations of the groups of each
+        tuple are matched by `id_col`, in the effect sizes, the slopegraphs
+        and the Sankey diagrams; each subject must have one observation in
+        every group of its tuples.
+    ci : integer or list of integers, default 95
         The confidence interval width. The default of 95 produces 95%
-        confidence intervals.
-    resamples : integer, default 5000.
+        confidence intervals. A list such as `[90, 95, 99]` computes the
+        intervals of every level from the same bootstraps; the first level
+        is reported and plotted, and all of them are listed by the
+        `intervals` of each effect size. Other levels can be obtained later,
+        without resampling, with the `with_ci` method of an effect size.
+    resamples : integer or "auto", default 5000.
         The number of resamples taken to generate the bootstraps which are used
-        to generate the confidence intervals.
-    random_seed : int, default 12345
+        to generate the confidence intervals. With "auto", the bootstraps of
+        every comparison grow in batches of 1000 resamples, each drawn from
+        its own child stream of `random_seed`, until the Monte Carlo standard
+        errors of the confidence interval limits fall below
+        `resamples_tolerance` times the width of the interval, or 100,000
+        resamples are reached. The number of resamples used and the standard
+        error reached (`ci_limits_se`) are added to the results. Not
+        available with `delta2`, `mini_meta`, `per_group_resamples` or
+        `all_pairs`.
+    random_seed : int or numpy.random.SeedSequence, default 12345
         This integer is used to seed the random number generator during
         bootstrap resampling, ensuring that the confidence intervals
-        reported are replicable.
+        reported are replicable. If a `numpy.random.SeedSequence` is given,
+        independent child streams are spawned from it for every comparison,
+        for its bootstraps and its permutations, and for every block of 1000
+        resamples or permutations. The results are then the same however
+        the work is split, e.g. across threads or processes, and whatever
+        the chunk size. With an int, the streams are those of previous
+        versions.
     proportional : boolean, default False.
         An indicator of whether the data is binary or not. When set to True, it
         specifies that the data consists of binary data, where the values are
@@ -80,6 +109,75 @@ def load(
         is True; otherwise it can only be a string.
     mini_meta : boolean, default False
         Indicator of weighted delta calculation.
+    per_group_resamples : boolean, default False
+        Only used for unpaired data. If True, each group is bootstrapped once,
+        with its own random stream derived from `random_seed`, and the
+        mean_diff, median_diff, cohens_d and hedges_g bootstraps of every
+        comparison are assembled from these per-group bootstraps. This scales
+        linearly with the number of groups, but the bootstraps differ from
+        those obtained by resampling each comparison separately.
+    all_pairs : boolean, default False
+        Only used for unpaired data. If True, every group in `idx` is compared
+        with every other group, instead of following the tuple structure of
+        `idx`. Each group is resampled once, as with `per_group_resamples`,
+        and all G·(G-1)/2 contrasts are formed from these shared resamples.
+        The results are available as tables; estimation plots are not drawn.
+    sequential_permutations : boolean or dict, default False
+        If True, each permutation test stops as soon as 10 permutations have
+        given a more extreme effect size than the observed one (Besag and
+        Clifford, 1991), instead of always running all its permutations. A
+        dict sets the options of the sequential test: `exceedances`, the
+        number of extreme permutations after which to stop, and `precision`,
+        a Monte Carlo standard error of the p-value at which to stop as well.
+        The number of permutations used and the standard error of the
+        p-value are added to the results.
+    exact_permutations : boolean, default False
+        If True, the permutation test of a comparison with at most 200,000
+        distinct permutations (2^n sign flips for paired data, C(n0 + n1, n0)
+        relabelings for unpaired data) enumerates all of them, which gives an
+        exact p-value. Larger comparisons use random permutations as usual.
+        The number of permutations used is added to the results.
+    weights : string, default None
+        The name of a column of frequency weights, i.e. the number of
+        observations that each row stands for, so that aggregated data such
+        as (value, count) tables do not need to be expanded. Effect sizes,
+        bootstraps, permutations, statistical tests and plots are computed
+        from the counts of the distinct values of every group; the bootstraps
+        draw these counts from a multinomial distribution. Only for unpaired
+        data, without `delta2`, `mini_meta`, `per_group_resamples` or
+        `all_pairs`. Rows with a weight of zero are ignored.
+    legacy_rng : boolean, default True
+        If True, the bootstraps and the permutations are drawn from
+        `numpy.random.RandomState` generators, and the results are those of
+        previous versions. If False, they are drawn from
+        `numpy.random.Generator`s, which produce all the resamples of a
+        batch at once and are faster for large unpaired designs. The
+        confidence intervals and p-values then differ from the legacy ones
+        by Monte Carlo error only. Data with `weights` are the exception:
+        their resamples and permutations are drawn as counts with either
+        value, and differ from those of the expanded data by Monte Carlo
+        error only.
+    resamples_tolerance : float, default 0.01
+        Only used with `resamples="auto"`. The Monte Carlo standard error of
+        the confidence interval limits at which to stop adding resamples, as
+        a fraction of the width of the interval.
+    time_budget : float, default None
+        A time, in seconds, within which to compute the results of each
+        effect size, e.g. `mean_diff.results`. The time left is split evenly
+        between the comparisons left. Within a comparison, half the time
+        left after the jackknife goes to the bootstraps, drawn in batches of
+        1000 resamples up to `resamples`, and 80% of the time left after
+        them to the permutation test. Until the deadline passes, the
+        resamples and permutations are those drawn without a time budget
+        with the same `random_seed`. The number of resamples, the number of
+        permutations used and their precision (`ci_limits_se` and
+        `pvalue_permutation_se`) are added to the results. At least 1000
+        resamples and 100 permutations are always taken, so the budget may
+        be exceeded for very large data, and the results depend on the
+        speed of the computer. The effect size, its jackknife, the exact
+        bootstraps and permutations and the other statistical tests are not
+        budgeted and are always computed in full. Not available with
+        `delta2`, `mini_meta`, `per_group_resamples` or `all_pairs`.
 
     Returns
     -------
@@ -103,6 +201,100 @@ def load(
         experiment_label,
         x1_level,
         mini_meta,
+        per_group_resamples,
+        all_pairs,
+        sequential_permutations,
+        exact_permutations,
+        weights,
+        legacy_rng,
+        resamples_tolerance,
+        time_budget,
+    )
+
+
+def load_delta2_batch(
+    data,
+    x,
+    y,
+    experiment,
+    experiment_set,
+    paired=None,
+    id_col=None,
+    ci=95,
+    resamples=5000,
+    random_seed=12345,
+    experiment_label=None,
+    x1_level=None,
+    permutation_count=5000,
+    legacy_rng=True,
+):
+    """
+    Loads many independent 2-by-2 experiments from one long-format table and
+    computes the delta-delta and deltas' g of each of them.
+
+    Parameters
+    ----------
+    data : pandas DataFrame.
+        A long-format table with one observation per row.
+    x : string or list
+        The column with the two levels compared within each experiment, as
+        the first element of `x` in `load` with `delta2=True`.
+    y : string
+        The column with the observations.
+    experiment : string
+        The column with the label of the two experiments.
+    experiment_set : string
+        The column naming the experiment set of each observation. Every
+        experiment set is analysed as a separate 2-by-2 experiment.
+    paired : string, default None
+        As in `load`, 'baseline', 'sequential' or None.
+    id_col : default None.
+        Required if `paired` is True. The observations of the control and
+        test groups of each experiment are matched by `id_col`; each subject
+        must have one observation in both groups.
+    ci : integer or list of integers, default 95
+        The confidence interval width. With a list, the first level is
+        reported and all of them are listed in `intervals`.
+    resamples : integer, default 5000.
+        The number of resamples taken to generate the bootstraps.
+    random_seed : int or numpy.random.SeedSequence, default 12345
+        Seeds the bootstrap resampling of every experiment set. A
+        `SeedSequence` also seeds the permutations, and draws the resamples
+        and permutations of every experiment set from the same child
+        streams as `load` with `delta2=True`.
+    experiment_label : list, default None
+        The order of the two experiments. Defaults to the order of
+        appearance in `data`, for all experiment sets.
+    x1_level : list, default None
+        The order of the two levels of `x`. Defaults to the order of
+        appearance in `data`, for all experiment sets.
+    permutation_count : int, default 5000
+        The number of permutations taken for the permutation p-values.
+    legacy_rng : boolean, default True
+        If False, the resamples and the permutations are drawn from
+        `numpy.random.Generator`s instead of `RandomState`s, as in `load`.
+
+    Returns
+    -------
+    A `DeltaDeltaBatch` object, which `forest_plot` accepts as `contrasts`.
+    """
+    from ._delta_objects import DeltaDeltaBatch
+
+    return DeltaDeltaBatch(
+        data,
+        x,
+        y,
+        experiment,
+        experiment_set,
+        paired,
+        id_col,
+        ci,
+        resamples,
+        random_seed,
+        experiment_label,
+        x1_level,
+        permutation_count,
+        legacy_rng,
     )
 
 # %% ../nbs/API/load.ipynb 5
@@ -116,9 +308,17 @@ def prop_dataset(
         list, tuple, np.ndarray, dict
     ],  # Accepts lists, tuples, or numpy ndarrays of numeric types.
     group_names: Optional[list] = None,
+    counts: bool = False,  # If True, returns the numbers of 0s and 1s of every group instead of one row per observation.
 ):
     """
     Convenient function to generate a dataframe of binary data.
+
+    By default, the dataframe is in wide format, with one row per subject
+    and an `ID` column. With `counts=True`, it is in long format, with the
+    columns `group`, `value` and `count` and two rows per group, to be
+    loaded without expansion with
+    `load(df, x="group", y="value", idx=..., weights="count", proportional=True)`.
+    The groups then do not need to have the same size.
     """
 
     if isinstance(group, dict):
@@ -156,6 +356,15 @@ def prop_dataset(
             for i in range(len(group_names))
         }
 
+    if counts:
+        return pd.DataFrame(
+            {
+                "group": np.repeat(list(group_val.keys()), 2),
+                "value": np.tile([0, 1], len(group_val)),
+                "count": np.concatenate([group_val[name] for name in group_val.keys()]),
+            }
+        )
+
     # Check if the sum of values in group_val under each key are the same
     if not all(
         [
@@ -167,15 +376,9 @@ def prop_dataset(
 
     id_col = pd.Series(range(1, sum(group_val[group_names[0]]) + 1))
 
-    final_df = pd.DataFrame()
-
-    for name in group_val.keys():
-        col = (
-            np.repeat(0, group_val[name][0]).tolist()
-            + np.repeat(1, group_val[name][1]).tolist()
-        )
-        df = pd.DataFrame({name: col})
-        final_df = pd.concat([final_df, df], axis=1)
+    final_df = pd.DataFrame(
+        {name: np.repeat([0, 1], group_val[name]) for name in group_val.keys()}
+    )
 
     final_df["ID"] = id_col
 
@@ -6,11 +6,49 @@ __all__ = ['Dabest']
 # %% ../nbs/API/dabest_object.ipynb 4
 # Import standard data science libraries
 from numpy import array, repeat, random, issubdtype, number
+from numpy.random import SeedSequence
 import pandas as pd
 from scipy.stats import norm
 from scipy.stats import randint
 
 # %% ../nbs/API/dabest_object.ipynb 6
+def _subject_matrix(subject_ids, group_codes, n_groups, id_col, tuples):
+    '''
+    Builds the subject x group matrix of a paired design from the `id_col`
+    values and the group codes of its observations. Entry (i, j) is the
+    position of the observation of subject i in group j, or -1 if there is
+    none. Subjects are ordered by their first appearance.
+
+    `tuples` lists the names and the codes of the groups of every `idx`
+    tuple; every subject of a tuple has to be observed in all its groups.
+    Returns the ids of the subjects and the matrix.
+    '''
+    from numpy import arange, full, unique
+
+    subject_codes, subjects = pd.factorize(subject_ids)
+    cells = subject_codes * n_groups + group_codes
+    if len(unique(cells)) != len(cells):
+        err = "Each subject in `{}` must have at most one observation per group in paired data.".format(
+            id_col
+        )
+        raise ValueError(err)
+
+    subject_rows = full((len(subjects), n_groups), -1)
+    subject_rows[subject_codes, group_codes] = arange(len(subject_codes))
+
+    for names, codes in tuples:
+        observed = subject_rows[:, codes] >= 0
+        incomplete = observed.any(axis=1) & ~observed.all(axis=1)
+        if incomplete.any():
+            subject = subjects[incomplete.argmax()]
+            err = "Subject {} of `{}` is not observed in every group of {}.".format(
+                subject, id_col, names
+            )
+            raise ValueError(err)
+
+    return subjects, subject_rows
+
+
 class Dabest(object):
 
     """
@@ -34,6 +72,14 @@ class Dabest(object):
         experiment_label,
         x1_level,
         mini_meta,
+        per_group_resamples=False,
+        all_pairs=False,
+        sequential_permutations=False,
+        exact_permutations=False,
+        weights=None,
+        legacy_rng=True,
+        resamples_tolerance=0.01,
+        time_budget=None,
     ):
         """
         Parses and stores pandas DataFrames in preparation for estimation
@@ -52,6 +98,18 @@ class Dabest(object):
         self.__random_seed = random_seed
         self.__proportional = proportional
         self.__mini_meta = mini_meta
+        self.__all_pairs = all_pairs
+        self.__sequential_permutations = sequential_permutations
+        self.__exact_permutations = exact_permutations
+        self.__weights = weights
+        self.__legacy_rng = legacy_rng
+        self.__resamples_tolerance = resamples_tolerance
+        self.__time_budget = time_budget
+        # All-pairs contrasts are always formed from per-group resamples.
+        self.__per_group_resamples = per_group_resamples or all_pairs
+        self.__group_bootstraps = {}
+        self.__comparison_bootstraps = {}
+        self.__comparison_permutations = {}
 
         # after this call the attributes self.__experiment_label and self.__x1_level are updated
         self._check_errors(x, y, idx, experiment, experiment_label, x1_level)
@@ -151,6 +209,7 @@ class Dabest(object):
 
         self.__plot_data = self._get_plot_data(x, y, all_plot_groups)
         self.__all_plot_groups = all_plot_groups
+        self._index_groups()
 
         # Check if `id_col` is valid
         if self.__is_paired:
@@ -162,11 +221,14 @@ class Dabest(object):
                 err = "{} is not a column in `data`. ".format(id_col)
                 raise IndexError(err)
 
+            self._index_subjects()
+
         self._compute_effectsize_dfs()
 
     def __repr__(self):
         from .__init__ import __version__
         from .misc_tools import print_greeting
+        from ._stats_tools import confint_2group_diff as ci2g
 
         greeting_header = print_greeting()
 
@@ -184,24 +246,18 @@ class Dabest(object):
         }
 
         s1 = "{paired_status}ffect size(s) {rm_status}".format(**first_line)
-        s2 = "with {}% confidence intervals will be computed for:".format(self.__ci)
+        ci_levels = ", ".join(
+            "{}%".format(level) for level in ci2g._ci_levels(self.__ci)
+        )
+        s2 = "with {} confidence intervals will be computed for:".format(ci_levels)
         desc_line = s1 + s2
 
         out = [greeting_header + "\n\n" + desc_line]
 
-        comparisons = []
-
-        if self.__is_paired == "sequential":
-            for j, current_tuple in enumerate(self.__idx):
-                for ix, test_name in enumerate(current_tuple[1:]):
-                    control_name = current_tuple[ix]
-                    comparisons.append("{} minus {}".format(test_name, control_name))
-        else:
-            for j, current_tuple in enumerate(self.__idx):
-                control_name = current_tuple[0]
-
-                for ix, test_name in enumerate(current_tuple[1:]):
-                    comparisons.append("{} minus {}".format(test_name, control_name))
+        comparisons = [
+            "{} minus {}".format(test_name, control_name)
+            for control_name, test_name in self._comparisons
+        ]
 
         if self.__delta2:
             comparisons.append(
@@ -216,10 +272,20 @@ class Dabest(object):
         for j, g in enumerate(comparisons):
             out.append("{}. {}".format(j + 1, g))
 
-        resamples_line1 = "\n{} resamples ".format(self.__resamples)
-        resamples_line2 = "will be used to generate the effect size bootstraps."
+        if self.__resamples == "auto":
+            resamples_line1 = "\nResamples will be added in batches of 1000 "
+            resamples_line2 = "until the confidence intervals are stable."
+        else:
+            resamples_line1 = "\n{} resamples ".format(self.__resamples)
+            resamples_line2 = "will be used to generate the effect size bootstraps."
         out.append(resamples_line1 + resamples_line2)
 
+        if self.__time_budget is not None:
+            out.append(
+                "The resamples and permutations of each effect size are "
+                "limited to a time budget of {} seconds.".format(self.__time_budget)
+            )
+
         return "\n".join(out)
 
     @property
@@ -377,6 +443,32 @@ class Dabest(object):
         """
         return self.__random_seed
 
+    @property
+    def resamples_tolerance(self):
+        """
+        The Monte Carlo standard error of the interval limits at which
+        `resamples="auto"` stops adding resamples, as a fraction of the
+        width of the interval.
+        """
+        return self.__resamples_tolerance
+
+    @property
+    def time_budget(self):
+        """
+        The time, in seconds, within which the results of each effect size
+        are computed, or None.
+        """
+        return self.__time_budget
+
+    @property
+    def legacy_rng(self):
+        """
+        Returns True if the resamples are drawn from `RandomState`
+        generators, as in previous versions, and False if from
+        `numpy.random.Generator`s.
+        """
+        return self.__legacy_rng
+
     @property
     def x(self):
         """
@@ -436,12 +528,452 @@ class Dabest(object):
         """
         return self.__all_plot_groups
 
+    @property
+    def weights(self):
+        """
+        Returns the column of frequency weights, or None if every row is a
+        single observation.
+        """
+        return self.__weights
+
+    @property
+    def per_group_resamples(self):
+        """
+        Returns whether unpaired comparisons are assembled from per-group
+        bootstraps.
+        """
+        return self.__per_group_resamples
+
+    @property
+    def all_pairs(self):
+        """
+        Returns whether every group is compared with every other group.
+        """
+        return self.__all_pairs
+
+    @property
+    def sequential_permutations(self):
+        """
+        Returns the options of the sequential permutation tests, or False if
+        every permutation test runs all its permutations.
+        """
+        return self.__sequential_permutations
+
+    @property
+    def exact_permutations(self):
+        """
+        Returns whether the permutation tests enumerate every distinct
+        permutation of small designs.
+        """
+        return self.__exact_permutations
+
+    @property
+    def _comparisons(self):
+        """
+        Returns the (control, test) pairs of group names that are compared,
+        in the order in which they are reported.
+        """
+        if self.__all_pairs:
+            groups = self.__all_plot_groups
+            return [
+                (control_name, test_name)
+                for i, control_name in enumerate(groups)
+                for test_name in groups[i + 1 :]
+            ]
+
+        comparisons = []
+        for current_tuple in self.__idx:
+            for ix, test_name in enumerate(current_tuple[1:]):
+                if self.__is_paired == "sequential":
+                    control_name = current_tuple[ix]
+                else:
+                    control_name = current_tuple[0]
+                comparisons.append((control_name, test_name))
+        return comparisons
+
+    def _group_bootstraps(self, name, statistic):
+        '''
+        Returns the size of a group and its per-group bootstraps of
+        `statistic`. Each group is resampled once, with its own stream
+        spawned from `random_seed`, and cached for later comparisons.
+        '''
+        from ._stats_tools import confint_2group_diff as ci2g
+
+        key = (name, statistic)
+        if key not in self.__group_bootstraps:
+            x = self._group_data(name).astype(float)
+            index = self.__all_plot_groups.index(name)
+            if isinstance(self.__random_seed, SeedSequence):
+                seed = ci2g._spawn(self.__random_seed, ci2g._GROUP_STREAMS, index)
+            else:
+                seed = SeedSequence(self.__random_seed, spawn_key=(index,))
+            self.__group_bootstraps[key] = (
+                len(x),
+                ci2g.compute_group_bootstraps(
+                    x, statistic, self.__resamples, seed, legacy_rng=self.__legacy_rng
+                ),
+            )
+        return self.__group_bootstraps[key]
+
+    def _group_bootstrap_difference(self, control_name, test_name, effect_size):
+        '''
+        Assembles the bootstrapped unpaired effect size of two groups from
+        their cached per-group bootstraps.
+        '''
+        from ._stats_tools import confint_2group_diff as ci2g
+
+        statistic = ci2g._GROUP_BOOTSTRAP_STATISTICS[effect_size]
+        control_n, control = self._group_bootstraps(control_name, statistic)
+        test_n, test = self._group_bootstraps(test_name, statistic)
+
+        return ci2g.combine_group_bootstraps(
+            control, test, control_n, test_n, effect_size
+        )
+
+    def _all_pairs_bootstraps(self, effect_size):
+        '''
+        Assembles the bootstrapped effect sizes of all pairs of groups at once
+        from their cached per-group bootstraps. Returns a dictionary keyed by
+        the (control, test) pairs of `_comparisons`.
+        '''
+        from numpy import array, stack, triu_indices
+        from ._stats_tools import confint_2group_diff as ci2g
+
+        statistic = ci2g._GROUP_BOOTSTRAP_STATISTICS[effect_size]
+        groups = self.__all_plot_groups
+        sizes, group_bootstraps = zip(
+            *[self._group_bootstraps(name, statistic) for name in groups]
+        )
+        sizes = array(sizes)
+        # One (groups x resamples) matrix per bootstrapped statistic.
+        stacked = [stack(s) for s in zip(*group_bootstraps)]
+
+        control_idx, test_idx = triu_indices(len(groups), k=1)
+        contrasts = ci2g.combine_group_bootstraps(
+            tuple(s[control_idx] for s in stacked),
+            tuple(s[test_idx] for s in stacked),
+            sizes[control_idx],
+            sizes[test_idx],
+            effect_size,
+        )
+
+        return {
+            (groups[c], groups[t]): contrast
+            for c, t, contrast in zip(control_idx, test_idx, contrasts)
+        }
+
+    def _index_groups(self):
+        '''
+        Sorts the observations of `_plot_data` by group once, so that the
+        data of any group is a contiguous slice of one array instead of a
+        scan of the whole table. Rows keep their order within each group.
+        '''
+        from numpy import argsort, bincount, concatenate, cumsum
+
+        groups = self.__plot_data[self.__xvar].cat.categories
+        codes = self.__plot_data[self.__xvar].cat.codes.to_numpy()
+        self.__group_codes = {name: i for i, name in enumerate(groups)}
+        self.__group_order = argsort(codes, kind="stable")
+        self.__group_values = self.__plot_data[self.__yvar].to_numpy()[self.__group_order]
+        # The slices are views; they must not be modified in place.
+        self.__group_values.flags.writeable = False
+        if self.__weights is not None:
+            self.__group_weights = self.__plot_data[self.__weights].to_numpy()[self.__group_order]
+            self.__group_weights.flags.writeable = False
+        bounds = concatenate([[0], cumsum(bincount(codes, minlength=len(groups)))])
+        self.__group_bounds = {
+            name: (bounds[i], bounds[i + 1]) for i, name in enumerate(groups)
+        }
+
+    def _group_data(self, name):
+        '''
+        Returns the observations of a group, in their order in `_plot_data`.
+        '''
+        start, stop = self.__group_bounds[name]
+        return self.__group_values[start:stop]
+
+    def _group_weights(self, name):
+        '''
+        Returns the frequency weights of the observations of a group, in the
+        order of `_group_data`.
+        '''
+        start, stop = self.__group_bounds[name]
+        return self.__group_weights[start:stop]
+
+    def _group_statistic(self, name, statistic):
+        '''
+        Returns the "size", "mean", "median" or "var" (ddof=1) of a group,
+        taking its frequency weights into account.
+        '''
+        from numpy import mean, median, var
+        from ._stats_tools import effsize as es
+
+        data = self._group_data(name)
+        if self.__weights is None:
+            if statistic == "size":
+                return len(data)
+            if statistic == "var":
+                return var(data, ddof=1)
+            return {"mean": mean, "median": median}[statistic](data)
+
+        values, counts, _ = es._pooled_frequency_table(
+            data, self._group_weights(name), data[:0], data[:0]
+        )
+        if statistic == "median":
+            return es._frequency_median(values, counts[None])[0]
+        n, means, ss = es._frequency_moments(values, counts[None])
+        return {"size": n[0], "mean": means[0], "var": ss[0] / (n[0] - 1)}[statistic]
+
+    def _group_rows(self, name):
+        '''
+        Returns the positions in `_plot_data` of the rows of a group.
+        '''
+        start, stop = self.__group_bounds[name]
+        return self.__group_order[start:stop]
+
+    def _index_subjects(self):
+        '''
+        Builds the subject x group matrix of a paired design, keyed by
+        `id_col`. Entry (i, j) is the position in `_plot_data` of the
+        observation of subject i in group j, or -1 if there is none.
+        Subjects are ordered by their first appearance in `_plot_data`.
+        '''
+        plot_data = self.__plot_data
+        # Every subject of an `idx` tuple has to be observed in all its groups.
+        subjects, subject_rows = _subject_matrix(
+            plot_data[self.__id_col],
+            plot_data[self.__xvar].cat.codes.to_numpy(),
+            len(self.__group_codes),
+            self.__id_col,
+            [
+                (current_tuple, [self.__group_codes[name] for name in current_tuple])
+                for current_tuple in self.__idx
+            ],
+        )
+
+        self.__subjects = subjects
+        self.__subject_rows = subject_rows
+        self.__plot_values = plot_data[self.__yvar].to_numpy()
+
+    def _subject_rows(self, groups):
+        '''
+        Returns the positions in `_plot_data` of the observations of the
+        subjects observed in all `groups`, as a (subjects x groups) array
+        aligned by `id_col`, and the ids of these subjects.
+        '''
+        rows = self.__subject_rows[:, [self.__group_codes[name] for name in groups]]
+        observed = (rows >= 0).all(axis=1)
+        return rows[observed], self.__subjects[observed]
+
+    def _comparison_data(self, control_name, test_name):
+        '''
+        Returns the control and test arrays of a comparison. The arrays of
+        a paired comparison are aligned by subject.
+        '''
+        if self.__is_paired:
+            rows, _ = self._subject_rows([control_name, test_name])
+            return self.__plot_values[rows[:, 0]], self.__plot_values[rows[:, 1]]
+        return self._group_data(control_name), self._group_data(test_name)
+
+    def _comparison_weights(self, control_name, test_name):
+        '''
+        Returns the frequency weights of the control and test arrays of a
+        comparison.
+        '''
+        return self._group_weights(control_name), self._group_weights(test_name)
+
+    def _comparison_seed(self, control_name, test_name, *stage):
+        '''
+        Returns the seed of a comparison: `random_seed` itself if it is an
+        int, or the child stream of the comparison, and of its `stage`, if
+        it is a `numpy.random.SeedSequence`.
+        '''
+        from ._stats_tools import confint_2group_diff as ci2g
+
+        k = self._comparisons.index((control_name, test_name))
+        return ci2g._spawn(self.__random_seed, ci2g._COMPARISON_STREAMS, k, *stage)
+
+    def _shared_bootstraps(self, control_name, test_name, effect_size):
+        '''
+        Returns the bootstraps of `effect_size` for a comparison, shared by
+        all the effect sizes of this object. mean_diff and cohens_d are
+        evaluated on the same resamples, which are drawn once; hedges_g and
+        delta_g are the cached cohens_d bootstraps times the Hedges correction.
+        '''
+        from ._stats_tools import confint_2group_diff as ci2g
+        from ._stats_tools.effsize import _compute_hedges_correction_factor
+
+        cache = self.__comparison_bootstraps.setdefault((control_name, test_name), {})
+        if effect_size in cache:
+            return cache[effect_size]
+
+        control, test = self._comparison_data(control_name, test_name)
+        bootstrap_kwargs = dict(
+            x0=control,
+            x1=test,
+            is_paired=self.__is_paired,
+            resamples=self.__resamples,
+            random_seed=self._comparison_seed(
+                control_name, test_name, ci2g._BOOTSTRAP_STREAM
+            ),
+            legacy_rng=self.__legacy_rng,
+        )
+
+        if effect_size in ["hedges_g", "delta_g"]:
+            correction_factor = _compute_hedges_correction_factor(len(control), len(test))
+            cohens_d = self._shared_bootstraps(control_name, test_name, "cohens_d")
+            cache[effect_size] = correction_factor * cohens_d
+        elif (effect_size in ["mean_diff", "cohens_d"] and self.__is_paired
+              and not isinstance(self.__random_seed, SeedSequence)):
+            # The comparisons of a tuple draw the same subjects, unless each
+            # comparison has its own stream.
+            try:
+                self._share_paired_bootstraps(control_name, test_name)
+            except ValueError:
+                cache[effect_size] = ci2g.compute_bootstrapped_diff(
+                    effect_size=effect_size, **bootstrap_kwargs
+                )
+        elif effect_size in ["mean_diff", "cohens_d"]:
+            try:
+                cache.update(
+                    ci2g.compute_bootstrapped_diffs(
+                        effect_sizes=["mean_diff", "cohens_d"], **bootstrap_kwargs
+                    )
+                )
+            except ValueError:
+                # e.g. Cohen's d is undefined; let the requested effect size
+                # succeed or fail on its own.
+                cache[effect_size] = ci2g.compute_bootstrapped_diff(
+                    effect_size=effect_size, **bootstrap_kwargs
+                )
+        else:
+            cache[effect_size] = ci2g.compute_bootstrapped_diff(
+                effect_size=effect_size, **bootstrap_kwargs
+            )
+
+        return cache[effect_size]
+
+    def _share_paired_bootstraps(self, control_name, test_name):
+        '''
+        Bootstraps mean_diff and cohens_d for all the paired comparisons of
+        the `idx` tuple of a comparison at once, with one draw of the
+        subjects per resample, and caches them for every comparison.
+        '''
+        from ._stats_tools import confint_2group_diff as ci2g
+
+        current_tuple = next(t for t in self.__idx if control_name in t and test_name in t)
+        comparisons = [c for c in self._comparisons if c[0] in current_tuple]
+        rows, _ = self._subject_rows(current_tuple)
+        columns = {name: j for j, name in enumerate(current_tuple)}
+
+        bootstraps = ci2g.compute_paired_bootstrapped_diffs(
+            self.__plot_values[rows],
+            [(columns[c], columns[t]) for c, t in comparisons],
+            ["mean_diff", "cohens_d"],
+            self.__resamples,
+            self.__random_seed,
+            legacy_rng=self.__legacy_rng,
+        )
+        for comparison, comparison_bootstraps in zip(comparisons, bootstraps):
+            cache = self.__comparison_bootstraps.setdefault(comparison, {})
+            for effect_size, boots in comparison_bootstraps.items():
+                cache.setdefault(effect_size, boots)
+
+    def _shared_permutation_moments(self, control_name, test_name, permutation_count):
+        '''
+        Returns the means and variances of the permuted groups of a
+        comparison, shared by the permutation tests of all mean-based
+        effect sizes of this object.
+        '''
+        from ._effsize_objects import _permutation_moments
+        from ._stats_tools import confint_2group_diff as ci2g
+
+        key = (control_name, test_name, permutation_count)
+        if key not in self.__comparison_permutations:
+            control, test = self._comparison_data(control_name, test_name)
+            # The permutation tests of `TwoGroupsEffectSize` use the default
+            # seed of `PermutationTest` for any int `random_seed`.
+            if isinstance(self.__random_seed, SeedSequence):
+                seed = dict(random_seed=self._comparison_seed(
+                    control_name, test_name, ci2g._PERMUTATION_STREAM
+                ))
+            else:
+                seed = {}
+            self.__comparison_permutations[key] = _permutation_moments(
+                control, test, self.__is_paired, permutation_count,
+                legacy_rng=self.__legacy_rng, **seed
+            )
+        return self.__comparison_permutations[key]
+
     def _check_errors(self, x, y, idx, experiment, experiment_label, x1_level):
         '''
         Function to check some input parameters and combinations between them.
         At the end of this function these two class attributes are updated
                 self.__experiment_label and self.__x1_level
         '''
+        # Check if it is a valid all_pairs case
+        if self.__all_pairs:
+            if self.__is_paired:
+                err0 = "`paired` and `all_pairs` cannot be used at the same time."
+                raise ValueError(err0)
+            if self.__delta2 or self.__mini_meta:
+                err0 = "`all_pairs` cannot be used with `delta2` or `mini_meta`."
+                raise ValueError(err0)
+
+        # Frequency weights describe independent observations, and are
+        # resampled group by group.
+        if self.__weights is not None:
+            if self.__is_paired:
+                err0 = "`weights` cannot be used with `paired` data."
+                raise ValueError(err0)
+            if self.__delta2 or self.__mini_meta:
+                err0 = "`weights` cannot be used with `delta2` or `mini_meta`."
+                raise ValueError(err0)
+            if self.__per_group_resamples:
+                err0 = "`weights` cannot be used with `per_group_resamples` or `all_pairs`."
+                raise ValueError(err0)
+
+        # Check if the options of the sequential permutation tests are valid
+        if isinstance(self.__sequential_permutations, dict):
+            unknown = set(self.__sequential_permutations) - {"exceedances", "precision"}
+            if unknown:
+                err0 = "`sequential_permutations` only accepts the options `exceedances` and `precision`."
+                raise ValueError(err0)
+        elif not isinstance(self.__sequential_permutations, bool):
+            err0 = "`sequential_permutations` must be a boolean or a dict."
+            raise ValueError(err0)
+
+        # Check if the number of resamples is valid
+        if isinstance(self.__resamples, str) and self.__resamples != "auto":
+            err0 = "`resamples` must be an integer or 'auto'."
+            raise ValueError(err0)
+
+        # delta2 and mini_meta combine the bootstraps of their comparisons
+        # one by one, and per-group bootstraps are shared between
+        # comparisons, so they all need the same number of resamples.
+        if self.__resamples == "auto":
+            if self.__delta2 or self.__mini_meta or self.__per_group_resamples:
+                err0 = "`resamples='auto'` cannot be used with `delta2`, `mini_meta`, `per_group_resamples` or `all_pairs`."
+                raise ValueError(err0)
+
+        # Check if the time budget is valid
+        if self.__time_budget is not None:
+            if (isinstance(self.__time_budget, bool)
+                    or not issubdtype(type(self.__time_budget), number)
+                    or not self.__time_budget > 0):
+                err0 = "`time_budget` must be a positive number of seconds."
+                raise ValueError(err0)
+            if self.__delta2 or self.__mini_meta or self.__per_group_resamples:
+                err0 = "`time_budget` cannot be used with `delta2`, `mini_meta`, `per_group_resamples` or `all_pairs`."
+                raise ValueError(err0)
+
+        # delta2 and mini_meta combine the permutations of their comparisons
+        # one by one, so every comparison needs the same random permutations.
+        if self.__sequential_permutations or self.__exact_permutations:
+            if self.__delta2 or self.__mini_meta:
+                err0 = "`sequential_permutations` and `exact_permutations` cannot be used with `delta2` or `mini_meta`."
+                raise ValueError(err0)
+
         # Check if it is a valid mini_meta case
         if self.__mini_meta:
             # Only mini_meta calculation but not proportional and delta-delta function
@@ -541,8 +1073,9 @@ class Dabest(object):
                     err0 = "`experiment_label` does not have a length of 2."
                     raise ValueError(err0)
 
+                experiments = set(self.__output_data[experiment].unique())
                 for i in experiment_label:
-                    if i not in self.__output_data[experiment].unique():
+                    if i not in experiments:
                         err = "{0} is not an element in the column `{1}` of `data`. Please check.".format(
                             i, experiment
                         )
@@ -556,8 +1089,9 @@ class Dabest(object):
                     err0 = "`x1_level` does not have a length of 2."
                     raise ValueError(err0)
 
+                x1_levels = set(self.__output_data[x[0]].unique())
                 for i in x1_level:
-                    if i not in self.__output_data[x[0]].unique():
+                    if i not in x1_levels:
                         err = "{0} is not an element in the column `{1}` of `data`. Please check.".format(
                             i, experiment
                         )
@@ -603,8 +1137,9 @@ class Dabest(object):
                 raise ValueError(err)
 
             # check all the idx can be found in self.__output_data[x]
+            x_groups = set(self.__output_data[x].unique())
             for g in all_plot_groups:
-                if g not in self.__output_data[x].unique():
+                if g not in x_groups:
                     err0 = '"{0}" is not a group in the column `{1}`.'.format(g, x)
                     err1 = " Please check `idx` and try again."
                     raise IndexError(err0 + err1)
@@ -658,6 +1193,9 @@ class Dabest(object):
         # Added in v0.2.7.
         plot_data.dropna(axis=0, how="any", subset=[self.__yvar], inplace=True)
 
+        if self.__weights is not None:
+            plot_data = self._check_weights(plot_data)
+
 
         if isinstance(plot_data[self.__xvar].dtype, pd.CategoricalDtype):
             plot_data[self.__xvar].cat.remove_unused_categories(inplace=True)
@@ -671,6 +1209,29 @@ class Dabest(object):
 
         return plot_data
 
+    def _check_weights(self, plot_data):
+        """
+        Checks the column of frequency weights, and drops the rows that
+        have a weight of zero.
+        """
+        if self.__weights not in plot_data.columns:
+            err = "{0} is not a column in `data`. Please check.".format(self.__weights)
+            raise IndexError(err)
+
+        weights = plot_data[self.__weights]
+        if not issubdtype(weights.dtype, number) or weights.isnull().any():
+            err = "The weights in `{0}` must be numeric, without missing values.".format(
+                self.__weights
+            )
+            raise ValueError(err)
+        if (weights < 0).any() or (weights % 1 != 0).any():
+            err = "The weights in `{0}` must be non-negative whole numbers of observations.".format(
+                self.__weights
+            )
+            raise ValueError(err)
+
+        return plot_data[weights > 0]
+
     def _compute_effectsize_dfs(self):
         '''
         Function to compute all attributes based on EffectSizeDataFrame.
@@ -689,6 +1250,11 @@ class Dabest(object):
             x1_level=self.__x1_level,
             x2=self.__x2,
             mini_meta=self.__mini_meta,
+            sequential_permutations=self.__sequential_permutations,
+            exact_permutations=self.__exact_permutations,
+            legacy_rng=self.__legacy_rng,
+            resamples_tolerance=self.__resamples_tolerance,
+            time_budget=self.__time_budget,
         )
 
         self.__mean_diff = EffectSizeDataFrame(
@@ -1,14 +1,14 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/API/delta_objects.ipynb.
 
 # %% auto 0
-__all__ = ['DeltaDelta', 'MiniMetaDelta']
+__all__ = ['DeltaDelta', 'MiniMetaDelta', 'DeltaDeltaBatch']
 
 # %% ../nbs/API/delta_objects.ipynb 5
 from scipy.stats import norm
 import pandas as pd
 import numpy as np
-from numpy import sort as npsort
 from numpy import isnan
+from numpy.random import SeedSequence
 from string import Template
 import warnings
 import datetime as dt
@@ -52,10 +52,11 @@ class DeltaDelta(object):
 
         self.__effsizedf = effectsizedataframe.results
         self.__dabest_obj = effectsizedataframe.dabest_obj
-        self.__ci = ci
+        self.__ci_levels = ci2g._ci_levels(ci)
+        self.__ci = self.__ci_levels[0]
         self.__resamples = effectsizedataframe.resamples
         self.__effect_size = effectsizedataframe.effect_size
-        self.__alpha = ci2g._compute_alpha_from_ci(ci)
+        self.__alpha = ci2g._compute_alpha_from_ci(self.__ci)
         self.__permutation_count = permutation_count
         self.__bootstraps = np.array(self.__effsizedf["bootstraps"])
         self.__control = self.__dabest_obj.experiment_label[0]
@@ -71,28 +72,29 @@ class DeltaDelta(object):
             self.__bootstraps_delta_delta = bootstraps_delta_delta[0]
             self.__difference = bootstraps_delta_delta[1]
 
-        sorted_delta_delta = npsort(self.__bootstraps_delta_delta)
-
-        self.__bias_correction = ci2g.compute_meandiff_bias_correction(
-            self.__bootstraps_delta_delta, self.__difference
-        )
-
         self.__jackknives = np.array(
             ci1g.compute_1group_jackknife(self.__bootstraps_delta_delta, np.mean)
         )
 
         self.__acceleration_value = ci2g._calc_accel(self.__jackknives)
 
-        # Compute BCa intervals.
-        bca_idx_low, bca_idx_high = ci2g.compute_interval_limits(
-            self.__bias_correction, self.__acceleration_value, self.__resamples, ci
+        # Compute the BCa and percentile intervals of every level.
+        self.__bias_correction, levels = ci2g.compute_intervals(
+            self.__bootstraps_delta_delta,
+            self.__difference,
+            self.__acceleration_value,
+            self.__ci_levels,
+            self.__resamples,
         )
+        self.__intervals = ci2g._interval_table(levels, self.__difference)
+        primary = levels[0]
 
+        bca_idx_low, bca_idx_high = primary["bca_interval_idx"]
         self.__bca_interval_idx = (bca_idx_low, bca_idx_high)
 
         if ~isnan(bca_idx_low) and ~isnan(bca_idx_high):
-            self.__bca_low = sorted_delta_delta[bca_idx_low]
-            self.__bca_high = sorted_delta_delta[bca_idx_high]
+            self.__bca_low = primary["bca_low"]
+            self.__bca_high = primary["bca_high"]
 
             err1 = "The $lim_type limit of the interval"
             err2 = "was in the $loc 10 values."
@@ -123,13 +125,9 @@ class DeltaDelta(object):
                 self.__bca_high = self.__difference
                 warnings.warn(err_temp.substitute(lim_type="upper"), stacklevel=0)
 
-        # Compute percentile intervals.
-        pct_idx_low = int((self.__alpha / 2) * self.__resamples)
-        pct_idx_high = int((1 - (self.__alpha / 2)) * self.__resamples)
-
-        self.__pct_interval_idx = (pct_idx_low, pct_idx_high)
-        self.__pct_low = sorted_delta_delta[pct_idx_low]
-        self.__pct_high = sorted_delta_delta[pct_idx_high]
+        self.__pct_interval_idx = primary["pct_interval_idx"]
+        self.__pct_low = primary["pct_low"]
+        self.__pct_high = primary["pct_high"]
 
     def __permutation_test(self):
         """
@@ -228,6 +226,14 @@ class DeltaDelta(object):
         """
         return self.__alpha
 
+    @property
+    def intervals(self):
+        """
+        Returns a `pandas.DataFrame`, indexed by confidence level, with the
+        BCa and percentile limits of every level in `ci`.
+        """
+        return self.__intervals
+
     @property
     def bias_correction(self):
         return self.__bias_correction
@@ -367,9 +373,10 @@ class MiniMetaDelta(object):
         
         self.__effsizedf         = effectsizedataframe.results
         self.__dabest_obj        = effectsizedataframe.dabest_obj
-        self.__ci                = ci
+        self.__ci_levels         = ci2g._ci_levels(ci)
+        self.__ci                = self.__ci_levels[0]
         self.__resamples         = effectsizedataframe.resamples
-        self.__alpha             = ci2g._compute_alpha_from_ci(ci)
+        self.__alpha             = ci2g._compute_alpha_from_ci(self.__ci)
         self.__permutation_count = permutation_count
         self.__bootstraps        = np.array(self.__effsizedf["bootstraps"])
         self.__control           = np.array(self.__effsizedf["control"])
@@ -379,20 +386,17 @@ class MiniMetaDelta(object):
 
 
         idx  = self.__dabest_obj.idx
-        dat  = self.__dabest_obj._plot_data
-        xvar = self.__dabest_obj._xvar
-        yvar = self.__dabest_obj._yvar
 
         # compute the variances of each control group and each test group
         control_var=[]
         test_var=[]
         for j, current_tuple in enumerate(idx):
             cname = current_tuple[0]
-            control = dat[dat[xvar] == cname][yvar].copy()
+            control = self.__dabest_obj._group_data(cname)
             control_var.append(np.var(control, ddof=1))
 
             tname = current_tuple[1]
-            test = dat[dat[xvar] == tname][yvar].copy()
+            test = self.__dabest_obj._group_data(tname)
             test_var.append(np.var(test, ddof=1))
         self.__control_var = np.array(control_var)
         self.__test_var    = np.array(test_var)
@@ -415,28 +419,25 @@ class MiniMetaDelta(object):
         self.__difference = es.weighted_delta(self.__effsizedf["difference"],
                                                    self.__group_var)
 
-        sorted_weighted_deltas = npsort(self.__bootstraps_weighted_delta)
-
-
-        self.__bias_correction = ci2g.compute_meandiff_bias_correction(
-                                    self.__bootstraps_weighted_delta, self.__difference)
-        
         self.__jackknives = np.array(ci1g.compute_1group_jackknife(
                                                 self.__bootstraps_weighted_delta, 
                                                 np.mean))
 
         self.__acceleration_value = ci2g._calc_accel(self.__jackknives)
 
-        # Compute BCa intervals.
-        bca_idx_low, bca_idx_high = ci2g.compute_interval_limits(
-            self.__bias_correction, self.__acceleration_value,
-            self.__resamples, ci)
-        
+        # Compute the BCa and percentile intervals of every level.
+        self.__bias_correction, levels = ci2g.compute_intervals(
+            self.__bootstraps_weighted_delta, self.__difference,
+            self.__acceleration_value, self.__ci_levels, self.__resamples)
+        self.__intervals = ci2g._interval_table(levels, self.__difference)
+        primary = levels[0]
+
+        bca_idx_low, bca_idx_high = primary["bca_interval_idx"]
         self.__bca_interval_idx = (bca_idx_low, bca_idx_high)
 
         if ~isnan(bca_idx_low) and ~isnan(bca_idx_high):
-            self.__bca_low  = sorted_weighted_deltas[bca_idx_low]
-            self.__bca_high = sorted_weighted_deltas[bca_idx_high]
+            self.__bca_low  = primary["bca_low"]
+            self.__bca_high = primary["bca_high"]
 
             err1 = "The $lim_type limit of the interval"
             err2 = "was in the $loc 10 values."
@@ -469,13 +470,9 @@ class MiniMetaDelta(object):
                 warnings.warn(err_temp.substitute(lim_type="upper"),
                               stacklevel=0)
 
-        # Compute percentile intervals.
-        pct_idx_low  = int((self.__alpha/2)     * self.__resamples)
-        pct_idx_high = int((1-(self.__alpha/2)) * self.__resamples)
-
-        self.__pct_interval_idx = (pct_idx_low, pct_idx_high)
-        self.__pct_low          = sorted_weighted_deltas[pct_idx_low]
-        self.__pct_high         = sorted_weighted_deltas[pct_idx_high]
+        self.__pct_interval_idx = primary["pct_interval_idx"]
+        self.__pct_low          = primary["pct_low"]
+        self.__pct_high         = primary["pct_high"]
         
     
 
@@ -484,27 +481,19 @@ class MiniMetaDelta(object):
         Perform a permutation test and obtain the permutation p-value
         based on the permutation data.
         """
+        from ._stats_tools import confint_2group_diff as ci2g
+
         self.__permutations     = np.array(self.__effsizedf["permutations"])
         self.__permutations_var = np.array(self.__effsizedf["permutations_var"])
 
         THRESHOLD = np.abs(self.__difference)
 
-        all_num = []
-        all_denom = []
+        # Each permutation is weighted by its own pooled group variances.
+        self.__permutations_weighted_delta = ci2g.calculate_weighted_delta(
+                                                          self.__permutations_var,
+                                                          self.__permutations)
 
-        groups = len(self.__permutations)
-        for i in range(0, len(self.__permutations[0])):
-            weight = [1/self.__permutations_var[j][i] for j in range(0, groups)]
-            all_num.append(np.sum([weight[j]*self.__permutations[j][i] for j in range(0, groups)]))
-            all_denom.append(np.sum(weight))
-        
-        output=[]
-        for i in range(0, len(all_num)):
-            output.append(all_num[i]/all_denom[i])
-        
-        self.__permutations_weighted_delta = np.array(output)
-
-        count = sum(np.abs(self.__permutations_weighted_delta)>THRESHOLD)
+        count = np.count_nonzero(np.abs(self.__permutations_weighted_delta)>THRESHOLD)
         self.__pvalue_permutation = count/self.__permutation_count
 
 
@@ -596,6 +585,15 @@ class MiniMetaDelta(object):
         return self.__alpha
 
 
+    @property
+    def intervals(self):
+        """
+        Returns a `pandas.DataFrame`, indexed by confidence level, with the
+        BCa and percentile limits of every level in `ci`.
+        """
+        return self.__intervals
+
+
     @property
     def bias_correction(self):
         return self.__bias_correction
@@ -799,3 +797,379 @@ class MiniMetaDelta(object):
             return self.__permutations_weighted_delta
 
 
+
+class DeltaDeltaBatch(object):
+    """
+    A class to compute and store the delta-delta and deltas' g statistics of
+    many independent 2-by-2 experiments at once. The experiments are given in
+    one long-format table, in which a column names the experiment set of
+    each observation; every experiment set is divided into the four groups of
+    a `DeltaDelta` by the levels of `x` and `experiment`. In paired data, the
+    control and test groups of each experiment are aligned by `id_col`.
+
+    Experiment sets with the same group sizes are bootstrapped and permuted
+    together, with the same resample and permutation indexes. The statistics
+    of each experiment set are therefore those obtained by loading it on its
+    own with `delta2=True` and the same `experiment_label`, `x1_level`,
+    `resamples`, `random_seed` and `legacy_rng`.
+    """
+
+    def __init__(
+        self,
+        data,
+        x,
+        y,
+        experiment,
+        experiment_set,
+        paired=None,
+        id_col=None,
+        ci=95,
+        resamples=5000,
+        random_seed=12345,
+        experiment_label=None,
+        x1_level=None,
+        permutation_count=5000,
+        legacy_rng=True,
+    ):
+        from ._stats_tools import confint_2group_diff as ci2g
+        from ._stats_tools import effsize as es
+        from ._effsize_objects import (
+            _batch_permutation_moments,
+            _permutation_chunks_from_moments,
+        )
+        from ._dabest_object import _subject_matrix
+
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError("The `data` argument must be a pandas DataFrame.")
+
+        x1 = x[0] if isinstance(x, (list, tuple)) else x
+        columns = [x1, y, experiment, experiment_set]
+        if paired is not None:
+            if paired not in ("baseline", "sequential"):
+                err0 = "{} assigned for `paired` is not valid.".format(paired)
+                err1 = " Please choose from None, 'baseline' or 'sequential'."
+                raise ValueError(err0 + err1)
+            if id_col is None:
+                err = "`id_col` must be specified if `paired` is assigned with a not NoneType value."
+                raise IndexError(err)
+            columns.append(id_col)
+        for column in columns:
+            if column not in data.columns:
+                err = "{0} is not a column in `data`. Please check.".format(column)
+                raise IndexError(err)
+        if not np.issubdtype(data[y].dtype, np.number):
+            err = "{0} is a column in `data`, but it is not numeric.".format(y)
+            raise ValueError(err)
+
+        x1_level = self.__check_levels(data, x1, x1_level, "x1_level")
+        experiment_label = self.__check_levels(
+            data, experiment, experiment_label, "experiment_label"
+        )
+
+        self.__x1_level = x1_level
+        self.__experiment_label = experiment_label
+        self.__experiment_sets = data[experiment_set].unique().tolist()
+        self.__is_paired = paired
+        self.__ci_levels = ci2g._ci_levels(ci)
+        self.__ci = self.__ci_levels[0]
+        self.__resamples = resamples
+        self.__random_seed = random_seed
+        self.__legacy_rng = legacy_rng
+        self.__permutation_count = permutation_count
+
+        # Split every experiment set into its four groups, ordered as the
+        # control and test groups of the two experiments. The groups of a
+        # paired experiment are aligned by `id_col`, as in `Dabest`.
+        group_levels = [(exp, level) for exp in experiment_label for level in x1_level]
+        group_names = ["{} {}".format(level, exp) for exp, level in group_levels]
+        set_groups = {}
+        for name, set_data in data.groupby(experiment_set, sort=False):
+            if paired:
+                removed = set_data[set_data[y].isnull()][id_col]
+                set_data = set_data[~set_data[id_col].isin(removed)]
+            else:
+                set_data = set_data[set_data[y].notnull()]
+            group_codes = np.full(len(set_data), -1)
+            for k, (exp, level) in enumerate(group_levels):
+                in_group = (set_data[x1] == level) & (set_data[experiment] == exp)
+                if not in_group.any():
+                    err = 'Experiment set "{}" has no observations for {} in {}.'.format(
+                        name, level, exp
+                    )
+                    raise ValueError(err)
+                group_codes[in_group.to_numpy()] = k
+            set_data = set_data[group_codes >= 0]
+            group_codes = group_codes[group_codes >= 0]
+            values = set_data[y].to_numpy(dtype=float)
+
+            if paired:
+                _, subject_rows = _subject_matrix(
+                    set_data[id_col], group_codes, 4, id_col,
+                    [(group_names[k:k + 2], [k, k + 1]) for k in (0, 2)],
+                )
+                groups = []
+                for k in (0, 2):
+                    rows = subject_rows[:, [k, k + 1]]
+                    rows = rows[(rows >= 0).all(axis=1)]
+                    groups.extend([values[rows[:, 0]], values[rows[:, 1]]])
+            else:
+                groups = [values[group_codes == k] for k in range(4)]
+            set_groups[name] = groups
+
+        # As in `Dabest`, the permutations of the two comparisons use the
+        # default seed of `PermutationTest` for any int `random_seed`, and
+        # the child streams of the comparisons for a `SeedSequence`.
+        if isinstance(random_seed, SeedSequence):
+            permutation_seeds = [
+                dict(random_seed=ci2g._spawn(random_seed, ci2g._COMPARISON_STREAMS, j,
+                                             ci2g._PERMUTATION_STREAM))
+                for j in range(2)
+            ]
+        else:
+            permutation_seeds = [{}, {}]
+
+        signatures = {}
+        for name, groups in set_groups.items():
+            signatures.setdefault(tuple(len(g) for g in groups), []).append(name)
+
+        stats = {}
+        for lens, names in signatures.items():
+            stacked = [
+                np.stack([set_groups[name][k] for name in names]) for k in range(4)
+            ]
+            bootstraps_delta_g, delta_g, bootstraps_delta_delta = (
+                ci2g._batch_delta2_bootstrapped_diff(
+                    *stacked,
+                    is_paired=paired,
+                    resamples=resamples,
+                    random_seed=ci2g._spawn(random_seed, ci2g._DELTA2_STREAMS),
+                    legacy_rng=legacy_rng,
+                )
+            )
+            moments = [
+                _batch_permutation_moments(
+                    stacked[k], stacked[k + 1], paired, permutation_count,
+                    legacy_rng=legacy_rng, **permutation_seeds[j]
+                )
+                for j, k in enumerate((0, 2))
+            ]
+            permutations = {}
+            for effect_size in ["mean_diff", "delta_g"]:
+                deltas = [
+                    next(
+                        _permutation_chunks_from_moments(
+                            [m], effect_size, lens[k], lens[k + 1]
+                        )
+                    )[0]
+                    for m, k in zip(moments, (0, 2))
+                ]
+                permutations[effect_size] = deltas[1] - deltas[0]
+
+            for i, name in enumerate(names):
+                groups = set_groups[name]
+                deltas = [
+                    es.two_group_difference(groups[k], groups[k + 1], paired, "mean_diff")
+                    for k in (0, 2)
+                ]
+                stats[name] = {
+                    "mean_diff": (
+                        deltas[1] - deltas[0],
+                        bootstraps_delta_delta[i],
+                        permutations["mean_diff"][i],
+                    ),
+                    "delta_g": (
+                        delta_g[i],
+                        bootstraps_delta_g[i],
+                        permutations["delta_g"][i],
+                    ),
+                }
+
+        rows = []
+        interval_rows = []
+        for name in self.__experiment_sets:
+            for effect_size, (difference, bootstraps, perms) in stats[name].items():
+                row = {
+                    "experiment_set": name,
+                    "control": experiment_label[0],
+                    "test": experiment_label[1],
+                    "control_N": len(set_groups[name][0]) + len(set_groups[name][1]),
+                    "test_N": len(set_groups[name][2]) + len(set_groups[name][3]),
+                    "effect_size": effect_size,
+                    "is_paired": paired,
+                    "difference": difference,
+                    "ci": self.__ci,
+                }
+                intervals = self.__intervals(bootstraps, difference)
+                for level, limits in intervals.iterrows():
+                    interval_rows.append(
+                        dict(experiment_set=name, effect_size=effect_size, ci=level,
+                             **limits)
+                    )
+                row.update(intervals.iloc[0])
+                row.update(
+                    {
+                        "resamples": resamples,
+                        "random_seed": random_seed,
+                        "bootstraps_delta_delta": bootstraps,
+                        "permutations_delta_delta": perms,
+                        "permutation_count": permutation_count,
+                        "pvalue_permutation": np.count_nonzero(
+                            np.abs(perms) > np.abs(difference)
+                        )
+                        / permutation_count,
+                    }
+                )
+                rows.append(row)
+
+        self.__results = pd.DataFrame(rows)
+        self.__intervals_table = pd.DataFrame(interval_rows)
+
+    @staticmethod
+    def __check_levels(data, column, levels, name):
+        if levels is None:
+            levels = data[column].unique()
+            if len(levels) != 2:
+                err = "`{}` has {} levels; please specify two of them with `{}`.".format(
+                    column, len(levels), name
+                )
+                raise ValueError(err)
+        elif len(levels) != 2:
+            raise ValueError("`{}` does not have a length of 2.".format(name))
+        for level in levels:
+            if level not in data[column].unique():
+                err = "{} is not found in the column `{}`.".format(level, column)
+                raise ValueError(err)
+        return list(levels)
+
+    def __intervals(self, bootstraps, difference):
+        """
+        Computes the bias-corrected and accelerated and the percentile
+        confidence intervals of a delta-delta, as `DeltaDelta` does, for
+        every confidence level.
+        """
+        from ._stats_tools import confint_1group as ci1g
+        from ._stats_tools import confint_2group_diff as ci2g
+
+        jackknives = np.array(ci1g.compute_1group_jackknife(bootstraps, np.mean))
+        acceleration_value = ci2g._calc_accel(jackknives)
+        _, levels = ci2g.compute_intervals(
+            bootstraps, difference, acceleration_value, self.__ci_levels,
+            self.__resamples
+        )
+        # As in `DeltaDelta`, a BCa limit that cannot be computed is set to
+        # the effect size itself.
+        return ci2g._interval_table(levels, difference)
+
+    def __repr__(self, header=True, sigfig=3):
+        from .misc_tools import print_greeting
+
+        base_string_fmt = "{:." + str(sigfig) + "}"
+        out = [
+            "Delta-deltas between {} and {} for {} experiment sets:".format(
+                self.__experiment_label[0],
+                self.__experiment_label[1],
+                len(self.__experiment_sets),
+            )
+        ]
+        for _, row in self.__results.iterrows():
+            name = "delta-delta" if row.effect_size == "mean_diff" else "deltas' g"
+            out.append(
+                "{}: the {} is {} [{}%CI {}, {}], p = {}.".format(
+                    row.experiment_set,
+                    name,
+                    base_string_fmt.format(row.difference),
+                    self.__ci,
+                    base_string_fmt.format(row.bca_low),
+                    base_string_fmt.format(row.bca_high),
+                    base_string_fmt.format(row.pvalue_permutation),
+                )
+            )
+        out = "\n".join(out)
+        if header is True:
+            out = print_greeting() + "\n" + "\n" + out
+        return out
+
+    def __len__(self):
+        return len(self.__experiment_sets)
+
+    def __iter__(self):
+        return iter(self.__experiment_sets)
+
+    def delta_deltas(self, effect_size="mean_diff"):
+        """
+        Returns the rows of `results` for `effect_size`, either "mean_diff"
+        or "delta_g", as a list with one `pandas.Series` per experiment set.
+        Their `difference`, `bca_low`, `bca_high` and `bootstraps_delta_delta`
+        can be read as attributes, like those of a `DeltaDelta`.
+        """
+        if effect_size not in ["mean_diff", "delta_g"]:
+            err = "`effect_size` must be 'mean_diff' or 'delta_g', not {}.".format(
+                effect_size
+            )
+            raise ValueError(err)
+        results = self.__results[self.__results.effect_size == effect_size]
+        return [row for _, row in results.iterrows()]
+
+    @property
+    def results(self):
+        """
+        Returns a `pandas.DataFrame` with the delta-delta ("mean_diff") and
+        the deltas' g ("delta_g") of every experiment set.
+        """
+        return self.__results
+
+    @property
+    def intervals(self):
+        """
+        Returns a `pandas.DataFrame` with the BCa and percentile limits of
+        every experiment set, effect size and confidence level in `ci`.
+        """
+        return self.__intervals_table
+
+    @property
+    def experiment_sets(self):
+        """
+        Returns the names of the experiment sets, in order of appearance.
+        """
+        return self.__experiment_sets
+
+    @property
+    def x1_level(self):
+        return self.__x1_level
+
+    @property
+    def experiment_label(self):
+        return self.__experiment_label
+
+    @property
+    def is_paired(self):
+        return self.__is_paired
+
+    @property
+    def ci(self):
+        """
+        Returns the width of the confidence interval, in percent.
+        """
+        return self.__ci
+
+    @property
+    def resamples(self):
+        """
+        The number of bootstrap resamples taken.
+        """
+        return self.__resamples
+
+    @property
+    def random_seed(self):
+        return self.__random_seed
+
+    @property
+    def legacy_rng(self):
+        return self.__legacy_rng
+
+    @property
+    def permutation_count(self):
+        """
+        The number of permutations taken.
+        """
+        return self.__permutation_count
@@ -8,15 +8,26 @@ import pandas as pd
 import lqrt
 from scipy.stats import norm
 from numpy import array, isnan, isinf, repeat, random, isin, abs, var
-from numpy import sort as npsort
+from numpy import arange, argsort, concatenate, empty, flatnonzero, int64, maximum, median, ones, sqrt, stack, take, where, zeros
+from numpy import sum as npsum
 from numpy import nan as npnan
-from numpy.random import PCG64, RandomState
+from numpy.random import PCG64, RandomState, SeedSequence
 from statsmodels.stats.contingency_tables import mcnemar
 import warnings
+from copy import copy
+from math import comb
+from time import perf_counter
 from string import Template
 import scipy.stats as spstats
 
 # %% ../nbs/API/effsize_objects.ipynb 6
+# The shares of the time left that a time budget gives to the bootstraps,
+# after the jackknife, and to the permutations, after the bootstraps; the
+# statistical tests use the rest.
+_BOOTSTRAP_TIME_SHARE = 0.5
+_PERMUTATION_TIME_SHARE = 0.8
+
+
 class TwoGroupsEffectSize(object):
 
     """
@@ -34,19 +45,91 @@ class TwoGroupsEffectSize(object):
             Any one of the following are accepted inputs:
             'mean_diff', 'median_diff', 'cohens_d', 'hedges_g', or 'cliffs_delta'
         is_paired : string, default None
-        resamples : int, default 5000
+        resamples : int or "auto", default 5000
             The number of bootstrap resamples to be taken for the calculation
-            of the confidence interval limits.
+            of the confidence interval limits. With "auto", resamples are
+            added in batches of 1000, each from its own child stream of
+            `random_seed`, until the Monte Carlo standard errors of the
+            interval limits fall below `resamples_tolerance` times the width
+            of the interval, or 100,000 resamples are reached. `resamples`
+            then returns the number of resamples taken, and `ci_limits_se`
+            the standard error reached.
         permutation_count : int, default 5000
             The number of permutations (reshuffles) to perform for the
             computation of the permutation p-value
-        ci : float, default 95
+        ci : float or list of floats, default 95
             The confidence interval width. The default of 95 produces 95%
-            confidence intervals.
-        random_seed : int, default 12345
+            confidence intervals. With a list, e.g. `[90, 95, 99]`, the
+            intervals of every level are computed from the same bootstraps;
+            the first level is the one reported and plotted, and all of
+            them are listed in `intervals`.
+        random_seed : int or numpy.random.SeedSequence, default 12345
             `random_seed` is used to seed the random number generator during
             bootstrap resampling. This ensures that the confidence intervals
-            reported are replicable.
+            reported are replicable. With a `SeedSequence`, the bootstraps
+            and the permutations are drawn from independent child streams,
+            one per block of 1000 resamples or permutations, so the results
+            do not depend on how the work is split into chunks or workers.
+        legacy_rng : boolean, default True
+            If True, the bootstraps and the permutations are drawn from
+            `RandomState` generators, as in previous versions. Otherwise
+            they are drawn from `numpy.random.Generator`s, which produce
+            the resamples of each batch in bulk; the intervals then differ
+            from the legacy ones by Monte Carlo error only. Frequency
+            weighted groups are always resampled and permuted through the
+            counts of their values, which do not replay the streams of the
+            expanded groups with either value.
+        resampling : string, default "bootstrap"
+            Either "bootstrap" or "exact". With "exact", the bootstrap
+            distribution of `median_diff` is computed from binomial
+            order-statistic probabilities instead of by resampling, and
+            `resamples` sets how many of its quantiles are reported as the
+            bootstraps. For large unpaired groups of even size, the exact
+            distributions of the two medians are combined by sampling, with
+            a warning. Only available for 'median_diff'.
+        bootstraps : array-like, default None
+            Precomputed bootstrapped effect sizes, for instance assembled from
+            per-group bootstraps. If given, no resampling is performed and
+            `resamples` should equal their number.
+        permutation_moments : tuple, default None
+            The means and variances of the permuted groups, shared between
+            effect sizes. Only used for the permutation test of mean_diff,
+            cohens_d, hedges_g and delta_g.
+        sequential_permutations : boolean or dict, default False
+            If True, the permutation test stops early once its p-value is
+            decided; see the `sequential` option of `PermutationTest`. A dict
+            is passed on as keyword arguments, e.g.
+            `dict(exceedances=20, precision=0.001)`.
+        exact_permutations : boolean, default False
+            If True, the permutation test enumerates every distinct
+            permutation of small designs; see the `exact` option of
+            `PermutationTest`.
+        control_weights, test_weights : array-like, default None
+            Frequency weights of unpaired groups: the number of times each
+            value of `control` and `test` occurs. The effect size, the
+            bootstraps, the permutations and the statistical tests are then
+            computed from the counts of the distinct values, without
+            expanding the groups. Bootstraps draw these counts from a
+            multinomial distribution.
+        resamples_tolerance : float, default 0.01
+            Only used with `resamples="auto"`. The Monte Carlo standard error
+            of the interval limits at which to stop adding resamples, as a
+            fraction of the width of the interval.
+        time_budget : float, default None
+            A time, in seconds, within which to compute the effect size. Half
+            the time left after the jackknife goes to the bootstraps, drawn
+            in batches of 1000 up to `resamples`; 80% of the time left after
+            them goes to the permutation test, drawn in chunks of 100, up to
+            `permutation_count`. Until the deadline passes, the bootstraps
+            and the permutations are those drawn without a time budget with
+            the same `random_seed`. At least one batch of resamples and one
+            chunk of permutations are always drawn, so the budget may be
+            exceeded. The numbers taken depend on the speed of the
+            computer: `resamples` and `permutations_used` report them, and
+            `ci_limits_se` and `pvalue_permutation_se` the precision reached.
+            The effect size, its jackknife, the "exact" bootstraps, exact
+            permutations and the other statistical tests are not budgeted
+            and are always computed in full.
 
         Returns
         -------
@@ -63,6 +146,8 @@ class TwoGroupsEffectSize(object):
                 Returns the significance level of the statistical test as a float between 0 and 1.
             `resamples` : int
                 The number of resamples performed during the bootstrap procedure.
+            `ci_limits_se` : float
+                The largest Monte Carlo standard error of the interval limits.
             `bootstraps` : numpy ndarray
                 The generated bootstraps of the effect size.
             `random_seed` : int
@@ -71,6 +156,8 @@ class TwoGroupsEffectSize(object):
                 The bias-corrected and accelerated confidence interval lower limit and upper limits, respectively.
             `pct_low, pct_high` : float
                 The percentile confidence interval lower limit and upper limits, respectively.
+            `intervals` : pandas DataFrame
+                The BCa and percentile limits of every confidence level in `ci`.
     """
 
     def __init__(
@@ -84,10 +171,25 @@ class TwoGroupsEffectSize(object):
         resamples=5000,
         permutation_count=5000,
         random_seed=12345,
+        resampling="bootstrap",
+        bootstraps=None,
+        permutation_moments=None,
+        sequential_permutations=False,
+        exact_permutations=False,
+        control_weights=None,
+        test_weights=None,
+        legacy_rng=True,
+        resamples_tolerance=0.01,
+        time_budget=None,
     ):
         from ._stats_tools import confint_2group_diff as ci2g
         from ._stats_tools import effsize as es
 
+        if time_budget is not None:
+            self.__deadline = perf_counter() + time_budget
+        else:
+            self.__deadline = None
+
         self.__EFFECT_SIZE_DICT = {
             "mean_diff": "mean difference",
             "median_diff": "median difference",
@@ -102,8 +204,13 @@ class TwoGroupsEffectSize(object):
         self.__resamples = resamples
         self.__effect_size = effect_size
         self.__random_seed = random_seed
-        self.__ci = ci
+        self.__legacy_rng = legacy_rng
+        self.__resamples_tolerance = resamples_tolerance
+        self.__ci_levels = ci2g._ci_levels(ci)
+        self.__ci = self.__ci_levels[0]
         self.__proportional = proportional
+        self.__resampling = resampling
+        self.__weighted = control_weights is not None
         self._check_errors(control, test)
 
         # Convert to numpy arrays for speed.
@@ -113,30 +220,87 @@ class TwoGroupsEffectSize(object):
         self.__control = control[~isnan(control)]
         self.__test = test[~isnan(test)]
         self.__permutation_count = permutation_count
+        self.__permutation_moments = permutation_moments
+        self.__sequential_permutations = sequential_permutations
+        self.__exact_permutations = exact_permutations
+
+        if self.__weighted:
+            self.__control_weights = array(control_weights)[~isnan(control)]
+            self.__test_weights = array(test_weights)[~isnan(test)]
+            # Both groups as counts of the distinct values of the pooled data.
+            self.__frequencies = es._pooled_frequency_table(
+                self.__control, self.__control_weights, self.__test, self.__test_weights
+            )
+            if self.__effect_size == "median_diff":
+                es._warn_median_diff()
+            self.__difference = es._frequency_two_group_difference(
+                *self.__frequencies, self.__effect_size
+            )
+            self.__jackknives, jackknife_weights = ci2g.compute_frequency_jackknife(
+                *self.__frequencies, self.__effect_size
+            )
+            self.__acceleration_value = ci2g._calc_accel(
+                self.__jackknives, jackknife_weights
+            )
+        else:
+            self.__difference = es.two_group_difference(
+                self.__control, self.__test, self.__is_paired, self.__effect_size
+            )
 
-        self.__alpha = ci2g._compute_alpha_from_ci(self.__ci)
-
-        self.__difference = es.two_group_difference(
-            self.__control, self.__test, self.__is_paired, self.__effect_size
-        )
-
-        self.__jackknives = ci2g.compute_meandiff_jackknife(
-            self.__control, self.__test, self.__is_paired, self.__effect_size
-        )
+            self.__jackknives = ci2g.compute_meandiff_jackknife(
+                self.__control, self.__test, self.__is_paired, self.__effect_size
+            )
 
-        self.__acceleration_value = ci2g._calc_accel(self.__jackknives)
+            self.__acceleration_value = ci2g._calc_accel(self.__jackknives)
 
-        bootstraps = ci2g.compute_bootstrapped_diff(
-            self.__control,
-            self.__test,
-            self.__is_paired,
-            self.__effect_size,
-            self.__resamples,
-            self.__random_seed,
-        )
+        # With a `SeedSequence`, the bootstraps and the permutations are
+        # drawn from child streams of their own.
+        bootstrap_seed = ci2g._spawn(self.__random_seed, ci2g._BOOTSTRAP_STREAM)
+        auto = self.__resamples == "auto"
+        if self.__resampling == "exact":
+            bootstraps = ci2g.compute_exact_bootstrapped_median_diff(
+                self.__control, self.__test, self.__is_paired, self.__resamples,
+                bootstrap_seed,
+            )
+        elif bootstraps is not None:
+            bootstraps = array(bootstraps)
+        elif auto or self.__deadline is not None:
+            if auto:
+                # Every batch is drawn from its own child stream.
+                if not isinstance(bootstrap_seed, SeedSequence):
+                    bootstrap_seed = SeedSequence(bootstrap_seed)
+                draw_batch = lambda b, size: self._draw_bootstraps(
+                    size, ci2g._spawn(bootstrap_seed, b)
+                )
+            else:
+                # Every batch is drawn from the stream that draws the same
+                # block of resamples without a time budget, so that the
+                # bootstraps are the same until the deadline passes: the
+                # child stream of the block with a `SeedSequence`, or the
+                # continued stream of an int seed.
+                if isinstance(bootstrap_seed, SeedSequence):
+                    draw_batch = lambda b, size: self._draw_bootstraps(
+                        size,
+                        ci2g._continued_stream(ci2g._spawn(bootstrap_seed, b),
+                                               self.__legacy_rng),
+                    )
+                else:
+                    stream = ci2g._continued_stream(bootstrap_seed, self.__legacy_rng)
+                    draw_batch = lambda b, size: self._draw_bootstraps(size, stream)
+            bootstraps = ci2g.compute_adaptive_bootstraps(
+                draw_batch,
+                self.__difference,
+                self.__acceleration_value,
+                self.__ci_levels,
+                self.__resamples_tolerance if auto else None,
+                max_resamples=ci2g._AUTO_MAX_RESAMPLES if auto else self.__resamples,
+                deadline=self._stage_deadline(_BOOTSTRAP_TIME_SHARE),
+            )
+            self.__resamples = len(bootstraps)
+        else:
+            bootstraps = self._draw_bootstraps(self.__resamples, bootstrap_seed)
         self.__bootstraps = bootstraps
 
-        sorted_bootstraps = npsort(self.__bootstraps)
         # Added in v0.2.6.
         # Raises a UserWarning if there are any infiinities in the bootstraps.
         num_infinities = len(self.__bootstraps[isinf(self.__bootstraps)])
@@ -152,21 +316,57 @@ class TwoGroupsEffectSize(object):
             )
             warnings.warn(warn_msg.format(num_infinities), category=UserWarning)
 
-        self.__bias_correction = ci2g.compute_meandiff_bias_correction(
-            self.__bootstraps, self.__difference
-        )
+        self._compute_intervals()
 
-        self._compute_bca_intervals(sorted_bootstraps)
+        self._perform_statistical_test()
 
-        # Compute percentile intervals.
-        pct_idx_low = int((self.__alpha / 2) * self.__resamples)
-        pct_idx_high = int((1 - (self.__alpha / 2)) * self.__resamples)
+    def _stage_deadline(self, share):
+        '''
+        Function to return the deadline of a stage that is given `share` of
+        the time left, or None without a time budget.
+        '''
+        if self.__deadline is None:
+            return None
+        now = perf_counter()
+        return now + share * max(self.__deadline - now, 0.)
 
-        self.__pct_interval_idx = (pct_idx_low, pct_idx_high)
-        self.__pct_low = sorted_bootstraps[pct_idx_low]
-        self.__pct_high = sorted_bootstraps[pct_idx_high]
+    def _draw_bootstraps(self, resamples, random_seed):
+        '''
+        Function to draw `resamples` bootstraps of the effect size from the
+        stream of `random_seed`.
+        '''
+        from ._stats_tools import confint_2group_diff as ci2g
 
-        self._perform_statistical_test()
+        if self.__weighted:
+            return ci2g.compute_frequency_bootstrapped_diff(
+                *self.__frequencies,
+                self.__effect_size,
+                resamples,
+                random_seed,
+                legacy_rng=self.__legacy_rng,
+            )
+        elif self.__proportional and not self.__legacy_rng:
+            # Binary groups are resampled through their counts, which draws
+            # from other streams than resampling the observations; the legacy
+            # streams resample the observations as in previous versions.
+            return ci2g.compute_proportion_bootstrapped_diff(
+                self.__control,
+                self.__test,
+                self.__is_paired,
+                self.__effect_size,
+                resamples,
+                random_seed,
+                self.__legacy_rng,
+            )
+        return ci2g.compute_bootstrapped_diff(
+            self.__control,
+            self.__test,
+            self.__is_paired,
+            self.__effect_size,
+            resamples,
+            random_seed,
+            legacy_rng=self.__legacy_rng,
+        )
 
     def __repr__(self, show_resample_count=True, define_pval=True, sigfig=3):
         RM_STATUS = {
@@ -213,7 +413,10 @@ class TwoGroupsEffectSize(object):
         p2 = "calculated for legacy purposes only. "
         pvalue = p1 + p2
 
-        bs1 = "{} bootstrap samples were taken; ".format(self.__resamples)
+        if self.__resampling == "exact":
+            bs1 = "The bootstrap distribution was computed exactly; "
+        else:
+            bs1 = "{} bootstrap samples were taken; ".format(self.__resamples)
         bs2 = "the confidence interval is bias-corrected and accelerated."
         bs = bs1 + bs2
 
@@ -251,6 +454,30 @@ class TwoGroupsEffectSize(object):
             err1 = "`paired` is not None; therefore Cliff's delta is not defined."
             raise ValueError(err1)
 
+        if self.__resampling not in ["bootstrap", "exact"]:
+            err1 = "`resampling` must be either 'bootstrap' or 'exact'."
+            raise ValueError(err1)
+
+        if isinstance(self.__resamples, str) and self.__resamples != "auto":
+            err1 = "`resamples` must be an integer or 'auto'."
+            raise ValueError(err1)
+
+        if self.__resampling == "exact" and self.__resamples == "auto":
+            err1 = "`resampling` is 'exact'; `resamples` cannot be 'auto'."
+            raise ValueError(err1)
+
+        if self.__resampling == "exact" and self.__effect_size != "median_diff":
+            err1 = "`resampling` is 'exact'; this is only defined for median_diff."
+            raise ValueError(err1)
+
+        if self.__weighted and self.__is_paired:
+            err1 = "Frequency weights are only supported for unpaired data."
+            raise ValueError(err1)
+
+        if self.__weighted and self.__resampling == "exact":
+            err1 = "`resampling` is 'exact'; this is not available with frequency weights."
+            raise ValueError(err1)
+
         if self.__proportional and self.__effect_size not in ["mean_diff", "cohens_h"]:
             err1 = "`proportional` is True; therefore effect size other than mean_diff and cohens_h is not defined."
             raise ValueError(err1)
@@ -263,25 +490,38 @@ class TwoGroupsEffectSize(object):
             )
             raise ValueError(err1)
 
-    def _compute_bca_intervals(self, sorted_bootstraps):
+    def _compute_intervals(self):
         '''
-        Function to compute the bca intervals given the sorted bootstraps.
+        Function to compute the bca and percentile intervals of every
+        confidence level from the bootstraps.
         '''
         from ._stats_tools import confint_2group_diff as ci2g
 
-        # Compute BCa intervals.
-        bca_idx_low, bca_idx_high = ci2g.compute_interval_limits(
-            self.__bias_correction,
+        self.__bias_correction, levels = ci2g.compute_intervals(
+            self.__bootstraps,
+            self.__difference,
             self.__acceleration_value,
+            self.__ci_levels,
             self.__resamples,
-            self.__ci,
         )
+        self.__intervals = ci2g._interval_table(levels, self.__difference)
+        self.__ci_limits_se = ci2g.compute_interval_limits_se(
+            self.__bootstraps, levels
+        ).max()
+        self.__alpha = ci2g._compute_alpha_from_ci(self.__ci)
+
+        # The first confidence level is the one reported.
+        primary = levels[0]
+        self.__pct_interval_idx = primary["pct_interval_idx"]
+        self.__pct_low = primary["pct_low"]
+        self.__pct_high = primary["pct_high"]
 
+        bca_idx_low, bca_idx_high = primary["bca_interval_idx"]
         self.__bca_interval_idx = (bca_idx_low, bca_idx_high)
 
         if ~isnan(bca_idx_low) and ~isnan(bca_idx_high):
-            self.__bca_low = sorted_bootstraps[bca_idx_low]
-            self.__bca_high = sorted_bootstraps[bca_idx_high]
+            self.__bca_low = primary["bca_low"]
+            self.__bca_high = primary["bca_high"]
 
             err1 = "The $lim_type limit of the interval"
             err2 = "was in the $loc 10 values."
@@ -312,22 +552,60 @@ class TwoGroupsEffectSize(object):
                 self.__bca_high = self.__difference
                 warnings.warn(err_temp.substitute(lim_type="upper"), stacklevel=0)
 
+    def with_ci(self, ci):
+        """
+        Returns a copy of this effect size with the confidence intervals of
+        `ci`, a level or a list of levels, derived from the same bootstraps.
+        Nothing is resampled or permuted again.
+        """
+        from ._stats_tools import confint_2group_diff as ci2g
+
+        out = copy(self)
+        out.__ci_levels = ci2g._ci_levels(ci)
+        out.__ci = out.__ci_levels[0]
+        out._compute_intervals()
+        return out
+
     def _perform_statistical_test(self):
         '''
         Function to complete the statistical tests
         '''
+        from ._stats_tools import confint_2group_diff as ci2g
         from ._stats_tools import effsize as es
 
         # Perform statistical tests.
+        if self.__weighted:
+            weights = dict(control_weights=self.__control_weights,
+                           test_weights=self.__test_weights)
+        else:
+            weights = {}
+        # An int `random_seed` only seeds the bootstraps; the permutations
+        # use the default seed of `PermutationTest`.
+        if isinstance(self.__random_seed, SeedSequence):
+            seed = dict(random_seed=ci2g._spawn(self.__random_seed,
+                                                ci2g._PERMUTATION_STREAM))
+        else:
+            seed = {}
         self.__PermutationTest_result = PermutationTest(
             self.__control,
             self.__test,
             self.__effect_size,
             self.__is_paired,
             self.__permutation_count,
+            moments=self.__permutation_moments,
+            exact=self.__exact_permutations,
+            proportional=self.__proportional,
+            legacy_rng=self.__legacy_rng,
+            deadline=self._stage_deadline(_PERMUTATION_TIME_SHARE),
+            **weights,
+            **seed,
+            **_sequential_permutation_kwargs(self.__sequential_permutations),
         )
 
-        if self.__is_paired and not self.__proportional:
+        if self.__weighted:
+            self._perform_frequency_statistical_test()
+
+        elif self.__is_paired and not self.__proportional:
             # Wilcoxon, a non-parametric version of the paired T-test.
             try:
                 wilcoxon = spstats.wilcoxon(self.__control, self.__test)
@@ -353,11 +631,7 @@ class TwoGroupsEffectSize(object):
             # References:
             # https://en.wikipedia.org/wiki/McNemar%27s_test
 
-            df_temp = pd.DataFrame({"control": self.__control, "test": self.__test})
-            x1 = len(df_temp[(df_temp["control"] == 0) & (df_temp["test"] == 0)])
-            x2 = len(df_temp[(df_temp["control"] == 0) & (df_temp["test"] == 1)])
-            x3 = len(df_temp[(df_temp["control"] == 1) & (df_temp["test"] == 0)])
-            x4 = len(df_temp[(df_temp["control"] == 1) & (df_temp["test"] == 1)])
+            x1, x2, x3, x4 = ci2g._paired_binary_cells(self.__control, self.__test)
             table = [[x1, x2], [x3, x4]]
             _mcnemar = mcnemar(table, exact=True, correction=True)
             self.__pvalue_mcnemar = _mcnemar.pvalue
@@ -421,6 +695,38 @@ class TwoGroupsEffectSize(object):
 
             standardized_es = es.cohens_d(self.__control, self.__test, is_paired=None)
 
+    def _perform_frequency_statistical_test(self):
+        '''
+        Function to complete the statistical tests of unpaired groups with
+        frequency weights, from the counts of their distinct values.
+        '''
+        from ._stats_tools import effsize as es
+
+        if self.__proportional:
+            try:
+                self.__proportional_difference = es._frequency_two_group_difference(
+                    *self.__frequencies, "cohens_h"
+                )
+            except ValueError as e:
+                warnings.warn(f"Calculation of Cohen's h failed. This method is applicable "
+                  f"only for binary data (0's and 1's). Details: {e}")
+
+        elif self.__effect_size == "cliffs_delta":
+            (self.__statistic_brunner_munzel,
+             self.__pvalue_brunner_munzel) = es._frequency_brunnermunzel(*self.__frequencies)
+
+        elif self.__effect_size == "median_diff":
+            (self.__statistic_kruskal,
+             self.__pvalue_kruskal) = es._frequency_kruskal(*self.__frequencies)
+
+        else:  # for mean difference, Cohen's d, and Hedges' g.
+            (self.__statistic_welch,
+             self.__pvalue_welch) = es._frequency_ttest_ind(*self.__frequencies, equal_var=False)
+            (self.__statistic_students_t,
+             self.__pvalue_students_t) = es._frequency_ttest_ind(*self.__frequencies, equal_var=True)
+            (self.__statistic_mann_whitney,
+             self.__pvalue_mann_whitney) = es._frequency_mannwhitneyu(*self.__frequencies)
+
 
     def to_dict(self):
         """
@@ -471,6 +777,14 @@ class TwoGroupsEffectSize(object):
         """
         return self.__alpha
 
+    @property
+    def intervals(self):
+        """
+        Returns a `pandas.DataFrame`, indexed by confidence level, with the
+        BCa and percentile limits of every level in `ci`.
+        """
+        return self.__intervals
+
     @property
     def resamples(self):
         """
@@ -478,6 +792,23 @@ class TwoGroupsEffectSize(object):
         """
         return self.__resamples
 
+    @property
+    def ci_limits_se(self):
+        """
+        Returns the largest Monte Carlo standard error of the BCa limits of
+        the confidence intervals, an estimate of how much they would vary
+        with another set of bootstraps of the same size.
+        """
+        return self.__ci_limits_se
+
+    @property
+    def resampling(self):
+        """
+        Whether the bootstraps were resampled ("bootstrap") or computed
+        exactly ("exact").
+        """
+        return self.__resampling
+
     @property
     def bootstraps(self):
         """
@@ -493,6 +824,14 @@ class TwoGroupsEffectSize(object):
         """
         return self.__random_seed
 
+    @property
+    def legacy_rng(self):
+        """
+        Returns True if the resamples were drawn from `RandomState`
+        generators, and False if from `numpy.random.Generator`s.
+        """
+        return self.__legacy_rng
+
     @property
     def bca_interval_idx(self):
         return self.__bca_interval_idx
@@ -655,6 +994,28 @@ class TwoGroupsEffectSize(object):
         """
         return self.__PermutationTest_result.permutation_count
 
+    @property
+    def permutations_used(self):
+        """
+        The number of permutations actually performed.
+        """
+        return self.__PermutationTest_result.permutations_used
+
+    @property
+    def exact_permutations(self):
+        """
+        Whether the permutation p-value is exact, i.e. computed from every
+        distinct permutation.
+        """
+        return self.__PermutationTest_result.exact
+
+    @property
+    def pvalue_permutation_se(self):
+        """
+        Monte Carlo standard error of the permutation p-value.
+        """
+        return self.__PermutationTest_result.pvalue_se
+
     @property
     def permutations(self):
         return self.__PermutationTest_result.permutations
@@ -690,6 +1051,11 @@ class EffectSizeDataFrame(object):
         delta2=False,
         experiment_label=None,
         mini_meta=False,
+        sequential_permutations=False,
+        exact_permutations=False,
+        legacy_rng=True,
+        resamples_tolerance=0.01,
+        time_budget=None,
     ):
         """
         Parses the data from a Dabest object, enabling plotting and printing
@@ -709,94 +1075,171 @@ class EffectSizeDataFrame(object):
         self.__x2 = x2
         self.__delta2 = delta2
         self.__mini_meta = mini_meta
+        self.__sequential_permutations = sequential_permutations
+        self.__exact_permutations = exact_permutations
+        self.__legacy_rng = legacy_rng
+        self.__resamples_tolerance = resamples_tolerance
+        self.__time_budget = time_budget
 
     def __pre_calc(self):
-        from .misc_tools import print_greeting, get_varname
         from ._stats_tools import confint_2group_diff as ci2g
-        from ._delta_objects import MiniMetaDelta, DeltaDelta
-
-        idx = self.__dabest_obj.idx
-        dat = self.__dabest_obj._plot_data
-        xvar = self.__dabest_obj._xvar
-        yvar = self.__dabest_obj._yvar
 
-        out = []
-        reprs = []
+        if self.__time_budget is not None:
+            deadline = perf_counter() + self.__time_budget
 
+        self.__bootstraps_delta_delta = None
         if self.__delta2:
             mixed_data = []
-            for j, current_tuple in enumerate(idx):
-                if self.__is_paired != "sequential":
-                    cname = current_tuple[0]
-                    control = dat[dat[xvar] == cname][yvar].copy()
-
-                for ix, tname in enumerate(current_tuple[1:]):
-                    if self.__is_paired == "sequential":
-                        cname = current_tuple[ix]
-                        control = dat[dat[xvar] == cname][yvar].copy()
-                    test = dat[dat[xvar] == tname][yvar].copy()
-                    mixed_data.append(control)
-                    mixed_data.append(test)
-            bootstraps_delta_delta = ci2g.compute_delta2_bootstrapped_diff(
+            for cname, tname in self.__dabest_obj._comparisons:
+                mixed_data.extend(self.__dabest_obj._comparison_data(cname, tname))
+            self.__bootstraps_delta_delta = ci2g.compute_delta2_bootstrapped_diff(
                 mixed_data[0],
                 mixed_data[1],
                 mixed_data[2],
                 mixed_data[3],
                 self.__is_paired,
                 self.__resamples,
-                self.__random_seed,
+                ci2g._spawn(self.__random_seed, ci2g._DELTA2_STREAMS),
+                self.__legacy_rng,
             )
 
-        for j, current_tuple in enumerate(idx):
-            if self.__is_paired != "sequential":
-                cname = current_tuple[0]
-                control = dat[dat[xvar] == cname][yvar].copy()
-
-            for ix, tname in enumerate(current_tuple[1:]):
-                if self.__is_paired == "sequential":
-                    cname = current_tuple[ix]
-                    control = dat[dat[xvar] == cname][yvar].copy()
-                test = dat[dat[xvar] == tname][yvar].copy()
-
-                result = TwoGroupsEffectSize(
-                    control,
-                    test,
-                    self.__effect_size,
-                    self.__proportional,
-                    self.__is_paired,
-                    self.__ci,
-                    self.__resamples,
-                    self.__permutation_count,
-                    self.__random_seed,
+        comparisons = self.__dabest_obj._comparisons
+        use_group_bootstraps = (
+            self.__dabest_obj.per_group_resamples
+            and not self.__is_paired
+            and self.__effect_size in ci2g._GROUP_BOOTSTRAP_STATISTICS
+        )
+        # Resamples and permutations are shared with the other effect sizes
+        # of the Dabest object when they are drawn from the same stream.
+        # Adaptive bootstraps stop at their own size for every effect size,
+        # as do the resamples and permutations of a time budget.
+        share_permutations = (
+            self.__random_seed == self.__dabest_obj.random_seed
+            and self.__legacy_rng == self.__dabest_obj.legacy_rng
+            and self.__time_budget is None
+        )
+        share_resamples = (
+            share_permutations
+            and self.__resamples == self.__dabest_obj.resamples
+            and self.__resamples != "auto"
+        )
+        if use_group_bootstraps and self.__dabest_obj.all_pairs:
+            all_pairs_bootstraps = self.__dabest_obj._all_pairs_bootstraps(
+                self.__effect_size
+            )
+
+        weighted = self.__dabest_obj.weights is not None
+        self.__comparison_results = []
+        for k, (cname, tname) in enumerate(comparisons):
+            control, test = self.__dabest_obj._comparison_data(cname, tname)
+            if weighted:
+                weights = dict(
+                    zip(["control_weights", "test_weights"],
+                        self.__dabest_obj._comparison_weights(cname, tname))
                 )
-                r_dict = result.to_dict()
-                r_dict["control"] = cname
-                r_dict["test"] = tname
-                r_dict["control_N"] = int(len(control))
-                r_dict["test_N"] = int(len(test))
-                out.append(r_dict)
-                if j == len(idx) - 1 and ix == len(current_tuple) - 2:
-                    if self.__delta2 and self.__effect_size in ["mean_diff", "delta_g"]:
-                        resamp_count = False
-                        def_pval = False
-                    elif self.__mini_meta and self.__effect_size == "mean_diff":
-                        resamp_count = False
-                        def_pval = False
-                    else:
-                        resamp_count = True
-                        def_pval = True
-                else:
+            else:
+                weights = {}
+            if self.__time_budget is not None:
+                # The time left is split evenly between the comparisons left.
+                time_budget = max(deadline - perf_counter(), 0.) / (len(comparisons) - k)
+            else:
+                time_budget = None
+
+            bootstraps = None
+            permutation_moments = None
+            if use_group_bootstraps and self.__dabest_obj.all_pairs:
+                bootstraps = all_pairs_bootstraps[(cname, tname)]
+            elif use_group_bootstraps:
+                bootstraps = self.__dabest_obj._group_bootstrap_difference(
+                    cname, tname, self.__effect_size
+                )
+            elif share_resamples and not self.__proportional and not weighted:
+                bootstraps = self.__dabest_obj._shared_bootstraps(
+                    cname, tname, self.__effect_size
+                )
+
+            # Sequential permutation tests stop early, each at its own point,
+            # and exact ones do not draw random permutations.
+            if (share_permutations and self.__effect_size in _MOMENT_EFFECT_SIZES
+                and not (self.__proportional and not self.__legacy_rng)
+                and not weighted
+                and not self.__sequential_permutations
+                and not self.__exact_permutations):
+                permutation_moments = self.__dabest_obj._shared_permutation_moments(
+                    cname, tname, self.__permutation_count
+                )
+
+            result = TwoGroupsEffectSize(
+                control,
+                test,
+                self.__effect_size,
+                self.__proportional,
+                self.__is_paired,
+                self.__ci,
+                self.__resamples,
+                self.__permutation_count,
+                # Every comparison has its own stream if `random_seed` is a
+                # `SeedSequence`.
+                ci2g._spawn(self.__random_seed, ci2g._COMPARISON_STREAMS, k),
+                bootstraps=bootstraps,
+                permutation_moments=permutation_moments,
+                sequential_permutations=self.__sequential_permutations,
+                exact_permutations=self.__exact_permutations,
+                legacy_rng=self.__legacy_rng,
+                resamples_tolerance=self.__resamples_tolerance,
+                time_budget=time_budget,
+                **weights,
+            )
+            if weighted:
+                sizes = (
+                    int(weights["control_weights"].sum()),
+                    int(weights["test_weights"].sum()),
+                )
+            else:
+                sizes = (int(len(control)), int(len(test)))
+            self.__comparison_results.append((cname, tname, sizes, result))
+
+        self.__collate()
+
+    def __collate(self):
+        """
+        Tabulates the effect sizes of the comparisons, and computes the
+        delta-delta and the weighted delta from their bootstraps.
+        """
+        from .misc_tools import print_greeting, get_varname
+        from ._delta_objects import MiniMetaDelta, DeltaDelta
+
+        out = []
+        reprs = []
+        comparison_results = self.__comparison_results
+        for k, (cname, tname, sizes, result) in enumerate(comparison_results):
+            r_dict = result.to_dict()
+            r_dict["control"] = cname
+            r_dict["test"] = tname
+            r_dict["control_N"], r_dict["test_N"] = sizes
+            out.append(r_dict)
+            if k == len(comparison_results) - 1:
+                if self.__delta2 and self.__effect_size in ["mean_diff", "delta_g"]:
                     resamp_count = False
                     def_pval = False
+                elif self.__mini_meta and self.__effect_size == "mean_diff":
+                    resamp_count = False
+                    def_pval = False
+                else:
+                    resamp_count = True
+                    def_pval = True
+            else:
+                resamp_count = False
+                def_pval = False
 
-                text_repr = result.__repr__(
-                    show_resample_count=resamp_count, define_pval=def_pval
-                )
+            text_repr = result.__repr__(
+                show_resample_count=resamp_count, define_pval=def_pval
+            )
 
-                to_replace = "between {} and {} is".format(cname, tname)
-                text_repr = text_repr.replace("is", to_replace, 1)
+            to_replace = "between {} and {} is".format(cname, tname)
+            text_repr = text_repr.replace("is", to_replace, 1)
 
-                reprs.append(text_repr)
+            reprs.append(text_repr)
 
         self.__for_print = "\n\n".join(reprs)
 
@@ -824,6 +1267,13 @@ class EffectSizeDataFrame(object):
             "pvalue_permutation",
             "permutation_count",
             "permutations_var",
+        ]
+        if self.__resamples == "auto" or self.__time_budget is not None:
+            columns_in_order.insert(columns_in_order.index("resamples") + 1, "ci_limits_se")
+        if (self.__sequential_permutations or self.__exact_permutations
+            or self.__time_budget is not None):
+            columns_in_order += ["permutations_used", "pvalue_permutation_se"]
+        columns_in_order += [
             "pvalue_welch",
             "statistic_welch",
             "pvalue_students_t",
@@ -854,7 +1304,7 @@ class EffectSizeDataFrame(object):
         # Create and compute the delta-delta statistics
         if self.__delta2:
             self.__delta_delta = DeltaDelta(
-                self, self.__permutation_count, bootstraps_delta_delta, self.__ci
+                self, self.__permutation_count, self.__bootstraps_delta_delta, self.__ci
             )
             reprs.append(self.__delta_delta.__repr__(header=False))
         elif self.__delta2 and self.__effect_size not in ["mean_diff", "delta_g"]:
@@ -899,64 +1349,86 @@ class EffectSizeDataFrame(object):
             self.__pre_calc()
             return self.__for_print
 
+    def with_ci(self, ci):
+        """
+        Returns a copy of these effect sizes with the confidence intervals
+        of `ci`, a level or a list of levels such as `[90, 95, 99]`.
+
+        The intervals are derived from the bootstraps already computed, so
+        nothing is resampled or permuted again; only the interval limits,
+        and those of the delta-delta or weighted delta, change.
+        """
+        from ._stats_tools import confint_2group_diff as ci2g
+
+        ci2g._ci_levels(ci)
+        try:
+            self.__comparison_results
+        except AttributeError:
+            self.__pre_calc()
+
+        out = copy(self)
+        out.__ci = ci
+        out.__comparison_results = [
+            (cname, tname, sizes, result.with_ci(ci))
+            for cname, tname, sizes, result in self.__comparison_results
+        ]
+        out.__collate()
+        return out
+
     def __calc_lqrt(self):
         rnd_seed = self.__random_seed
+        if isinstance(rnd_seed, SeedSequence):
+            # `lqrt` seeds the global generator, which needs an int.
+            rnd_seed = int(rnd_seed.generate_state(1)[0])
         db_obj = self.__dabest_obj
-        dat = db_obj._plot_data
-        xvar = db_obj._xvar
-        yvar = db_obj._yvar
         delta2 = self.__delta2
 
+        if db_obj.weights is not None:
+            err = "The Lq-likelihood-ratio-type test is not available with frequency weights."
+            raise ValueError(err)
+
         out = []
 
-        for j, current_tuple in enumerate(db_obj.idx):
-            if self.__is_paired != "sequential":
-                cname = current_tuple[0]
-                control = dat[dat[xvar] == cname][yvar].copy()
-
-            for ix, tname in enumerate(current_tuple[1:]):
-                if self.__is_paired == "sequential":
-                    cname = current_tuple[ix]
-                    control = dat[dat[xvar] == cname][yvar].copy()
-                test = dat[dat[xvar] == tname][yvar].copy()
-
-                if self.__is_paired:
-                    # Refactored here in v0.3.0 for performance issues.
-                    lqrt_result = lqrt.lqrtest_rel(control, test, random_state=rnd_seed)
-
-                    out.append(
-                        {
-                            "control": cname,
-                            "test": tname,
-                            "control_N": int(len(control)),
-                            "test_N": int(len(test)),
-                            "pvalue_paired_lqrt": lqrt_result.pvalue,
-                            "statistic_paired_lqrt": lqrt_result.statistic,
-                        }
-                    )
+        for cname, tname in db_obj._comparisons:
+            control, test = db_obj._comparison_data(cname, tname)
+
+            if self.__is_paired:
+                # Refactored here in v0.3.0 for performance issues.
+                lqrt_result = lqrt.lqrtest_rel(control, test, random_state=rnd_seed)
+
+                out.append(
+                    {
+                        "control": cname,
+                        "test": tname,
+                        "control_N": int(len(control)),
+                        "test_N": int(len(test)),
+                        "pvalue_paired_lqrt": lqrt_result.pvalue,
+                        "statistic_paired_lqrt": lqrt_result.statistic,
+                    }
+                )
 
-                else:
-                    # Likelihood Q-Ratio test:
-                    lqrt_equal_var_result = lqrt.lqrtest_ind(
-                        control, test, random_state=rnd_seed, equal_var=True
-                    )
+            else:
+                # Likelihood Q-Ratio test:
+                lqrt_equal_var_result = lqrt.lqrtest_ind(
+                    control, test, random_state=rnd_seed, equal_var=True
+                )
 
-                    lqrt_unequal_var_result = lqrt.lqrtest_ind(
-                        control, test, random_state=rnd_seed, equal_var=False
-                    )
+                lqrt_unequal_var_result = lqrt.lqrtest_ind(
+                    control, test, random_state=rnd_seed, equal_var=False
+                )
 
-                    out.append(
-                        {
-                            "control": cname,
-                            "test": tname,
-                            "control_N": int(len(control)),
-                            "test_N": int(len(test)),
-                            "pvalue_lqrt_equal_var": lqrt_equal_var_result.pvalue,
-                            "statistic_lqrt_equal_var": lqrt_equal_var_result.statistic,
-                            "pvalue_lqrt_unequal_var": lqrt_unequal_var_result.pvalue,
-                            "statistic_lqrt_unequal_var": lqrt_unequal_var_result.statistic,
-                        }
-                    )
+                out.append(
+                    {
+                        "control": cname,
+                        "test": tname,
+                        "control_N": int(len(control)),
+                        "test_N": int(len(test)),
+                        "pvalue_lqrt_equal_var": lqrt_equal_var_result.pvalue,
+                        "statistic_lqrt_equal_var": lqrt_equal_var_result.statistic,
+                        "pvalue_lqrt_unequal_var": lqrt_unequal_var_result.pvalue,
+                        "statistic_lqrt_unequal_var": lqrt_unequal_var_result.statistic,
+                    }
+                )
         self.__lqrt_results = pd.DataFrame(out)
 
     def plot(
@@ -1177,6 +1649,11 @@ class EffectSizeDataFrame(object):
 
         from .plotter import effectsize_df_plotter
 
+        if self.__dabest_obj.all_pairs:
+            err = "Estimation plots are not available when `all_pairs` is True; "
+            err += "please use `results` instead."
+            raise ValueError(err)
+
         if hasattr(self, "results") is False:
             self.__pre_calc()
 
@@ -1241,6 +1718,26 @@ class EffectSizeDataFrame(object):
 
         return results_df[cols_of_interest]
 
+    @property
+    def intervals(self):
+        """
+        Returns a `pandas.DataFrame` with the BCa and percentile limits of
+        every comparison at every confidence level in `ci`.
+        """
+        try:
+            comparison_results = self.__comparison_results
+        except AttributeError:
+            self.__pre_calc()
+            comparison_results = self.__comparison_results
+
+        out = []
+        for cname, tname, _, result in comparison_results:
+            intervals = result.intervals.reset_index()
+            intervals.insert(0, "control", cname)
+            intervals.insert(1, "test", tname)
+            out.append(intervals)
+        return pd.concat(out, ignore_index=True)
+
     @property
     def _for_print(self):
         return self.__for_print
@@ -1302,6 +1799,14 @@ class EffectSizeDataFrame(object):
         """
         return self.__random_seed
 
+    @property
+    def legacy_rng(self):
+        """
+        Returns True if the resamples are drawn from `RandomState`
+        generators, and False if from `numpy.random.Generator`s.
+        """
+        return self.__legacy_rng
+
     @property
     def effect_size(self):
         """The type of effect size being computed."""
@@ -1366,6 +1871,558 @@ class EffectSizeDataFrame(object):
             return self.__delta_delta
 
 # %% ../nbs/API/effsize_objects.ipynb 29
+def _permutation_index_chunks(streams, bag_len):
+    """
+    Yields permutations of `range(bag_len)` as 2D arrays, one for each
+    chunk of `streams` (see `_random_streams`).
+
+    Every row is drawn with `rng.permutation`, so the permutations are the
+    same as when the bag is reshuffled one permutation at a time.
+    """
+    for rng, size in streams:
+        out = empty((size, bag_len), dtype=int64)
+        for i in range(size):
+            out[i] = rng.permutation(bag_len)
+        yield out
+
+
+def _sort_key_index_chunks(streams, bag_len):
+    """
+    Yields permutations of `range(bag_len)` as 2D arrays, one for each
+    chunk of `streams` (see `_random_streams`).
+
+    Each chunk is drawn at once as a matrix of random sort keys from a
+    `numpy.random.Generator`; sorting every row of keys gives a uniformly
+    random permutation.
+    """
+    for rng, size in streams:
+        yield argsort(rng.random((size, bag_len)), axis=1)
+
+
+def _sign_flip_chunks(streams, pair_count):
+    """
+    Yields boolean 2D arrays, one for each chunk of `streams` (see
+    `_random_streams`), where each row marks the control-test pairs that
+    are swapped in one permutation. Every pair is swapped independently
+    with probability 1/2.
+    """
+    for rng, size in streams:
+        yield rng.integers(0, 2, size=(size, pair_count)).astype(bool)
+
+
+def _permutation_rows(control, test, is_paired, permutation_count=5000,
+                      random_seed=12345, legacy_rng=True, chunk_size=None):
+    """
+    Yields the permuted control and test groups as pairs of 2D arrays, with
+    one permutation per row and at most `chunk_size` rows at a time.
+
+    With `legacy_rng=True`, the permutations are the ones drawn one at a time
+    by `PermutationTest` with a `RandomState` generator: a reshuffle of the
+    pooled data for unpaired designs, and cumulative swaps of randomly chosen
+    pairs for paired designs. Otherwise, the permutations are drawn in chunks
+    from a `numpy.random.Generator`, as random sort keys for unpaired designs
+    and as a sign-flip matrix for paired designs.
+    """
+    from ._stats_tools.confint_2group_diff import (_compute_chunk_size, _MEMORY_BUDGET,
+                                                   _random_streams)
+
+    permutation_count = int(permutation_count)
+    control = array(control)
+    test = array(test)
+    BAG = concatenate([control, test])
+    CONTROL_LEN = int(len(control))
+    if chunk_size is None:
+        chunk_size = _compute_chunk_size(len(BAG), permutation_count, _MEMORY_BUDGET)
+    streams = _random_streams(random_seed, permutation_count, chunk_size, legacy_rng)
+
+    if not legacy_rng:
+        if is_paired:
+            for flips in _sign_flip_chunks(streams, CONTROL_LEN):
+                yield where(flips, test, control), where(flips, control, test)
+        else:
+            for perm in _sort_key_index_chunks(streams, len(BAG)):
+                shuffled = BAG[perm]
+                yield shuffled[:, :CONTROL_LEN], shuffled[:, CONTROL_LEN:]
+        return
+
+    if is_paired:
+        # The swaps accumulate from one permutation to the next, and start
+        # again from the observed pairs with every new stream.
+        stream = None
+        for rng, size in streams:
+            if rng is not stream:
+                stream = rng
+                control_sample = control.copy()
+                test_sample = test.copy()
+            control_rows = empty((size, CONTROL_LEN), dtype=control_sample.dtype)
+            test_rows = empty((size, CONTROL_LEN), dtype=test_sample.dtype)
+            for i in range(size):
+                random_idx = rng.choice(CONTROL_LEN,
+                                rng.randint(0, CONTROL_LEN+1),
+                                replace=False)
+                control_sample[random_idx], test_sample[random_idx] = (
+                    test_sample[random_idx], control_sample[random_idx]
+                )
+                control_rows[i] = control_sample
+                test_rows[i] = test_sample
+            yield control_rows, test_rows
+    else:
+        for perm in _permutation_index_chunks(streams, len(BAG)):
+            shuffled = BAG[perm]
+            yield shuffled[:, :CONTROL_LEN], shuffled[:, CONTROL_LEN:]
+
+
+def _sign_flip_moment_chunks(control, test, permutation_count=5000, random_seed=12345,
+                             chunk_size=None):
+    """
+    Yields the means and variances (ddof=1) of the permuted control and test
+    groups of a paired design, chunk by chunk, as `_permutation_moment_chunks`
+    does with `legacy_rng=False`.
+
+    A swap of a pair flips the sign of its difference, so the sums and sums
+    of squares of the permuted groups of a whole chunk are matrix products of
+    the sign-flip matrix with the pair differences.
+    """
+    from ._stats_tools.confint_2group_diff import (_compute_chunk_size, _MEMORY_BUDGET,
+                                                   _random_streams)
+
+    permutation_count = int(permutation_count)
+    control = array(control, dtype=float)
+    test = array(test, dtype=float)
+    n = len(control)
+
+    # Both groups are centred on the pooled mean, which leaves the
+    # differences and the variances unchanged but keeps the sums of
+    # squares small.
+    center = (control.sum() + test.sum()) / (2 * n)
+    control = control - center
+    test = test - center
+    half_sum = (control.sum() + test.sum()) / 2
+    half_sum_squares = (control @ control + test @ test) / 2
+    difference = test - control
+    difference_squares = test * test - control * control
+
+    if chunk_size is None:
+        chunk_size = _compute_chunk_size(2 * n, permutation_count, _MEMORY_BUDGET)
+    streams = _random_streams(random_seed, permutation_count, chunk_size, legacy_rng=False)
+    for flips in _sign_flip_chunks(streams, n):
+        # +1 keeps a pair, -1 swaps it.
+        signs = 1. - 2. * flips
+        shift = signs @ difference / 2
+        shift_squares = signs @ difference_squares / 2
+        control_sum, test_sum = half_sum - shift, half_sum + shift
+        control_ss = half_sum_squares - shift_squares - control_sum**2 / n
+        test_ss = half_sum_squares + shift_squares - test_sum**2 / n
+        yield (control_sum / n + center, test_sum / n + center,
+               maximum(control_ss, 0.) / (n - 1), maximum(test_ss, 0.) / (n - 1))
+
+
+# Effect sizes whose permutations follow from the means and variances
+# of the permuted groups.
+_MOMENT_EFFECT_SIZES = ["mean_diff", "cohens_d", "hedges_g", "delta_g"]
+
+
+def _permutation_moment_chunks(control, test, is_paired, permutation_count=5000,
+                               random_seed=12345, legacy_rng=True, chunk_size=None):
+    """
+    Yields the means and variances (ddof=1) of the permuted control and test
+    groups, as four arrays with one value per permutation, chunk by chunk.
+
+    The permutations are the ones drawn by `PermutationTest`, and the values
+    are computed in batches of rows, so that every effect size in
+    `_MOMENT_EFFECT_SIZES` can be derived from them exactly as it would be
+    computed one permutation at a time.
+    """
+    if is_paired and not legacy_rng:
+        yield from _sign_flip_moment_chunks(control, test, permutation_count,
+                                            random_seed, chunk_size)
+        return
+
+    for control_rows, test_rows in _permutation_rows(control, test, is_paired,
+                                                     permutation_count, random_seed,
+                                                     legacy_rng, chunk_size):
+        yield (control_rows.mean(axis=1), test_rows.mean(axis=1),
+               var(control_rows, axis=1, ddof=1), var(test_rows, axis=1, ddof=1))
+
+
+def _permutation_moments(control, test, is_paired, permutation_count=5000, random_seed=12345,
+                         legacy_rng=True):
+    """
+    Returns the means and variances (ddof=1) of the permuted control and test
+    groups, as four arrays with one value per permutation. See
+    `_permutation_moment_chunks`.
+    """
+    chunks = _permutation_moment_chunks(control, test, is_paired, permutation_count,
+                                        random_seed, legacy_rng)
+    return tuple(concatenate(m) for m in zip(*chunks))
+
+
+def _batch_permutation_moments(control, test, is_paired, permutation_count=5000,
+                               random_seed=12345, legacy_rng=True):
+    """
+    Returns the means and variances (ddof=1) of the permuted control and test
+    groups of several comparisons of equal group sizes, given as 2D arrays
+    with one comparison per row, as four arrays of shape (comparisons,
+    permutations).
+
+    The permutations are drawn once, with the stream of `PermutationTest`
+    for the same `legacy_rng`, and applied to every comparison, so that each row is
+    the same as `_permutation_moments` of that comparison alone.
+    """
+    from ._stats_tools.confint_2group_diff import _compute_chunk_size, _MEMORY_BUDGET
+
+    control = array(control, dtype=float)
+    test = array(test, dtype=float)
+    if is_paired and not legacy_rng:
+        # The sign-flip moments of a comparison are cheap matrix products;
+        # they are computed row by row to stay identical to the ones of
+        # the comparison alone.
+        moments = [_permutation_moments(c, t, is_paired, permutation_count, random_seed, False)
+                   for c, t in zip(control, test)]
+        return tuple(array(m) for m in zip(*moments))
+
+    CONTROL_LEN = control.shape[1]
+    BAG = concatenate([control, test], axis=1)
+    chunk_size = _compute_chunk_size(BAG.size, permutation_count, _MEMORY_BUDGET)
+
+    chunks = []
+    if is_paired:
+        # Permuting boolean labels gives the pairs swapped in every permutation.
+        rows = _permutation_rows(zeros(CONTROL_LEN, dtype=bool), ones(CONTROL_LEN, dtype=bool),
+                                 is_paired, permutation_count, random_seed, True, chunk_size)
+        for swapped, _ in rows:
+            control_rows = where(swapped, test[:, None], control[:, None])
+            test_rows = where(swapped, control[:, None], test[:, None])
+            chunks.append((control_rows, test_rows))
+    else:
+        # Permuting positions gives the indexes of the shuffled pooled data.
+        rows = _permutation_rows(arange(CONTROL_LEN), arange(CONTROL_LEN, BAG.shape[1]),
+                                 is_paired, permutation_count, random_seed, legacy_rng, chunk_size)
+        for control_idx, test_idx in rows:
+            chunks.append((take(BAG, control_idx, axis=1), take(BAG, test_idx, axis=1)))
+
+    moments = [(control_rows.mean(axis=-1), test_rows.mean(axis=-1),
+                var(control_rows, axis=-1, ddof=1), var(test_rows, axis=-1, ddof=1))
+               for control_rows, test_rows in chunks]
+    return tuple(concatenate(m, axis=1) for m in zip(*moments))
+
+
+def _permutation_chunks_from_moments(moment_chunks, effect_size, CONTROL_LEN, TEST_LEN):
+    """
+    Yields the permuted effect sizes in `_MOMENT_EFFECT_SIZES` and the group
+    variances, derived from the means and variances of the permuted groups
+    with the same arithmetic as `two_group_difference`.
+    """
+    from ._stats_tools.effsize import _compute_hedges_correction_factor
+    from ._stats_tools.confint_2group_diff import calculate_group_var
+
+    for control_mean, test_mean, control_var, test_var in moment_chunks:
+        permutations = test_mean - control_mean
+        if effect_size != "mean_diff":
+            pooled_sd = sqrt(((CONTROL_LEN - 1) * control_var + (TEST_LEN - 1) * test_var) /
+                             (CONTROL_LEN + TEST_LEN - 2)
+                             )
+            if (pooled_sd == 0).any():
+                raise ValueError("The divisor is zero, indicating no variability in the data.")
+            permutations = permutations / pooled_sd
+
+        if effect_size in ["hedges_g", "delta_g"]:
+            permutations = _compute_hedges_correction_factor(CONTROL_LEN, TEST_LEN) * permutations
+
+        yield permutations, calculate_group_var(control_var, CONTROL_LEN, test_var, TEST_LEN)
+
+
+def _permutation_chunks_from_rows(rows, effect_size, CONTROL_LEN, TEST_LEN):
+    """
+    Yields the permuted effect sizes and group variances for any effect size,
+    from the permuted groups yielded by `_permutation_rows`. The median
+    difference of NaN-free data is computed for a whole chunk at once; other
+    effect sizes are computed one permutation at a time.
+    """
+    from ._stats_tools.effsize import _two_group_difference
+    from ._stats_tools.confint_2group_diff import calculate_group_var
+
+    for control_rows, test_rows in rows:
+        if (effect_size == "median_diff" and not isnan(control_rows).any()
+            and not isnan(test_rows).any()):
+            es = median(test_rows, axis=1) - median(control_rows, axis=1)
+        else:
+            es = array([_two_group_difference(control_sample, test_sample, 
+                                              False, effect_size)
+                        for control_sample, test_sample in zip(control_rows, test_rows)])
+        yield es, calculate_group_var(var(control_rows, axis=1, ddof=1), 
+                                      CONTROL_LEN, 
+                                      var(test_rows, axis=1, ddof=1), 
+                                      TEST_LEN)
+
+
+def _proportion_permutation_chunks(control, test, is_paired, effect_size,
+                                  permutation_count=5000, random_seed=12345,
+                                  legacy_rng=True, chunk_size=None):
+    """
+    Yields the permuted mean differences or Cohen's h of binary groups and
+    the group variances, from the numbers of ones of the permuted groups.
+
+    The number of ones that a reshuffle of the pooled data puts in the
+    control group is hypergeometric. A paired permutation only changes the
+    groups through the discordant pairs it swaps, so the numbers of swapped
+    (0, 1) and (1, 0) pairs are binomial with probability 1/2.
+    `PermutationTest` only draws these counts with `legacy_rng=False`, since
+    they do not replay the legacy reshuffles.
+    """
+    from ._stats_tools.confint_2group_diff import (_proportion_difference, _paired_binary_cells,
+                                                   calculate_group_var, _random_streams)
+
+    permutation_count = int(permutation_count)
+    if chunk_size is None:
+        chunk_size = permutation_count
+
+    CONTROL_LEN, TEST_LEN = len(control), len(test)
+    control_ones, test_ones = int(npsum(control)), int(npsum(test))
+    if is_paired:
+        _, n01, n10, _ = _paired_binary_cells(control, test)
+
+    for rng, size in _random_streams(random_seed, permutation_count, chunk_size, legacy_rng):
+        if is_paired:
+            # A swapped (0, 1) pair moves a one from the test to the control
+            # group, and a swapped (1, 0) pair moves one back.
+            # Both counts of a permutation are drawn together, so that the
+            # permutations do not depend on the size of the chunks.
+            swapped = rng.binomial([n01, n10], 0.5, (size, 2))
+            shift = swapped[:, 0] - swapped[:, 1]
+            permuted_control = control_ones + shift
+            permuted_test = test_ones - shift
+        else:
+            permuted_control = rng.hypergeometric(control_ones + test_ones,
+                                                  CONTROL_LEN + TEST_LEN
+                                                  - control_ones - test_ones,
+                                                  CONTROL_LEN, size)
+            permuted_test = control_ones + test_ones - permuted_control
+
+        # The permuted effect sizes are unpaired differences, computed with
+        # the same arithmetic as in `_permutation_chunks_from_rows`, so that
+        # permutations tied with the observed effect size are compared with
+        # it as before.
+        es = _proportion_difference(permuted_control, permuted_test, CONTROL_LEN,
+                                    TEST_LEN, False, effect_size)
+        control_var = permuted_control * (CONTROL_LEN - permuted_control) / (
+            CONTROL_LEN * (CONTROL_LEN - 1))
+        test_var = permuted_test * (TEST_LEN - permuted_test) / (TEST_LEN * (TEST_LEN - 1))
+        yield es, calculate_group_var(control_var, CONTROL_LEN, test_var, TEST_LEN)
+
+
+def _frequency_permutation_chunks(values, control_counts, test_counts, effect_size,
+                                  permutation_count=5000, random_seed=12345,
+                                  legacy_rng=True, chunk_size=None):
+    """
+    Yields the permuted effect sizes and group variances of two unpaired
+    groups given as counts of the same distinct values.
+
+    A reshuffle of the pooled observations is described by how many
+    observations of each value go to the control group, which follows a
+    multivariate hypergeometric distribution. It is drawn permutation by
+    permutation, one value at a time, so that the permutations do not
+    depend on the size of the chunks.
+    """
+    from ._stats_tools.effsize import _frequency_moments, _frequency_two_group_difference
+    from ._stats_tools.confint_2group_diff import (calculate_group_var, _random_streams,
+                                                   _as_generator)
+
+    permutation_count = int(permutation_count)
+    if chunk_size is None:
+        chunk_size = permutation_count
+
+    pooled_counts = control_counts + test_counts
+    CONTROL_LEN, TEST_LEN = int(control_counts.sum()), int(test_counts.sum())
+
+    for rng, size in _random_streams(random_seed, permutation_count, chunk_size, legacy_rng):
+        permuted_control = _as_generator(rng).multivariate_hypergeometric(
+            pooled_counts, CONTROL_LEN, size, method="marginals"
+        )
+        permuted_test = pooled_counts - permuted_control
+
+        _, _, control_ss = _frequency_moments(values, permuted_control)
+        _, _, test_ss = _frequency_moments(values, permuted_test)
+        yield (_frequency_two_group_difference(values, permuted_control, permuted_test,
+                                               effect_size),
+               calculate_group_var(control_ss / (CONTROL_LEN - 1), CONTROL_LEN,
+                                   test_ss / (TEST_LEN - 1), TEST_LEN))
+
+
+def _cliffs_delta_permutation_chunks(BAG, CONTROL_LEN, permutation_count=5000,
+                                     random_seed=12345, legacy_rng=True, chunk_size=None):
+    """
+    Yields the permuted Cliff's deltas and group variances of an unpaired
+    design. The pooled data are ranked once; each permutation then only sums
+    the ranks assigned to the test group.
+    """
+    from ._stats_tools.effsize import _cliffs_delta_from_rank_sum
+    from ._stats_tools.confint_2group_diff import calculate_group_var
+    from ._stats_tools.confint_2group_diff import (_compute_chunk_size, _MEMORY_BUDGET,
+                                                   _random_streams)
+
+    permutation_count = int(permutation_count)
+    TEST_LEN = len(BAG) - CONTROL_LEN
+    ranks = spstats.rankdata(BAG)
+
+    if chunk_size is None:
+        chunk_size = _compute_chunk_size(len(BAG), permutation_count, _MEMORY_BUDGET)
+    streams = _random_streams(random_seed, permutation_count, chunk_size, legacy_rng)
+    if legacy_rng:
+        index_chunks = _permutation_index_chunks(streams, len(BAG))
+    else:
+        index_chunks = _sort_key_index_chunks(streams, len(BAG))
+    for perm in index_chunks:
+        test_rank_sum = ranks[perm[:, CONTROL_LEN:]].sum(axis=1)
+        shuffled = BAG[perm]
+        yield (_cliffs_delta_from_rank_sum(test_rank_sum, CONTROL_LEN, TEST_LEN),
+               calculate_group_var(var(shuffled[:, :CONTROL_LEN], axis=1, ddof=1), 
+                                   CONTROL_LEN, 
+                                   var(shuffled[:, CONTROL_LEN:], axis=1, ddof=1), 
+                                   TEST_LEN))
+
+
+# Largest number of distinct permutations that the exact mode of
+# `PermutationTest` enumerates.
+_EXACT_PERMUTATION_LIMIT = 200000
+
+# Relative tolerance under which an enumerated effect size is considered
+# tied with the observed one, rather than more extreme.
+_EXACT_TIE_TOLERANCE = 1e-9
+
+
+def _exact_permutation_count(control_n, test_n, is_paired):
+    """
+    Returns the number of distinct permutations of a two-group design:
+    2^n sign flips of the pairs for paired designs, and the number of ways to
+    relabel the pooled observations for unpaired designs.
+    """
+    if is_paired:
+        return 2 ** control_n
+    return comb(control_n + test_n, test_n)
+
+
+def _exact_subsets(values, size=None, masks=True):
+    """
+    Enumerates the subsets of the rows of the 2D array `values`, of `size`
+    rows, or of any size if `size` is None. Returns a boolean matrix with one
+    subset per row, or None if `masks` is False, and the column sums of
+    `values` over every subset.
+
+    The subsets are built incrementally: the subsets of the first i rows are
+    the subsets of the first i-1 rows, with and without row i. Every sum is
+    thus derived from a previous one with a single addition of the k columns,
+    i.e. in O(k) per subset, whatever the number of rows. The masks have one
+    entry per row and are copied as the subsets are extended, which costs
+    O(n) per subset; they are only built if `masks` is True.
+    """
+    n, k = values.shape
+    # levels[j] holds the subsets of j rows among the rows seen so far.
+    levels = [(zeros((1, n), dtype=bool) if masks else None, zeros((1, k)))]
+    for i in range(n):
+        new_levels = []
+        for j in range(len(levels) + 1):
+            level_masks, sums = [], []
+            if j < len(levels):
+                level_masks.append(levels[j][0])
+                sums.append(levels[j][1])
+            if j > 0:
+                if masks:
+                    with_row = levels[j - 1][0].copy()
+                    with_row[:, i] = True
+                    level_masks.append(with_row)
+                sums.append(levels[j - 1][1] + values[i])
+            new_levels.append((concatenate(level_masks) if masks else None,
+                               concatenate(sums)))
+
+        if size is not None:
+            # Drop the subsets that cannot end up with `size` rows.
+            remaining = n - i - 1
+            for j in range(len(new_levels)):
+                if j > size or j + remaining < size:
+                    new_levels[j] = (new_levels[j][0][:0] if masks else None,
+                                     new_levels[j][1][:0])
+        levels = new_levels
+
+    if size is not None:
+        return levels[size]
+    return (concatenate([level[0] for level in levels]) if masks else None,
+            concatenate([level[1] for level in levels]))
+
+
+def _exact_permutation_chunks(control, test, is_paired, effect_size):
+    """
+    Yields the effect sizes and group variances of every distinct
+    permutation of a design without NaNs, as a single chunk.
+
+    The effect sizes in `_MOMENT_EFFECT_SIZES` and Cliff's delta only depend
+    on the sums, sums of squares and rank sums of the permuted groups, which
+    are enumerated incrementally with `_exact_subsets`. For the other effect
+    sizes, the permuted groups are built explicitly.
+    """
+    from ._stats_tools.effsize import _cliffs_delta_from_rank_sum
+    from ._stats_tools.confint_2group_diff import calculate_group_var
+
+    control = array(control, dtype=float)
+    test = array(test, dtype=float)
+    CONTROL_LEN, TEST_LEN = len(control), len(test)
+    BAG = concatenate([control, test])
+
+    if effect_size not in _MOMENT_EFFECT_SIZES and effect_size != "cliffs_delta":
+        # Swapped pairs, or members of the test group.
+        if is_paired:
+            masks, _ = _exact_subsets(zeros((CONTROL_LEN, 0)))
+            rows = [(where(masks, test, control), where(masks, control, test))]
+        else:
+            masks, _ = _exact_subsets(zeros((len(BAG), 0)), TEST_LEN)
+            rows = [(BAG[(~masks).nonzero()[1]].reshape(-1, CONTROL_LEN),
+                     BAG[masks.nonzero()[1]].reshape(-1, TEST_LEN))]
+        yield from _permutation_chunks_from_rows(rows, effect_size, CONTROL_LEN, TEST_LEN)
+        return
+
+    # Centring on the pooled mean keeps the sums of squares small.
+    center = BAG.mean()
+    control, test, BAG = control - center, test - center, BAG - center
+    if is_paired:
+        _, sums = _exact_subsets(stack([test - control, test * test - control * control], axis=1),
+                                masks=False)
+        control_sum, control_ss = control.sum() + sums[:, 0], control @ control + sums[:, 1]
+        test_sum, test_ss = test.sum() - sums[:, 0], test @ test - sums[:, 1]
+    else:
+        columns = [BAG, BAG * BAG]
+        if effect_size == "cliffs_delta":
+            columns.append(spstats.rankdata(BAG))
+        _, sums = _exact_subsets(stack(columns, axis=1), TEST_LEN, masks=False)
+        test_sum, test_ss = sums[:, 0], sums[:, 1]
+        control_sum, control_ss = BAG.sum() - test_sum, BAG @ BAG - test_ss
+
+    moments = (control_sum / CONTROL_LEN + center, test_sum / TEST_LEN + center,
+               maximum(control_ss - control_sum**2 / CONTROL_LEN, 0.) / (CONTROL_LEN - 1),
+               maximum(test_ss - test_sum**2 / TEST_LEN, 0.) / (TEST_LEN - 1))
+    if effect_size == "cliffs_delta":
+        yield (_cliffs_delta_from_rank_sum(sums[:, 2], CONTROL_LEN, TEST_LEN),
+               calculate_group_var(moments[2], CONTROL_LEN, moments[3], TEST_LEN))
+        return
+    yield from _permutation_chunks_from_moments([moments], effect_size, CONTROL_LEN, TEST_LEN)
+
+
+# Number of permutations drawn at a time in the sequential mode of
+# `PermutationTest`, i.e. how often the stopping rule is checked.
+_SEQUENTIAL_CHUNK_SIZE = 100
+
+
+def _sequential_permutation_kwargs(sequential_permutations):
+    """
+    Converts the `sequential_permutations` option of `dabest.load` into
+    keyword arguments for `PermutationTest`.
+    """
+    if not sequential_permutations:
+        return {}
+    if sequential_permutations is True:
+        return dict(sequential=True)
+    return dict(sequential=True, **sequential_permutations)
+
+
 class PermutationTest:
     """
     A class to compute and report permutation tests.
@@ -1381,10 +2438,48 @@ class PermutationTest:
     is_paired : string, default None
     permutation_count : int, default 10000
         The number of permutations (reshuffles) to perform.
-    random_seed : int, default 12345
+    random_seed : int or numpy.random.SeedSequence, default 12345
         `random_seed` is used to seed the random number generator during
         bootstrap resampling. This ensures that the generated permutations
-        are replicable.
+        are replicable. With a `SeedSequence`, every block of 1000
+        permutations is drawn from its own child stream.
+    legacy_rng : boolean, default True
+        If True, the permutations are drawn one at a time from a
+        `RandomState` generator, as in previous versions of DABEST. If False,
+        they are drawn in chunks from a `numpy.random.Generator`: random sort
+        keys for unpaired designs and a sign-flip matrix for paired designs,
+        in which every pair is swapped independently.
+    sequential : boolean, default False
+        If True, the test stops as soon as `exceedances` permutations have
+        given an effect size more extreme than the observed one, and reports
+        the sequential p-value of Besag and Clifford (1991). `permutation_count`
+        is then the maximum number of permutations.
+    exceedances : int, default 10
+        The number of extreme permutations after which the sequential mode
+        stops.
+    precision : float, default None
+        If given, the sequential mode also stops once the Monte Carlo
+        standard error of the p-value is at most `precision`.
+    exact : boolean, default False
+        If True and the design has at most 200,000 distinct permutations
+        (2^n sign flips of the pairs, or C(n0 + n1, n0) relabelings of the
+        pooled data), every one of them is enumerated once, instead of
+        drawing `permutation_count` random permutations, and the p-value is
+        exact. Larger designs fall back to random permutations.
+    proportional : boolean, default False
+        If True, the groups consist of 0s and 1s. With `legacy_rng=False`,
+        the permutations of 'mean_diff' and 'cohens_h' are then drawn as
+        numbers of ones of the permuted groups, in time independent of the
+        group sizes; the legacy permutations reshuffle the observations.
+    control_weights, test_weights : array-like, default None
+        Frequency weights of unpaired groups: the number of times each
+        observation occurs. The permutations are then drawn as counts of the
+        distinct values of the pooled groups, with either `legacy_rng`, and
+        `exact` is ignored.
+    deadline : float, default None
+        A `time.perf_counter()` value. If given, the permutations are drawn
+        in chunks of 100 and no further chunk is drawn once it has passed;
+        `permutations_used` then tells how many were performed.
         
     Returns
     -------
@@ -1393,6 +2488,10 @@ class PermutationTest:
             The effect size of the difference between the control and the test.
         `effect_size`:string
             The type of effect size reported.
+        `permutations_used`:int
+            The number of permutations actually performed.
+        `pvalue_se`:float
+            The Monte Carlo standard error of the p-value.
     
     
     """
@@ -1403,9 +2502,19 @@ class PermutationTest:
                  is_paired:str=None,
                  permutation_count:int=5000, # The number of permutations (reshuffles) to perform.
                  random_seed:int=12345,#`random_seed` is used to seed the random number generator during bootstrap resampling. This ensures that the generated permutations are replicable.
+                 moments:tuple=None, # The output of `_permutation_moments` for these groups, to share the permutations between effect sizes.
+                 legacy_rng:bool=True, # If True, draw the permutations one at a time from a `RandomState` generator, as in previous versions; otherwise draw them in chunks from a `numpy.random.Generator`.
+                 sequential:bool=False, # If True, stop early once the p-value is decided (Besag & Clifford, 1991); `permutation_count` is then the maximum number of permutations.
+                 exceedances:int=10, # In the sequential mode, stop after this many permutations more extreme than the observed effect size.
+                 precision:float=None, # In the sequential mode, also stop once the Monte Carlo standard error of the p-value is at most `precision`.
+                 exact:bool=False, # If True, enumerate every distinct permutation when there are at most `_EXACT_PERMUTATION_LIMIT` of them.
+                 proportional:bool=False, # If True, the groups are binary; with `legacy_rng=False`, mean_diff and cohens_h are permuted through the numbers of ones of the groups.
+                 control_weights:array=None, # The number of times each control observation occurs, for unpaired data.
+                 test_weights:array=None, # The number of times each test observation occurs, for unpaired data.
+                 deadline:float=None, # A `time.perf_counter()` value after which no further permutations are drawn.
                  **kwargs):
-        from ._stats_tools.effsize import two_group_difference
-        from ._stats_tools.confint_2group_diff import calculate_group_var
+        from ._stats_tools.effsize import (_two_group_difference, _pooled_frequency_table,
+                                           _frequency_two_group_difference)
         
 
         self.__permutation_count = permutation_count
@@ -1413,68 +2522,138 @@ class PermutationTest:
         # Run Sanity Check.
         if is_paired and len(control) != len(test):
             raise ValueError("The two arrays do not have the same length.")
+        if sequential and (int(exceedances) != exceedances or exceedances < 1):
+            raise ValueError("`exceedances` must be a positive integer.")
+        if sequential and precision is not None and precision <= 0:
+            raise ValueError("`precision` must be positive.")
 
-        # Initialise random number generator.
-        # rng = random.default_rng(seed=random_seed)
-        rng = RandomState(PCG64(random_seed))
+        # In the sequential mode, or with a deadline, the permutations are
+        # drawn in small chunks, so that only a few are wasted once the test
+        # stops.
+        chunk_size = _SEQUENTIAL_CHUNK_SIZE if sequential or deadline is not None else None
 
         # Set required constants and variables
         control = array(control)
         test = array(test)
 
-        control_sample = control.copy()
-        test_sample    = test.copy()
-
-        BAG = array([*control, *test])
+        BAG = concatenate([control, test])
         CONTROL_LEN = int(len(control))
-        EXTREME_COUNT = 0.
-        THRESHOLD = abs(two_group_difference(control, test, 
-                                                is_paired, effect_size))
-        self.__permutations = []
-        self.__permutations_var = []
+        TEST_LEN = int(len(test))
 
-        for i in range(int(self.__permutation_count)):
+        if control_weights is not None:
             if is_paired:
-                # Select which control-test pairs to swap.
-                random_idx = rng.choice(CONTROL_LEN,
-                                rng.randint(0, CONTROL_LEN+1),
-                                replace=False)
-
-                # Perform swap.
-                for i in random_idx:
-                    _placeholder      = control_sample[i]
-                    control_sample[i] = test_sample[i]
-                    test_sample[i]    = _placeholder
-                
-            else:
-                # Shuffle the bag and assign to control and test groups.
-                # NB. rng.shuffle didn't produce replicable results...
-                shuffled = rng.permutation(BAG) 
-                control_sample = shuffled[:CONTROL_LEN]
-                test_sample    = shuffled[CONTROL_LEN:]
+                raise ValueError("Frequency weights are only supported for unpaired data.")
+            values, control_counts, test_counts = _pooled_frequency_table(
+                control, control_weights, test, test_weights
+            )
+            THRESHOLD = abs(_frequency_two_group_difference(values, control_counts,
+                                                            test_counts, effect_size))
+            chunks = _frequency_permutation_chunks(
+                values, control_counts, test_counts, effect_size, permutation_count,
+                random_seed, legacy_rng, chunk_size
+            )
+            self.__exact = False
+            self._collect_permutations(chunks, THRESHOLD, sequential, int(exceedances), precision,
+                                       deadline)
+            return
 
+        THRESHOLD = abs(_two_group_difference(control, test, 
+                                                is_paired, effect_size))
 
-            es = two_group_difference(control_sample, test_sample, 
-                                    False, effect_size)
-            
-            group_var = calculate_group_var(var(control_sample, ddof=1), 
-                                      CONTROL_LEN, 
-                                      var(test_sample, ddof=1), 
-                                      len(test_sample))
-            self.__permutations.append(es)
-            self.__permutations_var.append(group_var)
+        self.__exact = (exact and not isnan(BAG).any() and
+                        _exact_permutation_count(CONTROL_LEN, TEST_LEN, is_paired)
+                        <= _EXACT_PERMUTATION_LIMIT)
+        if self.__exact:
+            es, group_var = next(_exact_permutation_chunks(control, test, is_paired, effect_size))
+            # Permutations that give the observed effect size up to rounding
+            # errors, such as the identity, are ties and not exceedances.
+            THRESHOLD = THRESHOLD + _EXACT_TIE_TOLERANCE * max(THRESHOLD, abs(es).max())
+            self._collect_permutations([(es, group_var)], THRESHOLD, False, 0, None)
+            self.__pvalue_se = 0.
+            return
+
+        if (proportional and not legacy_rng and effect_size in ["mean_diff", "cohens_h"]
+            and not isnan(BAG).any()):
+            chunks = _proportion_permutation_chunks(control, test, is_paired, effect_size,
+                                                    permutation_count, random_seed,
+                                                    legacy_rng, chunk_size)
+        elif (effect_size == "cliffs_delta" and not is_paired
+            and not isnan(BAG).any()):
+            chunks = _cliffs_delta_permutation_chunks(BAG, CONTROL_LEN, permutation_count,
+                                                      random_seed, legacy_rng, chunk_size)
+        elif effect_size in _MOMENT_EFFECT_SIZES and not isnan(BAG).any():
+            if moments is None:
+                moment_chunks = _permutation_moment_chunks(control, test, is_paired,
+                                                           permutation_count, random_seed,
+                                                           legacy_rng, chunk_size)
+            else:
+                moment_chunks = [moments]
+            chunks = _permutation_chunks_from_moments(moment_chunks, effect_size,
+                                                      CONTROL_LEN, TEST_LEN)
+        else:
+            rows = _permutation_rows(control, test, is_paired, permutation_count,
+                                     random_seed, legacy_rng, chunk_size)
+            chunks = _permutation_chunks_from_rows(rows, effect_size, CONTROL_LEN, TEST_LEN)
 
-            if abs(es) > THRESHOLD:
-                EXTREME_COUNT += 1.
+        self._collect_permutations(chunks, THRESHOLD, sequential, int(exceedances), precision,
+                                   deadline)
 
-        self.__permutations = array(self.__permutations)
-        self.__permutations_var = array(self.__permutations_var)
 
-        self.pvalue = EXTREME_COUNT / self.__permutation_count
+    def _collect_permutations(self, chunks, THRESHOLD, sequential, exceedances, precision,
+                              deadline=None):
+        '''
+        Concatenates the permuted effect sizes and group variances yielded
+        in chunks, and computes the p-value.
+
+        In the sequential mode, the permutations stop at the one that brings
+        the number of exceedances to `exceedances`, giving the Besag-Clifford
+        p-value `exceedances / permutations_used`, or at the end of the first
+        chunk after which the standard error of the p-value is at most
+        `precision`. In any mode, they stop at the end of the first chunk
+        after which `deadline` has passed.
+        '''
+        permutations = []
+        permutations_var = []
+        EXTREME_COUNT = 0.
+        permutations_used = 0
+        stopped_by_exceedances = False
+        for es, group_var in chunks:
+            extreme = abs(es) > THRESHOLD
+            if sequential and EXTREME_COUNT + extreme.sum() >= exceedances:
+                stop = flatnonzero(extreme)[exceedances - int(EXTREME_COUNT) - 1] + 1
+                es, group_var, extreme = es[:stop], group_var[:stop], extreme[:stop]
+                stopped_by_exceedances = True
+
+            permutations.append(es)
+            permutations_var.append(group_var)
+            EXTREME_COUNT += float(extreme.sum())
+            permutations_used += len(es)
+
+            if stopped_by_exceedances:
+                break
+            if sequential and precision is not None:
+                # Shrunk towards 1/2, so that a chunk without any exceedance
+                # does not look like a perfectly precise p-value of zero.
+                p = (EXTREME_COUNT + 1) / (permutations_used + 1)
+                if sqrt(p * (1 - p) / permutations_used) <= precision:
+                    break
+            if deadline is not None and perf_counter() >= deadline:
+                break
+
+        self.__permutations = concatenate(permutations)
+        self.__permutations_var = concatenate(permutations_var)
+        self.__permutations_used = permutations_used
+
+        self.pvalue = EXTREME_COUNT / permutations_used
+        if stopped_by_exceedances:
+            # The number of permutations is negative binomial here.
+            self.__pvalue_se = self.pvalue * sqrt((1 - self.pvalue) / EXTREME_COUNT)
+        else:
+            self.__pvalue_se = sqrt(self.pvalue * (1 - self.pvalue) / permutations_used)
 
 
     def __repr__(self):
-        return("{} permutations were taken. The p-value is {}.".format(self.__permutation_count, 
+        return("{} permutations were taken. The p-value is {}.".format(self.__permutations_used, 
                                                                       self.pvalue))
 
 
@@ -1486,6 +2665,33 @@ class PermutationTest:
         return self.__permutation_count
 
 
+    @property
+    def permutations_used(self):
+        """
+        The number of permutations actually performed. This is
+        `permutation_count`, unless the sequential mode or a deadline
+        stopped the test early.
+        """
+        return self.__permutations_used
+
+
+    @property
+    def pvalue_se(self):
+        """
+        The Monte Carlo standard error of the p-value.
+        """
+        return self.__pvalue_se
+
+
+    @property
+    def exact(self):
+        """
+        Whether every distinct permutation was enumerated, making the p-value
+        exact.
+        """
+        return self.__exact
+
+
     @property
     def permutations(self):
         """
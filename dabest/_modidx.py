@@ -17,36 +17,148 @@ d = { 'settings': { 'branch': 'master',
                                                                                                                      'dabest/_stats_tools/confint_1group.py'),
                                                     'dabest._stats_tools.confint_1group.summary_ci_1group': ( 'API/confint_1group.html#summary_ci_1group',
                                                                                                               'dabest/_stats_tools/confint_1group.py')},
-            'dabest._stats_tools.confint_2group_diff': { 'dabest._stats_tools.confint_2group_diff._calc_accel': ( 'API/confint_2group_diff.html#_calc_accel',
+            'dabest._stats_tools.confint_2group_diff': { 'dabest._stats_tools.confint_2group_diff._ContinuedGenerator': ( 'API/confint_2group_diff.html#_continuedgenerator',
+                                                                                                                          'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._ContinuedGenerator.__init__': ( 'API/confint_2group_diff.html#_continuedgenerator.__init__',
+                                                                                                                                   'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._as_generator': ( 'API/confint_2group_diff.html#_as_generator',
+                                                                                                                    'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._batch_delta2_bootstrapped_diff': ( 'API/confint_2group_diff.html#_batch_delta2_bootstrapped_diff',
+                                                                                                                                      'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._bootstrap_batch_func': ( 'API/confint_2group_diff.html#_bootstrap_batch_func',
+                                                                                                                            'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._bootstrap_index_chunks': ( 'API/confint_2group_diff.html#_bootstrap_index_chunks',
+                                                                                                                              'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._calc_accel': ( 'API/confint_2group_diff.html#_calc_accel',
                                                                                                                   'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._ci_levels': ( 'API/confint_2group_diff.html#_ci_levels',
+                                                                                                                 'dabest/_stats_tools/confint_2group_diff.py'),
                                                          'dabest._stats_tools.confint_2group_diff._compute_alpha_from_ci': ( 'API/confint_2group_diff.html#_compute_alpha_from_ci',
                                                                                                                              'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._compute_chunk_size': ( 'API/confint_2group_diff.html#_compute_chunk_size',
+                                                                                                                          'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._compute_cliffs_delta_jackknife_closed_form': ( 'API/confint_2group_diff.html#_compute_cliffs_delta_jackknife_closed_form',
+                                                                                                                                                  'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._compute_cohens_h_jackknife_closed_form': ( 'API/confint_2group_diff.html#_compute_cohens_h_jackknife_closed_form',
+                                                                                                                                              'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._compute_meandiff_jackknife_closed_form': ( 'API/confint_2group_diff.html#_compute_meandiff_jackknife_closed_form',
+                                                                                                                                              'dabest/_stats_tools/confint_2group_diff.py'),
                                                          'dabest._stats_tools.confint_2group_diff._compute_quantile': ( 'API/confint_2group_diff.html#_compute_quantile',
                                                                                                                         'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._continued_stream': ( 'API/confint_2group_diff.html#_continued_stream',
+                                                                                                                        'dabest/_stats_tools/confint_2group_diff.py'),
                                                          'dabest._stats_tools.confint_2group_diff._create_two_group_jackknife_indexes': ( 'API/confint_2group_diff.html#_create_two_group_jackknife_indexes',
                                                                                                                                           'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._draw_indexes': ( 'API/confint_2group_diff.html#_draw_indexes',
+                                                                                                                    'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._exact_bootstrap_median_distribution': ( 'API/confint_2group_diff.html#_exact_bootstrap_median_distribution',
+                                                                                                                                           'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._group_generators': ( 'API/confint_2group_diff.html#_group_generators',
+                                                                                                                        'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._interleaved_index_chunks': ( 'API/confint_2group_diff.html#_interleaved_index_chunks',
+                                                                                                                                'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._interval_table': ( 'API/confint_2group_diff.html#_interval_table',
+                                                                                                                      'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._interval_widths': ( 'API/confint_2group_diff.html#_interval_widths',
+                                                                                                                       'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._leave_one_out_moments': ( 'API/confint_2group_diff.html#_leave_one_out_moments',
+                                                                                                                             'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._merge_sorted': ( 'API/confint_2group_diff.html#_merge_sorted',
+                                                                                                                    'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._paired_binary_cells': ( 'API/confint_2group_diff.html#_paired_binary_cells',
+                                                                                                                           'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._proportion_difference': ( 'API/confint_2group_diff.html#_proportion_difference',
+                                                                                                                             'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._random_streams': ( 'API/confint_2group_diff.html#_random_streams',
+                                                                                                                      'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._run_bootstrap_batches': ( 'API/confint_2group_diff.html#_run_bootstrap_batches',
+                                                                                                                             'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._sample_exact_difference': ( 'API/confint_2group_diff.html#_sample_exact_difference',
+                                                                                                                               'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff._spawn': ( 'API/confint_2group_diff.html#_spawn',
+                                                                                                             'dabest/_stats_tools/confint_2group_diff.py'),
                                                          'dabest._stats_tools.confint_2group_diff.calculate_group_var': ( 'API/confint_2group_diff.html#calculate_group_var',
                                                                                                                           'dabest/_stats_tools/confint_2group_diff.py'),
                                                          'dabest._stats_tools.confint_2group_diff.calculate_weighted_delta': ( 'API/confint_2group_diff.html#calculate_weighted_delta',
                                                                                                                                'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff.combine_group_bootstraps': ( 'API/confint_2group_diff.html#combine_group_bootstraps',
+                                                                                                                               'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff.compute_adaptive_bootstraps': ( 'API/confint_2group_diff.html#compute_adaptive_bootstraps',
+                                                                                                                                  'dabest/_stats_tools/confint_2group_diff.py'),
                                                          'dabest._stats_tools.confint_2group_diff.compute_bootstrapped_diff': ( 'API/confint_2group_diff.html#compute_bootstrapped_diff',
                                                                                                                                 'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff.compute_bootstrapped_diffs': ( 'API/confint_2group_diff.html#compute_bootstrapped_diffs',
+                                                                                                                                 'dabest/_stats_tools/confint_2group_diff.py'),
                                                          'dabest._stats_tools.confint_2group_diff.compute_delta2_bootstrapped_diff': ( 'API/confint_2group_diff.html#compute_delta2_bootstrapped_diff',
                                                                                                                                        'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff.compute_exact_bootstrapped_median_diff': ( 'API/confint_2group_diff.html#compute_exact_bootstrapped_median_diff',
+                                                                                                                                             'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff.compute_frequency_bootstrapped_diff': ( 'API/confint_2group_diff.html#compute_frequency_bootstrapped_diff',
+                                                                                                                                          'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff.compute_frequency_jackknife': ( 'API/confint_2group_diff.html#compute_frequency_jackknife',
+                                                                                                                                  'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff.compute_group_bootstraps': ( 'API/confint_2group_diff.html#compute_group_bootstraps',
+                                                                                                                               'dabest/_stats_tools/confint_2group_diff.py'),
                                                          'dabest._stats_tools.confint_2group_diff.compute_interval_limits': ( 'API/confint_2group_diff.html#compute_interval_limits',
                                                                                                                               'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff.compute_interval_limits_se': ( 'API/confint_2group_diff.html#compute_interval_limits_se',
+                                                                                                                                 'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff.compute_intervals': ( 'API/confint_2group_diff.html#compute_intervals',
+                                                                                                                        'dabest/_stats_tools/confint_2group_diff.py'),
                                                          'dabest._stats_tools.confint_2group_diff.compute_meandiff_bias_correction': ( 'API/confint_2group_diff.html#compute_meandiff_bias_correction',
                                                                                                                                        'dabest/_stats_tools/confint_2group_diff.py'),
                                                          'dabest._stats_tools.confint_2group_diff.compute_meandiff_jackknife': ( 'API/confint_2group_diff.html#compute_meandiff_jackknife',
                                                                                                                                  'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff.compute_paired_bootstrapped_diffs': ( 'API/confint_2group_diff.html#compute_paired_bootstrapped_diffs',
+                                                                                                                                        'dabest/_stats_tools/confint_2group_diff.py'),
+                                                         'dabest._stats_tools.confint_2group_diff.compute_proportion_bootstrapped_diff': ( 'API/confint_2group_diff.html#compute_proportion_bootstrapped_diff',
+                                                                                                                                           'dabest/_stats_tools/confint_2group_diff.py'),
                                                          'dabest._stats_tools.confint_2group_diff.create_jackknife_indexes': ( 'API/confint_2group_diff.html#create_jackknife_indexes',
                                                                                                                                'dabest/_stats_tools/confint_2group_diff.py'),
                                                          'dabest._stats_tools.confint_2group_diff.create_repeated_indexes': ( 'API/confint_2group_diff.html#create_repeated_indexes',
                                                                                                                               'dabest/_stats_tools/confint_2group_diff.py')},
-            'dabest._stats_tools.effsize': { 'dabest._stats_tools.effsize._compute_hedges_correction_factor': ( 'API/effsize.html#_compute_hedges_correction_factor',
+            'dabest._stats_tools.effsize': { 'dabest._stats_tools.effsize._batch_cliffs_delta': ( 'API/effsize.html#_batch_cliffs_delta',
+                                                                                                  'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._batch_standardized_difference': ( 'API/effsize.html#_batch_standardized_difference',
+                                                                                                             'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._batch_sums_of_squares': ( 'API/effsize.html#_batch_sums_of_squares',
+                                                                                                     'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._batch_two_group_difference': ( 'API/effsize.html#_batch_two_group_difference',
+                                                                                                          'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._cliffs_delta_from_rank_sum': ( 'API/effsize.html#_cliffs_delta_from_rank_sum',
+                                                                                                          'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._compute_hedges_correction_factor': ( 'API/effsize.html#_compute_hedges_correction_factor',
                                                                                                                 'dabest/_stats_tools/effsize.py'),
                                              'dabest._stats_tools.effsize._compute_standardizers': ( 'API/effsize.html#_compute_standardizers',
                                                                                                      'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._frequency_brunnermunzel': ( 'API/effsize.html#_frequency_brunnermunzel',
+                                                                                                       'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._frequency_kruskal': ( 'API/effsize.html#_frequency_kruskal',
+                                                                                                 'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._frequency_mannwhitneyu': ( 'API/effsize.html#_frequency_mannwhitneyu',
+                                                                                                      'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._frequency_median': ( 'API/effsize.html#_frequency_median',
+                                                                                                'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._frequency_midranks': ( 'API/effsize.html#_frequency_midranks',
+                                                                                                  'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._frequency_moments': ( 'API/effsize.html#_frequency_moments',
+                                                                                                 'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._frequency_order_statistic': ( 'API/effsize.html#_frequency_order_statistic',
+                                                                                                         'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._frequency_quantile': ( 'API/effsize.html#_frequency_quantile',
+                                                                                                  'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._frequency_ttest_ind': ( 'API/effsize.html#_frequency_ttest_ind',
+                                                                                                   'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._frequency_two_group_difference': ( 'API/effsize.html#_frequency_two_group_difference',
+                                                                                                              'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._pooled_dense_ranks': ( 'API/effsize.html#_pooled_dense_ranks',
+                                                                                                  'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._pooled_frequency_table': ( 'API/effsize.html#_pooled_frequency_table',
+                                                                                                      'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._two_group_difference': ( 'API/effsize.html#_two_group_difference',
+                                                                                                    'dabest/_stats_tools/effsize.py'),
+                                             'dabest._stats_tools.effsize._warn_median_diff': ( 'API/effsize.html#_warn_median_diff',
+                                                                                                'dabest/_stats_tools/effsize.py'),
                                              'dabest._stats_tools.effsize.cliffs_delta': ( 'API/effsize.html#cliffs_delta',
                                                                                            'dabest/_stats_tools/effsize.py'),
                                              'dabest._stats_tools.effsize.cohens_d': ( 'API/effsize.html#cohens_d',
@@ -82,6 +194,8 @@ d = { 'settings': { 'branch': 'master',
                                                                                     'dabest/plot_tools.py'),
                                    'dabest.plot_tools.SwarmPlot._swarm': ('API/plot_tools.html#swarmplot._swarm', 'dabest/plot_tools.py'),
                                    'dabest.plot_tools.SwarmPlot.plot': ('API/plot_tools.html#swarmplot.plot', 'dabest/plot_tools.py'),
+                                   'dabest.plot_tools._frequency_summaries': ( 'API/plot_tools.html#_frequency_summaries',
+                                                                               'dabest/plot_tools.py'),
                                    'dabest.plot_tools.check_data_matches_labels': ( 'API/plot_tools.html#check_data_matches_labels',
                                                                                     'dabest/plot_tools.py'),
                                    'dabest.plot_tools.error_bar': ('API/plot_tools.html#error_bar', 'dabest/plot_tools.py'),
@@ -6,16 +6,21 @@ __all__ = ['create_bootstrap_indexes', 'compute_1group_jackknife', 'compute_1gro
 
 # %% ../../nbs/API/confint_1group.ipynb 4
 import numpy as np
-from numpy.random import PCG64, RandomState
+from numpy.random import PCG64, RandomState, default_rng
 from scipy.stats import norm
 from numpy import sort as npsort
 
 # %% ../../nbs/API/confint_1group.ipynb 5
-def create_bootstrap_indexes(array, resamples=5000, random_seed=12345):
+def create_bootstrap_indexes(array, resamples=5000, random_seed=12345, legacy_rng=True):
     """Given an array-like, returns a generator of bootstrap indexes
-    to be used for resampling.
+    to be used for resampling. If `legacy_rng` is False, the indexes are
+    drawn with a `numpy.random.Generator` instead of a `RandomState`.
     """
 
+    if not legacy_rng:
+        rng = default_rng(random_seed)
+        return (rng.integers(0, len(array), len(array)) for i in range(0, resamples))
+
     rng = RandomState(PCG64(random_seed))
 
     indexes = range(0, len(array))
@@ -25,12 +30,25 @@ def create_bootstrap_indexes(array, resamples=5000, random_seed=12345):
     return out
 
 
+# Reducers whose leave-one-out values have a closed form.
+_MEAN_LIKE_FUNCS = [np.mean, np.nanmean, np.average]
+
+
 def compute_1group_jackknife(x, func, *args, **kwargs):
     """
     Returns the jackknife bootstraps for func(x).
+
+    If `func` is a mean (see `_MEAN_LIKE_FUNCS`) and no extra arguments are
+    given, the leave-one-out means are computed in closed form, in O(n)
+    instead of O(n^2) time and memory.
     """
     from . import confint_2group_diff as ci_2g
 
+    if any(func is f for f in _MEAN_LIKE_FUNCS) and not args and not kwargs:
+        x = np.asarray(x, dtype=float)
+        if len(x) > 1 and not np.isnan(x).any():
+            return ci_2g._leave_one_out_moments(x)[0]
+
     jackknives = [i for i in ci_2g.create_jackknife_indexes(x)]
     out = [func(x[j], *args, **kwargs) for j in jackknives]
     del jackknives  # memory management.
@@ -47,13 +65,13 @@ def compute_1group_acceleration(jack_dist):
 
 
 def compute_1group_bootstraps(
-    x, func, resamples=5000, random_seed=12345, *args, **kwargs
+    x, func, resamples=5000, random_seed=12345, *args, legacy_rng=True, **kwargs
 ):
     """Bootstraps func(x), with the number of specified resamples."""
 
     # Create bootstrap indexes.
     boot_indexes = create_bootstrap_indexes(
-        x, resamples=resamples, random_seed=random_seed
+        x, resamples=resamples, random_seed=random_seed, legacy_rng=legacy_rng
     )
 
     out = [func(x[b], *args, **kwargs) for b in boot_indexes]
@@ -78,6 +96,7 @@ def summary_ci_1group(
     random_seed: int = 12345,  # `random_seed` is used to seed the random number generator during bootstrap resampling. This ensures that the confidence intervals reported are replicable.
     sort_bootstraps: bool = True,
     *args,
+    legacy_rng: bool = True,  # If True, resample with a `RandomState` as in previous versions; otherwise with a `numpy.random.Generator`.
     **kwargs
 ):
     """
@@ -104,7 +123,13 @@ def summary_ci_1group(
     from . import confint_2group_diff as ci2g
 
     boots = compute_1group_bootstraps(
-        x, func, resamples=resamples, random_seed=random_seed, *args, **kwargs
+        x,
+        func,
+        resamples,
+        random_seed,
+        *args,
+        legacy_rng=legacy_rng,
+        **kwargs
     )
     bias = compute_1group_bias_correction(x, boots, func)
 
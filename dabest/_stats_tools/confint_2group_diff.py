@@ -1,18 +1,25 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/API/confint_2group_diff.ipynb.
 
 # %% auto 0
-__all__ = ['create_jackknife_indexes', 'create_repeated_indexes', 'compute_meandiff_jackknife', 'compute_bootstrapped_diff',
+__all__ = ['create_jackknife_indexes', 'create_repeated_indexes', 'compute_meandiff_jackknife', 'compute_bootstrapped_diffs',
+           'compute_paired_bootstrapped_diffs', 'compute_bootstrapped_diff', 'compute_proportion_bootstrapped_diff',
+           'compute_frequency_jackknife', 'compute_frequency_bootstrapped_diff',
+           'compute_exact_bootstrapped_median_diff', 'compute_group_bootstraps', 'combine_group_bootstraps',
            'compute_delta2_bootstrapped_diff', 'compute_meandiff_bias_correction', 'compute_interval_limits',
-           'calculate_group_var', 'calculate_weighted_delta']
+           'compute_intervals', 'compute_interval_limits_se', 'compute_adaptive_bootstraps', 'calculate_group_var',
+           'calculate_weighted_delta']
 
 # %% ../../nbs/API/confint_2group_diff.ipynb 4
 import numpy as np
 from numpy import arange, delete, errstate
 from numpy import mean as npmean
 from numpy import sum as npsum
-from numpy.random import PCG64, RandomState
+from numpy.random import PCG64, Generator, RandomState, SeedSequence, default_rng
 import pandas as pd
-from scipy.stats import norm
+import warnings
+from time import perf_counter
+from scipy.special import gammaln
+from scipy.stats import binom, norm
 from numpy import isnan
 
 # %% ../../nbs/API/confint_2group_diff.ipynb 5
@@ -46,6 +53,13 @@ def create_repeated_indexes(data):
     return (index_range for i in index_range)
 
 
+# Effect sizes with closed-form jackknives and batched bootstraps.
+_BATCHED_EFFECT_SIZES = ["mean_diff", "cohens_d", "hedges_g", "delta_g"]
+
+# Default upper bound, in bytes, on the working memory of one batch of resamples.
+_MEMORY_BUDGET = 64 * 1024**2
+
+
 def _create_two_group_jackknife_indexes(x0, x1, is_paired):
     """Creates the jackknife bootstrap for 2 groups."""
 
@@ -77,12 +91,184 @@ def _create_two_group_jackknife_indexes(x0, x1, is_paired):
     return out
 
 
+def _leave_one_out_moments(x):
+    """
+    Returns the means and the sample variances (N-1 degrees of freedom) of
+    the n leave-one-out subsets of `x`, computed from its sum and sum of
+    squared deviations in O(n).
+    """
+    n = len(x)
+    mean = npmean(x)
+    dev = x - mean
+    sum_sq = npsum(dev**2)
+
+    loo_mean = mean - dev / (n - 1)
+    # Removing x[i] lowers the sum of squared deviations by n/(n-1) * dev[i]**2.
+    loo_sum_sq = np.maximum(sum_sq - dev**2 * n / (n - 1), 0)
+    with errstate(divide="ignore", invalid="ignore"):
+        loo_var = loo_sum_sq / (n - 2)
+
+    return loo_mean, loo_var
+
+
+def _compute_meandiff_jackknife_closed_form(x0, x1, is_paired, effect_size):
+    """
+    Computes the same jackknife distribution as `compute_meandiff_jackknife`
+    for the effect sizes in `_BATCHED_EFFECT_SIZES`, in linear time.
+    """
+    from . import effsize as __es
+
+    x0_len = len(x0)
+    x1_len = len(x1)
+
+    if is_paired:
+        # Each jackknife sample leaves out one pair.
+        M, _ = _leave_one_out_moments(x1 - x0)
+        if effect_size == "mean_diff":
+            return M
+
+        _, x0_loo_var = _leave_one_out_moments(x0)
+        _, x1_loo_var = _leave_one_out_moments(x1)
+        divisor = np.sqrt((x0_loo_var + x1_loo_var) / 2)
+        control_n, test_n = x0_len - 1, x1_len - 1
+
+    else:
+        x0_mean, x1_mean = npmean(x0), npmean(x1)
+        x0_loo_mean, x0_loo_var = _leave_one_out_moments(x0)
+        x1_loo_mean, x1_loo_var = _leave_one_out_moments(x1)
+
+        # `_create_two_group_jackknife_indexes` pairs the jackknife indexes
+        # of one group with the repeated indexes of the other using `zip`,
+        # so only the first min(n0, n1) observations of each group are
+        # left out. Keep the same jackknife distribution.
+        n_min = min(x0_len, x1_len)
+        x0_loo_mean, x0_loo_var = x0_loo_mean[:n_min], x0_loo_var[:n_min]
+        x1_loo_mean, x1_loo_var = x1_loo_mean[:n_min], x1_loo_var[:n_min]
+
+        # Control observations are left out first, then test observations.
+        M = np.concatenate([x1_mean - x0_loo_mean, x1_loo_mean - x0_mean])
+        if effect_size == "mean_diff":
+            return M
+
+        x0_var, x1_var = np.var(x0, ddof=1), np.var(x1, ddof=1)
+        pooled_var = np.concatenate(
+            [
+                ((x0_len - 2) * x0_loo_var + (x1_len - 1) * x1_var)
+                / (x0_len + x1_len - 3),
+                ((x0_len - 1) * x0_var + (x1_len - 2) * x1_loo_var)
+                / (x0_len + x1_len - 3),
+            ]
+        )
+        divisor = np.sqrt(pooled_var)
+        # Both kinds of jackknife samples have the same total size.
+        control_n, test_n = x0_len - 1, x1_len
+
+    if (divisor == 0).any():
+        raise ValueError("The divisor is zero, indicating no variability in the data.")
+
+    d = M / divisor
+    if effect_size == "cohens_d":
+        return d
+
+    return __es._compute_hedges_correction_factor(control_n, test_n) * d
+
+
+def _compute_cohens_h_jackknife_closed_form(x0, x1, is_paired):
+    """
+    Computes the same jackknife distribution as `compute_meandiff_jackknife`
+    for Cohen's h, in linear time. Leaving out one observation of a binary
+    group only removes it from the number of ones.
+    """
+    x0_ones, x1_ones = npsum(x0), npsum(x1)
+    x0_len, x1_len = len(x0), len(x1)
+
+    if is_paired:
+        control_ones, test_ones = x0_ones - x0, x1_ones - x1
+        control_n, test_n = x0_len - 1, x1_len - 1
+    else:
+        # As in `_compute_meandiff_jackknife_closed_form`, only the first
+        # min(n0, n1) observations of each group are left out.
+        n_min = min(x0_len, x1_len)
+        control_ones = np.concatenate([x0_ones - x0[:n_min], np.repeat(x0_ones, n_min)])
+        test_ones = np.concatenate([np.repeat(x1_ones, n_min), x1_ones - x1[:n_min]])
+        control_n = np.repeat([x0_len - 1, x0_len], n_min)
+        test_n = np.repeat([x1_len, x1_len - 1], n_min)
+
+    return _proportion_difference(
+        control_ones, test_ones, control_n, test_n, is_paired, "cohens_h"
+    )
+
+
+def _compute_cliffs_delta_jackknife_closed_form(x0, x1):
+    """
+    Computes the same jackknife distribution as `compute_meandiff_jackknife`
+    for Cliff's delta of two unpaired groups, in O(n log n). Leaving out one
+    observation only removes its own wins from the Mann-Whitney U statistic.
+    """
+    x0_len, x1_len = len(x0), len(x1)
+    x0_sorted, x1_sorted = np.sort(x0), np.sort(x1)
+
+    # Wins of each control observation: the test values above it, plus
+    # half of the test values tied with it. Likewise for the test values.
+    x0_below = np.searchsorted(x1_sorted, x0, side="left")
+    x0_ties = np.searchsorted(x1_sorted, x0, side="right") - x0_below
+    x1_below = np.searchsorted(x0_sorted, x1, side="left")
+    x1_ties = np.searchsorted(x0_sorted, x1, side="right") - x1_below
+
+    control_wins = x1_len - x0_below - 0.5 * x0_ties
+    test_wins = x1_below + 0.5 * x1_ties
+    U = npsum(test_wins)
+
+    # As in `_compute_meandiff_jackknife_closed_form`, only the first
+    # min(n0, n1) observations of each group are left out.
+    n_min = min(x0_len, x1_len)
+    control_loo = (2 * (U - control_wins[:n_min])) / ((x0_len - 1) * x1_len) - 1
+    test_loo = (2 * (U - test_wins[:n_min])) / (x0_len * (x1_len - 1)) - 1
+
+    return np.concatenate([control_loo, test_loo])
+
+
 def compute_meandiff_jackknife(x0, x1, is_paired, effect_size):
     """
     Given two arrays, returns the jackknife for their effect size.
+
+    For the effect sizes in `_BATCHED_EFFECT_SIZES` and Cohen's h, the
+    leave-one-out statistics are computed in closed form, in linear time.
+    For Cliff's delta of unpaired groups, they are computed from sorted
+    copies of the groups, in O(n log n).
     """
     from . import effsize as __es
 
+    if (
+        effect_size == "cohens_h"
+        and not (is_paired and len(x0) != len(x1))
+        and np.isin(x0, [0, 1]).all()
+        and np.isin(x1, [0, 1]).all()
+    ):
+        return _compute_cohens_h_jackknife_closed_form(
+            np.asarray(x0), np.asarray(x1), is_paired
+        )
+
+    if (
+        effect_size in _BATCHED_EFFECT_SIZES
+        and not (is_paired and len(x0) != len(x1))
+        and not isnan(x0).any()
+        and not isnan(x1).any()
+    ):
+        return _compute_meandiff_jackknife_closed_form(
+            np.asarray(x0), np.asarray(x1), is_paired, effect_size
+        )
+
+    if (
+        effect_size == "cliffs_delta"
+        and not is_paired
+        and not isnan(x0).any()
+        and not isnan(x1).any()
+    ):
+        return _compute_cliffs_delta_jackknife_closed_form(
+            np.asarray(x0), np.asarray(x1)
+        )
+
     jackknives = _create_two_group_jackknife_indexes(x0, x1, is_paired)
 
     out = []
@@ -91,53 +277,864 @@ def compute_meandiff_jackknife(x0, x1, is_paired, effect_size):
         x0_shuffled = x0[j[0]]
         x1_shuffled = x1[j[1]]
 
-        es = __es.two_group_difference(x0_shuffled, x1_shuffled, is_paired, effect_size)
+        es = __es._two_group_difference(x0_shuffled, x1_shuffled, is_paired, effect_size)
         out.append(es)
 
     return out
 
 
-def _calc_accel(jack_dist):
+def _calc_accel(jack_dist, weights=None):
     """
     Given the Jackknife distribution, calculates the acceleration factor.
+    If given, `weights` are the number of times each value of `jack_dist`
+    occurs in the distribution.
     """
-    jack_mean = npmean(jack_dist)
-
-    numer = npsum((jack_mean - jack_dist) ** 3)
-    denom = 6.0 * (npsum((jack_mean - jack_dist) ** 2) ** 1.5)
+    if weights is None:
+        jack_mean = npmean(jack_dist)
+        numer = npsum((jack_mean - jack_dist) ** 3)
+        denom = 6.0 * (npsum((jack_mean - jack_dist) ** 2) ** 1.5)
+    else:
+        jack_mean = npsum(weights * jack_dist) / npsum(weights)
+        numer = npsum(weights * (jack_mean - jack_dist) ** 3)
+        denom = 6.0 * (npsum(weights * (jack_mean - jack_dist) ** 2) ** 1.5)
 
     with errstate(invalid="ignore"):
         # does not raise warning if invalid division encountered.
         return numer / denom
 
 
-def compute_bootstrapped_diff(
-    x0, x1, is_paired, effect_size, resamples=5000, random_seed=12345
+def _compute_chunk_size(row_len, resamples, memory_budget):
+    """
+    Returns the number of resamples of `row_len` observations that can be
+    processed in one batch without exceeding `memory_budget` bytes.
+    """
+    # The integer indexes, the resampled values and one temporary array
+    # of the same shape are alive at the same time.
+    row_bytes = max(int(row_len), 1) * 8 * 3
+    chunk_size = int(memory_budget // row_bytes)
+
+    return max(1, min(chunk_size, int(resamples)))
+
+
+# The number of resamples or permutations drawn from each child stream
+# when `random_seed` is a `numpy.random.SeedSequence`.
+_STREAM_BLOCK_SIZE = 1000
+
+# The keys of the child streams spawned from a `SeedSequence`: the
+# comparisons, the per-group bootstraps and the delta-delta of a Dabest
+# object, then the stages of each comparison.
+_COMPARISON_STREAMS, _GROUP_STREAMS, _DELTA2_STREAMS = 0, 1, 2
+_BOOTSTRAP_STREAM, _PERMUTATION_STREAM = 0, 1
+
+
+def _spawn(random_seed, *key):
+    """
+    Returns the child stream of `random_seed` at `key`: the `SeedSequence`
+    that `spawn` gives for each index of `key` in turn, without depending on
+    how many children were spawned before. An int seed is returned as it
+    is, so that every stage draws from the same stream as in previous
+    versions.
+    """
+    if not isinstance(random_seed, SeedSequence):
+        return random_seed
+    return SeedSequence(
+        random_seed.entropy,
+        spawn_key=tuple(random_seed.spawn_key) + key,
+        pool_size=random_seed.pool_size,
+    )
+
+
+def _random_streams(random_seed, count, chunk_size, legacy_rng=True):
+    """
+    Yields a generator and a number of draws for each of the consecutive
+    chunks of `count` random draws (resamples or permutations), with at most
+    `chunk_size` draws per chunk. The generators are `RandomState`s, or
+    `numpy.random.Generator`s if `legacy_rng` is False.
+
+    The draws are split in blocks of `_STREAM_BLOCK_SIZE`, and no chunk
+    straddles two blocks. With a `SeedSequence`, each block is drawn from its
+    own child stream. The blocks are independent of each other, so they can
+    be computed in any order, or by separate workers, with the same results.
+    With an int `random_seed`, all the blocks use one stream seeded with it;
+    a `RandomState` or a `Generator` is used as that stream as it is, so that
+    successive calls of whole blocks continue it as a single call would.
+    Within a block, the chunks consume the stream in order, so that nothing
+    depends on `chunk_size`.
+    """
+    count = int(count)
+    chunk_size = max(int(chunk_size), 1)
+    starts = range(0, count, _STREAM_BLOCK_SIZE)
+    if isinstance(random_seed, SeedSequence):
+        seeds = [_spawn(random_seed, b) for b in range(len(starts))]
+    else:
+        if not isinstance(random_seed, (RandomState, Generator)):
+            random_seed = RandomState(PCG64(random_seed)) if legacy_rng else default_rng(random_seed)
+        seeds = [random_seed] * len(starts)
+
+    for seed, start in zip(seeds, starts):
+        if isinstance(seed, (RandomState, Generator)):
+            rng = seed
+        else:
+            rng = RandomState(PCG64(seed)) if legacy_rng else default_rng(seed)
+        block_size = min(_STREAM_BLOCK_SIZE, count - start)
+        for chunk_start in range(0, block_size, chunk_size):
+            yield rng, min(chunk_size, block_size - chunk_start)
+
+
+def _as_generator(rng):
+    """
+    Returns a `Generator` drawing from the stream of `rng`: `rng` itself, or
+    a `Generator` on the bit generator of a `RandomState`. It makes the draws
+    that `RandomState` cannot make one resample after the other, such as
+    multinomials of several groups at once.
+    """
+    if isinstance(rng, RandomState):
+        return Generator(rng._bit_generator)
+    return rng
+
+
+def _draw_indexes(rng, n, size):
+    """
+    Draws an array of `size` random indexes of `n` observations, with
+    `randint` for a `RandomState` and `integers` for a `Generator`.
+    """
+    if isinstance(rng, RandomState):
+        return rng.randint(0, n, size=size)
+    return rng.integers(0, n, size=size)
+
+
+class _ContinuedGenerator(Generator):
+    """
+    A `Generator` that successive calls continue, such as the batches of a
+    time budget. It keeps the generators of the groups made from it (see
+    `_group_generators`), so that every group continues its own stream too,
+    instead of being jumped again from the current state at each call.
+    """
+
+    def __init__(self, bit_generator):
+        super().__init__(bit_generator)
+        self.group_generators = None
+
+
+def _continued_stream(random_seed, legacy_rng=True):
+    """
+    Returns the stream of `random_seed` as a generator that successive calls
+    of whole blocks of draws continue as a single call would (see
+    `_random_streams`).
+    """
+    if legacy_rng:
+        return RandomState(PCG64(random_seed))
+    return _ContinuedGenerator(PCG64(random_seed))
+
+
+def _group_generators(rng, count):
+    """
+    Returns `count` independent `Generator`s, one per group: `rng` itself,
+    then copies of it whose bit generators are jumped ahead 1, 2, ... times.
+    Drawing every group of a chunk from its own generator keeps the indexes
+    independent of the size of the chunks. The generators of a
+    `_ContinuedGenerator` are made once, from its first state.
+    """
+    if isinstance(rng, _ContinuedGenerator):
+        if rng.group_generators is None or len(rng.group_generators) != count:
+            rng.group_generators = [rng] + [
+                Generator(rng.bit_generator.jumped(j)) for j in range(1, count)
+            ]
+        return rng.group_generators
+    return [rng] + [
+        Generator(rng.bit_generator.jumped(j)) for j in range(1, count)
+    ]
+
+
+def _bootstrap_index_chunks(streams, x0_len, x1_len, is_paired):
+    """
+    Yields the bootstrap indexes of both groups as 2D arrays, one for each
+    chunk of `streams` (see `_random_streams`).
+
+    With `RandomState`s, the indexes are drawn in the same order as
+    resampling one bootstrap at a time with `rng.choice`, so the results do
+    not depend on the size of the chunks. With `Generator`s, the indexes of
+    each group are drawn for the whole chunk at once, from a generator of
+    its own (see `_group_generators`).
+    """
+
+    generators = None
+    for rng, size in streams:
+        if is_paired:
+            idx = _draw_indexes(rng, x0_len, (size, x0_len))
+            yield idx, idx
+        elif not isinstance(rng, RandomState):
+            if generators is None or generators[0] is not rng:
+                generators = _group_generators(rng, 2)
+            yield (
+                generators[0].integers(0, x0_len, (size, x0_len)),
+                generators[1].integers(0, x1_len, (size, x1_len)),
+            )
+        else:
+            idx0 = np.empty((size, x0_len), dtype=np.int64)
+            idx1 = np.empty((size, x1_len), dtype=np.int64)
+            for i in range(size):
+                idx0[i] = rng.randint(0, x0_len, x0_len)
+                idx1[i] = rng.randint(0, x1_len, x1_len)
+            yield idx0, idx1
+
+
+def _interleaved_index_chunks(streams, lens):
+    """
+    Yields bootstrap indexes of several groups, as one 2D array per group
+    for each chunk of `streams` (see `_random_streams`).
+
+    With `RandomState`s, every resample draws the indexes of the groups one
+    after the other, in the order of `lens`, as when resampling one
+    bootstrap at a time. Groups of equal length are drawn for the whole
+    chunk with a single call. With `Generator`s, the indexes of each group
+    are drawn for the whole chunk at once, from a generator of its own (see
+    `_group_generators`).
+    """
+
+    generators = None
+    for rng, size in streams:
+        if not isinstance(rng, RandomState):
+            if generators is None or generators[0] is not rng:
+                generators = _group_generators(rng, len(lens))
+            yield [g.integers(0, n, (size, n)) for g, n in zip(generators, lens)]
+        elif len(set(lens)) == 1:
+            idx = rng.randint(0, lens[0], size=(size, len(lens), lens[0]))
+            yield [idx[:, j] for j in range(len(lens))]
+        else:
+            idx = [np.empty((size, n), dtype=np.int64) for n in lens]
+            for i in range(size):
+                for j, n in enumerate(lens):
+                    idx[j][i] = rng.randint(0, n, n)
+            yield idx
+
+
+def _bootstrap_batch_func(x0, x1, is_paired, effect_size):
+    """
+    Returns the number of values touched per resample and a function that
+    evaluates `effect_size` on a batch of resample indices, or None if the
+    effect size cannot be computed in batches.
+    """
+    from . import effsize as __es
+
+    if isnan(x0).any() or isnan(x1).any():
+        return None
+
+    if effect_size in ["cohens_d", "hedges_g", "delta_g"]:
+        # Centre once so that every batch works on well-conditioned sums.
+        x0_center, x1_center = np.mean(x0), np.mean(x1)
+        x0_centered, x1_centered = x0 - x0_center, x1 - x1_center
+
+        def batch_func(idx0, idx1):
+            return __es._batch_standardized_difference(
+                x0_centered[idx0],
+                x1_centered[idx1],
+                is_paired,
+                effect_size,
+                x1_center - x0_center,
+            )
+
+        return len(x0) + len(x1), batch_func
+
+    if effect_size in _BATCHED_EFFECT_SIZES or effect_size == "median_diff":
+
+        def batch_func(idx0, idx1):
+            return __es._batch_two_group_difference(
+                x0[idx0], x1[idx1], is_paired, effect_size
+            )
+
+        return len(x0) + len(x1), batch_func
+
+    if effect_size == "cliffs_delta" and not is_paired:
+        # Rank the pooled data once; the resamples only gather the codes.
+        x0_codes, x1_codes, n_codes = __es._pooled_dense_ranks(x0, x1)
+
+        def batch_func(idx0, idx1):
+            return __es._batch_cliffs_delta(x0_codes[idx0], x1_codes[idx1], n_codes)
+
+        return len(x0) + len(x1) + n_codes, batch_func
+
+    return None
+
+
+def compute_bootstrapped_diffs(
+    x0: np.ndarray,  # Control group.
+    x1: np.ndarray,  # Test group.
+    is_paired: str,
+    effect_sizes: list,  # The effect sizes to bootstrap. Each must be computable in batches.
+    resamples: int = 5000,  # The number of bootstrap resamples to be taken.
+    random_seed: int = 12345,  # `random_seed` is used to seed the random number generator during bootstrap resampling. With a `SeedSequence`, each block of resamples is drawn from its own child stream.
+    memory_budget: int = _MEMORY_BUDGET,  # The maximum number of bytes used by one batch of resamples, per effect size.
+    legacy_rng: bool = True,  # If True, resample with `RandomState`s as in previous versions; otherwise with `numpy.random.Generator`s, which draw the indexes of each chunk faster.
+) -> dict:  # The bootstrapped effect sizes, keyed by effect size.
+    """
+    Bootstraps several effect sizes of 2 groups from the same resamples.
+
+    The resample indices are drawn once and every effect size is evaluated
+    on the same batches, so each effect size gets exactly the bootstraps that
+    `compute_bootstrapped_diff` would return for it.
+    """
+    if is_paired and len(x0) != len(x1):
+        raise ValueError("The two arrays do not have the same length.")
+
+    batches = {}
+    for effect_size in effect_sizes:
+        batches[effect_size] = _bootstrap_batch_func(x0, x1, is_paired, effect_size)
+        if batches[effect_size] is None:
+            err = "The effect size '{}' cannot be bootstrapped in batches.".format(effect_size)
+            raise ValueError(err)
+
+    return _run_bootstrap_batches(
+        x0, x1, is_paired, batches, resamples, random_seed, memory_budget, legacy_rng
+    )
+
+
+def _run_bootstrap_batches(
+    x0, x1, is_paired, batches, resamples, random_seed, memory_budget, legacy_rng=True
 ):
-    """Bootstraps the effect_size for 2 groups."""
+    """
+    Draws the resample indices in chunks and evaluates every batch function
+    of `batches`, a dictionary of (row_len, batch_func), on each chunk.
+    """
+    row_len = max(batch[0] for batch in batches.values())
+    out = {effect_size: np.repeat(np.nan, resamples) for effect_size in batches}
+
+    chunk_size = _compute_chunk_size(row_len, resamples, memory_budget)
+    index_chunks = _bootstrap_index_chunks(
+        _random_streams(random_seed, resamples, chunk_size, legacy_rng),
+        len(x0),
+        len(x1),
+        is_paired,
+    )
+
+    start = 0
+    for idx0, idx1 in index_chunks:
+        stop = start + len(idx0)
+        for effect_size, (_, batch_func) in batches.items():
+            out[effect_size][start:stop] = batch_func(idx0, idx1)
+        start = stop
+
+    return out
+
+
+def compute_paired_bootstrapped_diffs(
+    x: np.ndarray,  # The observations of the subjects, one row per subject and one column per group.
+    pairs: list,  # The (control, test) column pairs to compare.
+    effect_sizes: list,  # The effect sizes to bootstrap. Each must be computable in batches.
+    resamples: int = 5000,  # The number of bootstrap resamples to be taken.
+    random_seed: int = 12345,  # `random_seed` is used to seed the random number generator during bootstrap resampling. With a `SeedSequence`, each block of resamples is drawn from its own child stream.
+    memory_budget: int = _MEMORY_BUDGET,  # The maximum number of bytes used by one batch of resamples, per effect size.
+    legacy_rng: bool = True,  # If True, resample with `RandomState`s as in previous versions; otherwise with `numpy.random.Generator`s, which draw the indexes of each chunk faster.
+) -> list:  # The bootstrapped effect sizes of every pair, keyed by effect size.
+    """
+    Bootstraps several paired comparisons of the same subjects at once.
+
+    Each resample draws the subjects once, and every pair is evaluated on
+    the same resampled subjects. As a paired resample only depends on the
+    number of subjects, each pair gets exactly the bootstraps that
+    `compute_bootstrapped_diffs` would return for it.
+    """
+    x = np.asarray(x)
+    batches = []
+    for control, test in pairs:
+        pair_batches = {}
+        for effect_size in effect_sizes:
+            batch = _bootstrap_batch_func(x[:, control], x[:, test], "baseline", effect_size)
+            if batch is None:
+                err = "The effect size '{}' cannot be bootstrapped in batches.".format(effect_size)
+                raise ValueError(err)
+            pair_batches[effect_size] = batch
+        batches.append(pair_batches)
+
+    row_len = max(batch[0] for pair_batches in batches for batch in pair_batches.values())
+    out = [{effect_size: np.repeat(np.nan, resamples) for effect_size in effect_sizes}
+           for _ in pairs]
+
+    chunk_size = _compute_chunk_size(row_len, resamples, memory_budget)
+    index_chunks = _bootstrap_index_chunks(
+        _random_streams(random_seed, resamples, chunk_size, legacy_rng), len(x), len(x), True
+    )
+
+    start = 0
+    for idx, _ in index_chunks:
+        stop = start + len(idx)
+        for pair_out, pair_batches in zip(out, batches):
+            for effect_size, (_, batch_func) in pair_batches.items():
+                pair_out[effect_size][start:stop] = batch_func(idx, idx)
+        start = stop
+
+    return out
+
+
+def compute_bootstrapped_diff(
+    x0: np.ndarray,  # Control group.
+    x1: np.ndarray,  # Test group.
+    is_paired: str,
+    effect_size: str,
+    resamples: int = 5000,  # The number of bootstrap resamples to be taken.
+    random_seed: int = 12345,  # `random_seed` is used to seed the random number generator during bootstrap resampling. With a `SeedSequence`, each block of resamples is drawn from its own child stream.
+    memory_budget: int = _MEMORY_BUDGET,  # The maximum number of bytes used by one batch of resamples. Lower it to reduce the memory footprint; the bootstraps do not depend on it.
+    legacy_rng: bool = True,  # If True, resample with `RandomState`s as in previous versions; otherwise with `numpy.random.Generator`s, which draw the indexes of each chunk faster.
+) -> np.ndarray:  # The bootstrapped effect sizes.
+    """
+    Bootstraps the effect_size for 2 groups.
+
+    For median_diff, the effect sizes in `_BATCHED_EFFECT_SIZES`, and
+    unpaired Cliff's delta, the resamples are drawn and evaluated in batches of 2D
+    arrays; the other effect sizes are computed one resample at a time.
+    Cohen's d and Hedges' g are derived from the sums and sums of squares
+    of each resample.
+    """
 
     from . import effsize as __es
 
-    rng = RandomState(PCG64(random_seed))
+    x0_len = len(x0)
+    x1_len = len(x1)
+
+    if is_paired and x0_len != x1_len:
+        raise ValueError("The two arrays do not have the same length.")
+
+    batch = _bootstrap_batch_func(x0, x1, is_paired, effect_size)
+    if batch is not None:
+        return _run_bootstrap_batches(
+            x0,
+            x1,
+            is_paired,
+            {effect_size: batch},
+            resamples,
+            random_seed,
+            memory_budget,
+            legacy_rng,
+        )[effect_size]
 
     out = np.repeat(np.nan, resamples)
+
+    if not legacy_rng:
+        chunk_size = _compute_chunk_size(x0_len + x1_len, resamples, memory_budget)
+        index_chunks = _bootstrap_index_chunks(
+            _random_streams(random_seed, resamples, chunk_size, False),
+            x0_len,
+            x1_len,
+            is_paired,
+        )
+        i = 0
+        for idx0, idx1 in index_chunks:
+            for i0, i1 in zip(idx0, idx1):
+                out[i] = __es._two_group_difference(x0[i0], x1[i1], is_paired, effect_size)
+                i += 1
+        return out
+
+    i = 0
+    for rng, size in _random_streams(random_seed, resamples, resamples):
+        for _ in range(size):
+            if is_paired:
+                random_idx = rng.choice(x0_len, x0_len, replace=True)
+                x0_sample = x0[random_idx]
+                x1_sample = x1[random_idx]
+            else:
+                x0_sample = rng.choice(x0, x0_len, replace=True)
+                x1_sample = rng.choice(x1, x1_len, replace=True)
+
+            out[i] = __es._two_group_difference(x0_sample, x1_sample, is_paired, effect_size)
+            i += 1
+
+    return out
+
+
+def _proportion_difference(control_ones, test_ones, control_n, test_n, is_paired, effect_size):
+    """
+    Returns mean_diff or cohens_h of binary groups from their numbers of
+    ones, with the same arithmetic as `two_group_difference` on the 0/1
+    data. The counts can be arrays, one value per resample or permutation.
+    """
+    if effect_size == "cohens_h":
+        return 2 * np.arcsin(np.sqrt(test_ones / test_n)) - 2 * np.arcsin(
+            np.sqrt(control_ones / control_n)
+        )
+    if is_paired:
+        # The mean of the paired differences, n(0, 1) - n(1, 0) pairs over n.
+        return (test_ones - control_ones) / control_n
+    return test_ones / test_n - control_ones / control_n
+
+
+def _paired_binary_cells(x0, x1):
+    """
+    Returns the numbers of (0, 0), (0, 1), (1, 0) and (1, 1) pairs of two
+    paired binary groups.
+    """
+    return np.bincount(
+        (2 * np.asarray(x0) + np.asarray(x1)).astype(np.int64), minlength=4
+    )
+
+
+def compute_proportion_bootstrapped_diff(
+    x0: np.ndarray,  # Control group, of 0s and 1s.
+    x1: np.ndarray,  # Test group, of 0s and 1s.
+    is_paired: str,
+    effect_size: str,  # mean_diff or cohens_h.
+    resamples: int = 5000,  # The number of bootstrap resamples to be taken.
+    random_seed: int = 12345,  # `random_seed` is used to seed the random number generator during bootstrap resampling. With a `SeedSequence`, each block of resamples is drawn from its own child stream.
+    legacy_rng: bool = True,  # If True, draw the counts with `RandomState`s; otherwise with `numpy.random.Generator`s.
+) -> np.ndarray:  # The bootstrapped effect sizes.
+    """
+    Bootstraps mean_diff or cohens_h for 2 groups of binary data from their
+    counts, in O(resamples) whatever the size of the groups.
+
+    A resample of a binary group is described by its number of ones, which
+    is binomial; a resample of paired binary groups is described by the
+    numbers of (0, 0), (0, 1), (1, 0) and (1, 1) pairs, which are
+    multinomial. The bootstraps follow the same distribution as resampling
+    the observations, but are drawn from a different random stream, with
+    either value of `legacy_rng`; `TwoGroupsEffectSize` therefore only uses
+    them with `legacy_rng=False`.
+    """
+    x0 = np.asarray(x0)
+    x1 = np.asarray(x1)
     x0_len = len(x0)
     x1_len = len(x1)
 
-    for i in range(int(resamples)):
+    if is_paired:
+        if x0_len != x1_len:
+            raise ValueError("The two arrays do not have the same length.")
+        cells = _paired_binary_cells(x0, x1)
+
+    control_ones, test_ones = [], []
+    for rng, size in _random_streams(random_seed, resamples, resamples, legacy_rng):
         if is_paired:
-            if x0_len != x1_len:
-                raise ValueError("The two arrays do not have the same length.")
-            random_idx = rng.choice(x0_len, x0_len, replace=True)
-            x0_sample = x0[random_idx]
-            x1_sample = x1[random_idx]
+            counts = rng.multinomial(x0_len, cells / x0_len, size=size)
+            control_ones.append(counts[:, 2] + counts[:, 3])
+            test_ones.append(counts[:, 1] + counts[:, 3])
         else:
-            x0_sample = rng.choice(x0, x0_len, replace=True)
-            x1_sample = rng.choice(x1, x1_len, replace=True)
+            control_ones.append(rng.binomial(x0_len, npsum(x0) / x0_len, size))
+            test_ones.append(rng.binomial(x1_len, npsum(x1) / x1_len, size))
+    control_ones = np.concatenate(control_ones) if control_ones else np.empty(0, int)
+    test_ones = np.concatenate(test_ones) if test_ones else np.empty(0, int)
+
+    return _proportion_difference(
+        control_ones, test_ones, x0_len, x1_len, is_paired, effect_size
+    )
+
+
+def compute_frequency_jackknife(
+    values: np.ndarray,  # The sorted distinct values of the pooled groups.
+    control_counts: np.ndarray,  # The counts of `values` in the control group.
+    test_counts: np.ndarray,  # The counts of `values` in the test group.
+    effect_size: str,
+    memory_budget: int = None,  # The maximum number of bytes used by the leave-one-out counts at once; defaults to `_MEMORY_BUDGET`.
+) -> tuple:  # The leave-one-out effect sizes and the number of observations giving each of them.
+    """
+    Computes the jackknife of an unpaired effect size of two groups given as
+    counts of distinct values, leaving out every observation of both groups
+    once. Leaving out any observation of a given value in a given group
+    gives the same effect size, so it is computed once per value and group,
+    and weighted by the count of that value.
+    """
+    from . import effsize as __es
 
-        out[i] = __es.two_group_difference(x0_sample, x1_sample, is_paired, effect_size)
+    if memory_budget is None:
+        memory_budget = _MEMORY_BUDGET
 
-    return out
+    control_cells = np.flatnonzero(control_counts)
+    test_cells = np.flatnonzero(test_counts)
+    # One row per left-out cell: first the control cells, then the test cells.
+    cells = np.concatenate([control_cells, test_cells])
+    in_control = np.arange(len(cells)) < len(control_cells)
+    chunk_size = _compute_chunk_size(2 * len(values), len(cells), memory_budget)
+
+    out = []
+    for start in range(0, len(cells), chunk_size):
+        rows = np.arange(start, min(start + chunk_size, len(cells)))
+        left_out = np.zeros((len(rows), len(values)), dtype=np.int64)
+        left_out[np.arange(len(rows)), cells[rows]] = 1
+        jack_control = control_counts - left_out * in_control[rows, None]
+        jack_test = test_counts - left_out * ~in_control[rows, None]
+        out.append(__es._frequency_two_group_difference(values, jack_control, jack_test, effect_size))
+
+    weights = np.concatenate([control_counts[control_cells], test_counts[test_cells]])
+    return np.concatenate(out), weights
+
+
+def compute_frequency_bootstrapped_diff(
+    values: np.ndarray,  # The sorted distinct values of the pooled groups.
+    control_counts: np.ndarray,  # The counts of `values` in the control group.
+    test_counts: np.ndarray,  # The counts of `values` in the test group.
+    effect_size: str,
+    resamples: int = 5000,  # The number of bootstrap resamples to be taken.
+    random_seed: int = 12345,  # `random_seed` is used to seed the random number generator during bootstrap resampling. With a `SeedSequence`, each block of resamples is drawn from its own child stream.
+    memory_budget: int = None,  # The maximum number of bytes used by the resampled counts at once; defaults to `_MEMORY_BUDGET`.
+    legacy_rng: bool = True,  # If True, draw the counts with `RandomState`s; otherwise with `numpy.random.Generator`s. Neither replays the resamples of the expanded groups.
+) -> np.ndarray:  # The bootstrapped effect sizes.
+    """
+    Bootstraps an unpaired effect size of two groups given as counts of
+    distinct values, without expanding the groups.
+
+    A resample of a group is described by how many times each distinct
+    value is drawn, which is multinomial with the observed frequencies as
+    probabilities. The cost depends on the number of distinct values, not
+    on the number of observations.
+    """
+    from . import effsize as __es
+
+    if memory_budget is None:
+        memory_budget = _MEMORY_BUDGET
+
+    control_n, test_n = control_counts.sum(), test_counts.sum()
+    chunk_size = _compute_chunk_size(2 * len(values), resamples, memory_budget)
+    pvals = np.stack([control_counts / control_n, test_counts / test_n])
+
+    out = []
+    for rng, size in _random_streams(random_seed, resamples, chunk_size, legacy_rng):
+        # The counts of both groups are drawn resample by resample, so that
+        # the bootstraps do not depend on the size of the chunks.
+        counts = _as_generator(rng).multinomial(
+            np.tile([control_n, test_n], (size, 1)), pvals
+        )
+        out.append(__es._frequency_two_group_difference(
+            values, counts[:, 0], counts[:, 1], effect_size
+        ))
+
+    return np.concatenate(out)
+
+
+# Atoms of an exact bootstrap distribution lighter than this are dropped.
+_EXACT_ATOM_TOLERANCE = 1e-14
+
+
+def _exact_bootstrap_median_distribution(x, tol=_EXACT_ATOM_TOLERANCE):
+    """
+    Returns the support and probabilities of the bootstrap distribution of
+    `np.median(x)`, computed from binomial order-statistic probabilities
+    instead of by resampling.
+
+    The number N(t) of draws among the t smallest observations is
+    Binomial(n, t/n). For odd n the median is the order statistic
+    m = (n+1)/2, and P(median <= x_(t)) = P(N(t) >= m). For even n the
+    median is the average of the order statistics a = n/2 and a+1, whose
+    joint probabilities for distinct positions i < j factorise as
+    C(n, a) [(i/n)^a - ((i-1)/n)^a] [((n-j+1)/n)^a - ((n-j)/n)^a].
+    """
+    x = np.sort(x)
+    n = len(x)
+    positions = arange(n + 1)
+
+    if n % 2 == 1:
+        cdf = binom.sf((n + 1) // 2 - 1, n, positions / n)
+        values, probs = x, np.diff(cdf)
+
+    else:
+        a = n // 2
+        # P(X*_(a) = x_(i)) for i = 1, ..., n.
+        marginal = np.diff(binom.sf(a - 1, n, positions / n))
+        i = np.flatnonzero(marginal > tol) + 1
+        log_comb = gammaln(n + 1) - 2 * gammaln(a + 1)
+
+        with errstate(divide="ignore"):
+            log_lower = a * np.log(i / n) + np.log(-np.expm1(a * np.log1p(-1 / i)))
+
+            # X*_(a) = X*_(a+1) = x_(i) takes the rest of the marginal mass.
+            diagonal = marginal[i - 1] - np.exp(
+                log_comb + log_lower + a * np.log((n - i) / n)
+            )
+            values_list = [x[i - 1]]
+            probs_list = [np.clip(diagonal, 0, None)]
+
+            # The mass decays geometrically with the gap j - i.
+            for gap in range(1, n):
+                j = i + gap
+                in_range = j <= n
+                if not in_range.any():
+                    break
+                j_upper = n - j[in_range]
+                log_upper = a * np.log((j_upper + 1) / n) + np.log(
+                    -np.expm1(a * np.log(j_upper / (j_upper + 1)))
+                )
+                gap_probs = np.exp(log_comb + log_lower[in_range] + log_upper)
+                values_list.append((x[i[in_range] - 1] + x[j[in_range] - 1]) / 2)
+                probs_list.append(gap_probs)
+                if gap_probs.max() <= tol:
+                    break
+
+        values = np.concatenate(values_list)
+        probs = np.concatenate(probs_list)
+
+    keep = probs > tol
+    support, inverse = np.unique(values[keep], return_inverse=True)
+    return support, np.bincount(inverse, weights=probs[keep])
+
+
+# Above this many pairs of support points, the exact distributions of two
+# unpaired medians are combined by sampling instead of over all pairs.
+_EXACT_MAX_PAIRS = 2**21
+
+# The number of pairs of medians drawn when combining them by sampling.
+_EXACT_COMBINE_DRAWS = 2**20
+
+
+def _sample_exact_difference(v0, p0, v1, p1, draws, random_seed):
+    """
+    Draws `draws` differences V1 - V0 from the exact distributions of two
+    independent medians, by inverse transform sampling. The draws of V1 are
+    stratified over `draws` equal slices of its CDF, and those of V0 over a
+    random permutation of the same slices.
+    """
+    rng = RandomState(PCG64(random_seed))
+    cdf0, cdf1 = np.cumsum(p0), np.cumsum(p1)
+    u0 = (rng.permutation(draws) + rng.random_sample(draws)) / draws
+    u1 = (arange(draws) + rng.random_sample(draws)) / draws
+    idx0 = np.minimum(np.searchsorted(cdf0, u0 * cdf0[-1], side="right"), len(v0) - 1)
+    idx1 = np.minimum(np.searchsorted(cdf1, u1 * cdf1[-1], side="right"), len(v1) - 1)
+    return v1[idx1] - v0[idx0]
+
+
+def compute_exact_bootstrapped_median_diff(
+    x0: np.ndarray,  # Control group.
+    x1: np.ndarray,  # Test group.
+    is_paired: str,
+    resamples: int = 5000,  # The number of quantiles of the exact distribution to return.
+    random_seed=12345,  # An int or a `numpy.random.SeedSequence`, only used above `_EXACT_MAX_PAIRS` pairs.
+) -> np.ndarray:  # The exact bootstrap distribution, as `resamples` evenly spaced quantiles.
+    """
+    Computes the bootstrap distribution of the median difference without
+    resampling.
+
+    The exact distribution of each group's bootstrapped median is obtained
+    with `_exact_bootstrap_median_distribution`; for unpaired data the two
+    are combined over all pairs of support points. The distribution is
+    returned as its quantiles at the midpoints (k + 0.5) / resamples, so it
+    can be used in place of the output of `compute_bootstrapped_diff`.
+
+    The supports of the medians of groups of even size hold the midpoints of
+    close order statistics, and grow to thousands of points. Above
+    `_EXACT_MAX_PAIRS` pairs of support points, the two exact distributions
+    are therefore combined from `_EXACT_COMBINE_DRAWS` stratified draws of
+    each median instead, with a warning. This takes O(draws * log(n)) time
+    and bounded memory for any n, and its Monte Carlo error is far smaller
+    than that of resampling the data.
+    """
+    x0_len = len(x0)
+    x1_len = len(x1)
+
+    if is_paired:
+        if x0_len != x1_len:
+            raise ValueError("The two arrays do not have the same length.")
+        values, probs = _exact_bootstrap_median_distribution(x1 - x0)
+    else:
+        v0, p0 = _exact_bootstrap_median_distribution(x0)
+        v1, p1 = _exact_bootstrap_median_distribution(x1)
+        if len(v0) * len(v1) > _EXACT_MAX_PAIRS:
+            warnings.warn(
+                "The exact bootstrap distributions of the two medians have "
+                f"{len(v0) * len(v1)} pairs of support points, more than the "
+                f"{_EXACT_MAX_PAIRS} that are combined exactly; they are "
+                f"combined from {_EXACT_COMBINE_DRAWS} draws of each median instead.",
+                category=UserWarning,
+            )
+            draws = np.sort(
+                _sample_exact_difference(v0, p0, v1, p1, _EXACT_COMBINE_DRAWS, random_seed)
+            )
+            positions = ((arange(resamples) + 0.5) / resamples * len(draws)).astype(int)
+            return draws[positions]
+        values = np.subtract.outer(v1, v0).ravel()
+        probs = np.multiply.outer(p1, p0).ravel()
+        order = np.argsort(values, kind="stable")
+        values, probs = values[order], probs[order]
+
+    cumulative = np.cumsum(probs)
+    levels = (arange(resamples) + 0.5) / resamples * cumulative[-1]
+    idx = np.minimum(np.searchsorted(cumulative, levels), len(values) - 1)
+
+    return values[idx]
+
+# The per-group statistic each effect size can be assembled from.
+_GROUP_BOOTSTRAP_STATISTICS = {
+    "mean_diff": "mean",
+    "median_diff": "median",
+    "cohens_d": "mean",
+    "hedges_g": "mean",
+}
+
+
+def compute_group_bootstraps(
+    x: np.ndarray,  # The observations of one group. NaNs are not allowed.
+    statistic: str = "mean",  # Either "mean" or "median".
+    resamples: int = 5000,  # The number of bootstrap resamples to be taken.
+    random_seed=12345,  # An int or a `numpy.random.SeedSequence` seeding this group's own stream.
+    memory_budget: int = _MEMORY_BUDGET,  # The maximum number of bytes used by one batch of resamples.
+    legacy_rng: bool = True,  # If True, resample with a `RandomState` as in previous versions; otherwise with a `numpy.random.Generator`.
+) -> tuple:  # (means, sums of squared deviations) for "mean"; (medians,) for "median".
+    """
+    Bootstraps the statistics of a single group, independently of any other
+    group.
+
+    In unpaired designs the groups are resampled independently, so every
+    comparison involving this group can be assembled from these vectors with
+    `combine_group_bootstraps` instead of resampling the group again.
+    """
+    from . import effsize as __es
+
+    rng = RandomState(PCG64(random_seed)) if legacy_rng else default_rng(random_seed)
+    x_len = len(x)
+    chunk_size = _compute_chunk_size(x_len, resamples, memory_budget)
+
+    if statistic == "median":
+        medians = np.empty(resamples)
+        for start in range(0, resamples, chunk_size):
+            stop = min(start + chunk_size, resamples)
+            idx = _draw_indexes(rng, x_len, (stop - start, x_len))
+            medians[start:stop] = np.median(x[idx], axis=-1)
+        return (medians,)
+
+    if statistic != "mean":
+        raise ValueError("`statistic` must be either 'mean' or 'median'.")
+
+    center = np.mean(x)
+    x_centered = x - center
+    means = np.empty(resamples)
+    squared_deviations = np.empty(resamples)
+    for start in range(0, resamples, chunk_size):
+        stop = min(start + chunk_size, resamples)
+        idx = _draw_indexes(rng, x_len, (stop - start, x_len))
+        sums, squared_deviations[start:stop] = __es._batch_sums_of_squares(
+            x_centered[idx]
+        )
+        means[start:stop] = sums / x_len + center
+
+    return means, squared_deviations
+
+
+def combine_group_bootstraps(
+    control: tuple,  # The output of `compute_group_bootstraps` for the control group.
+    test: tuple,  # The output of `compute_group_bootstraps` for the test group.
+    control_n: int,  # The size of the control group.
+    test_n: int,  # The size of the test group.
+    effect_size: str,  # Any one of the keys of `_GROUP_BOOTSTRAP_STATISTICS`.
+) -> np.ndarray:  # The bootstrapped unpaired effect sizes.
+    """
+    Assembles the bootstrapped unpaired effect size of two groups from their
+    per-group bootstraps.
+
+    Many comparisons can be assembled at once by stacking the per-group
+    bootstraps along a leading axis, with matching arrays of group sizes.
+    """
+    from . import effsize as __es
+
+    difference = test[0] - control[0]
+    if effect_size in ["mean_diff", "median_diff"]:
+        return difference
+
+    dof = np.expand_dims(np.add(control_n, test_n) - 2, -1)
+    divisor = np.sqrt((control[1] + test[1]) / dof)
+    if (divisor == 0).any():
+        raise ValueError("The divisor is zero, indicating no variability in the data.")
+
+    d = difference / divisor
+    if effect_size == "cohens_d":
+        return d
+
+    correction_factor = np.vectorize(__es._compute_hedges_correction_factor)(
+        control_n, test_n
+    )
+    return np.expand_dims(correction_factor, -1) * d
 
 
 def compute_delta2_bootstrapped_diff(
@@ -148,6 +1145,7 @@ def compute_delta2_bootstrapped_diff(
     is_paired: str = None,
     resamples: int = 5000,  # The number of bootstrap resamples to be taken for the calculation of the confidence interval limits.
     random_seed: int = 12345,  # `random_seed` is used to seed the random number generator during bootstrap resampling. This ensures that the confidence intervals reported are replicable.
+    legacy_rng: bool = True,  # If True, resample with `RandomState`s as in previous versions; otherwise with `numpy.random.Generator`s.
 ) -> (
     tuple
 ):  # bootstraped result and empirical result of deltas' g, and the bootstraped result of delta-delta
@@ -156,13 +1154,39 @@ def compute_delta2_bootstrapped_diff(
 
     """
 
-    rng = RandomState(PCG64(random_seed))
+    out_delta_g, delta_g, deltadelta = _batch_delta2_bootstrapped_diff(
+        *[np.asarray(x)[np.newaxis] for x in [x1, x2, x3, x4]],
+        is_paired=is_paired,
+        resamples=resamples,
+        random_seed=random_seed,
+        legacy_rng=legacy_rng,
+    )
+
+    return out_delta_g[0], delta_g[0], deltadelta[0]
 
-    x1, x2, x3, x4 = map(np.asarray, [x1, x2, x3, x4])
+
+def _batch_delta2_bootstrapped_diff(
+    x1: np.ndarray,  # Control groups 1, one row per experiment set
+    x2: np.ndarray,  # Test groups 1, one row per experiment set
+    x3: np.ndarray,  # Control groups 2, one row per experiment set
+    x4: np.ndarray,  # Test groups 2, one row per experiment set
+    is_paired: str = None,
+    resamples: int = 5000,
+    random_seed: int = 12345,
+    legacy_rng: bool = True,
+) -> tuple:  # bootstrapped deltas' g, empirical deltas' g and bootstrapped delta-deltas, one row per experiment set
+    """
+    Bootstraps deltas' g for a stack of experiment sets with equal group sizes.
+
+    Every set is resampled with the same indexes, so each row is identical to
+    `compute_delta2_bootstrapped_diff` called on that set alone.
+    """
+
+    xs = [np.asarray(x) for x in [x1, x2, x3, x4]]
 
     # Calculating pooled sample standard deviation
-    stds = [np.std(x) for x in [x1, x2, x3, x4]]
-    ns = [len(x) for x in [x1, x2, x3, x4]]
+    stds = [np.std(x, axis=-1) for x in xs]
+    ns = [x.shape[-1] for x in xs]
 
     sd_numerator = sum((n - 1) * s**2 for n, s in zip(ns, stds))
     sd_denominator = sum(n - 1 for n in ns)
@@ -174,39 +1198,40 @@ def compute_delta2_bootstrapped_diff(
     pooled_sample_sd = np.sqrt(sd_numerator / sd_denominator)
 
     # Ensure pooled_sample_sd is not NaN or zero (to avoid division by zero later)
-    if np.isnan(pooled_sample_sd) or pooled_sample_sd == 0:
+    if np.isnan(pooled_sample_sd).any() or (pooled_sample_sd == 0).any():
         raise ValueError("Pooled sample standard deviation is NaN or zero.")
 
-    out_delta_g = np.empty(resamples)
-    deltadelta = np.empty(resamples)
+    if is_paired and (ns[0] != ns[1] or ns[2] != ns[3]):
+        raise ValueError("Each control group must have the same length as its corresponding test group in paired analysis.")
 
-    # Bootstrapping
-    for i in range(resamples):
-        # Paired or unpaired resampling
-        if is_paired:
-            if len(x1) != len(x2) or len(x3) != len(x4):
-                raise ValueError("Each control group must have the same length as its corresponding test group in paired analysis.")
-            indices_1 = rng.choice(len(x1), len(x1), replace=True)
-            indices_2 = rng.choice(len(x3), len(x3), replace=True)
+    # Paired groups share the resample indexes of their control group.
+    groups = [ns[0], ns[2]] if is_paired else ns
+    chunk_size = _compute_chunk_size(
+        sum(ns) * len(pooled_sample_sd), resamples, _MEMORY_BUDGET
+    )
 
-            x1_sample, x2_sample = x1[indices_1], x2[indices_1]
-            x3_sample, x4_sample = x3[indices_2], x4[indices_2]
-        else:
-            x1_sample = rng.choice(x1, len(x1), replace=True)
-            x2_sample = rng.choice(x2, len(x2), replace=True)
-            x3_sample = rng.choice(x3, len(x3), replace=True)
-            x4_sample = rng.choice(x4, len(x4), replace=True)
+    deltadelta = []
+    streams = _random_streams(random_seed, resamples, chunk_size, legacy_rng)
+    for idx in _interleaved_index_chunks(streams, groups):
+        if is_paired:
+            idx = [idx[0], idx[0], idx[1], idx[1]]
+        means = [np.mean(np.take(x, i, axis=1), axis=-1) for x, i in zip(xs, idx)]
 
         # Calculating deltas
-        delta_1 = np.mean(x2_sample) - np.mean(x1_sample)
-        delta_2 = np.mean(x4_sample) - np.mean(x3_sample)
-        delta_delta = delta_2 - delta_1
+        delta_1 = means[1] - means[0]
+        delta_2 = means[3] - means[2]
+        deltadelta.append(delta_2 - delta_1)
 
-        deltadelta[i] = delta_delta
-        out_delta_g[i] = delta_delta / pooled_sample_sd
+    deltadelta = (
+        np.concatenate(deltadelta, axis=1)
+        if deltadelta
+        else np.empty((len(pooled_sample_sd), 0))
+    )
+    out_delta_g = deltadelta / pooled_sample_sd[:, np.newaxis]
 
     # Empirical delta_g calculation
-    delta_g = ((np.mean(x4) - np.mean(x3)) - (np.mean(x2) - np.mean(x1))) / pooled_sample_sd
+    means = [np.mean(x, axis=-1) for x in xs]
+    delta_g = ((means[3] - means[2]) - (means[1] - means[0])) / pooled_sample_sd
 
     return out_delta_g, delta_g, deltadelta
 
@@ -227,8 +1252,8 @@ def compute_meandiff_bias_correction(
 
     """
 
-    B = np.array(bootstraps)
-    prop_less_than_es = sum(B < effsize) / len(B)
+    B = np.asarray(bootstraps)
+    prop_less_than_es = np.count_nonzero(B < effsize) / len(B)
 
     return norm.ppf(prop_less_than_es)
 
@@ -275,6 +1300,210 @@ def compute_interval_limits(bias, acceleration, n_boots, ci=95):
     return low, high
 
 
+def _ci_levels(ci):
+    """
+    Returns the confidence levels in `ci`, a single number or a list of
+    numbers, as a tuple.
+    """
+    levels = tuple(np.atleast_1d(ci).tolist())
+    if len(levels) == 0:
+        raise ValueError("`ci` must contain at least one confidence level.")
+    for level in levels:
+        _compute_alpha_from_ci(level)
+    return levels
+
+
+def compute_intervals(
+    bootstraps: np.ndarray,  # The bootstrap resamples of the effect size.
+    effsize: float,  # The effect size for the original sample.
+    acceleration: float,  # The acceleration factor of the BCa interval.
+    ci=95,  # A confidence level, or a list of them.
+    n_boots: int = None,  # The number of resamples the limits refer to; defaults to `len(bootstraps)`.
+    is_sorted: bool = False,  # If True, `bootstraps` are already sorted, and the limits are read from them directly.
+) -> tuple:  # The bias correction and a list with the limits of every level.
+    """
+    Computes the bias-corrected and accelerated (BCa) and the percentile
+    confidence intervals of one or several confidence levels from a single
+    set of bootstraps.
+
+    The bias correction is computed once, and the limits of all the levels
+    are selected from the bootstraps with one partial sort instead of a
+    full one. Each level is returned as a dictionary with its `ci`,
+    `bca_interval_idx`, `bca_low`, `bca_high`, `pct_interval_idx`,
+    `pct_low` and `pct_high`; a BCa limit that cannot be computed is NaN.
+    """
+    B = np.asarray(bootstraps)
+    if n_boots is None:
+        n_boots = len(B)
+
+    bias = compute_meandiff_bias_correction(B, effsize)
+
+    levels = []
+    for level in _ci_levels(ci):
+        alpha = _compute_alpha_from_ci(level)
+        levels.append(
+            {
+                "ci": level,
+                "bca_interval_idx": compute_interval_limits(
+                    bias, acceleration, n_boots, level
+                ),
+                "pct_interval_idx": (
+                    int((alpha / 2) * n_boots),
+                    int((1 - (alpha / 2)) * n_boots),
+                ),
+            }
+        )
+
+    # The order statistics at every index needed, from one partition.
+    kth = np.unique(
+        [
+            idx
+            for level in levels
+            for key in ["bca_interval_idx", "pct_interval_idx"]
+            for idx in level[key]
+            if not isnan(idx)
+        ]
+    ).astype(int)
+    selected = B if is_sorted else np.partition(B, np.minimum(kth, len(B) - 1))
+
+    def limit(idx):
+        return np.nan if isnan(idx) else selected[min(idx, len(B) - 1)]
+
+    for level in levels:
+        for kind in ["bca", "pct"]:
+            low, high = level[kind + "_interval_idx"]
+            level[kind + "_low"] = limit(low)
+            level[kind + "_high"] = limit(high)
+
+    return bias, levels
+
+
+# Settings of `resamples="auto"`: the bootstraps grow by batches of
+# `_AUTO_BATCH_SIZE` resamples, up to `_AUTO_MAX_RESAMPLES`, until the
+# standard errors of the interval limits are below `_AUTO_TOLERANCE` times
+# the width of the interval.
+_AUTO_BATCH_SIZE = _STREAM_BLOCK_SIZE
+_AUTO_MAX_RESAMPLES = 100000
+_AUTO_TOLERANCE = 0.01
+
+
+def compute_interval_limits_se(
+    bootstraps: np.ndarray,  # The bootstrap resamples of the effect size.
+    levels: list,  # The levels computed by `compute_intervals` from these bootstraps.
+    is_sorted: bool = False,  # If True, `bootstraps` are already sorted.
+) -> np.ndarray:  # The standard errors of the low and high limits, one row per level.
+    """
+    Estimates the Monte Carlo standard errors of the BCa limits, i.e. how
+    much they would vary between sets of bootstraps of the same size. The
+    percentile limit is used instead of a BCa limit that cannot be computed.
+
+    A limit is the order statistic of some rank k of the B bootstraps, and
+    the rank of a sample quantile has a binomial standard deviation of
+    sqrt(B p (1 - p)), with p = k / B. Half the distance between the order
+    statistics that far below and above rank k estimates the standard error
+    of the limit, whatever the shape of the bootstrap distribution.
+    """
+    B = np.asarray(bootstraps) if is_sorted else np.sort(bootstraps)
+    n = len(B)
+
+    out = np.empty((len(levels), 2))
+    for i, level in enumerate(levels):
+        for j in range(2):
+            k = level["bca_interval_idx"][j]
+            if isnan(k):
+                k = level["pct_interval_idx"][j]
+            k = min(int(k), n - 1)
+            spread = max(np.sqrt(k * (1 - k / n)), 1)
+            below = B[max(int(np.floor(k - spread)), 0)]
+            above = B[min(int(np.ceil(k + spread)), n - 1)]
+            out[i, j] = (above - below) / 2
+    return out
+
+
+def _interval_widths(levels):
+    """
+    Returns the width of the BCa interval of every level, or of the
+    percentile interval if a BCa limit cannot be computed.
+    """
+    widths = []
+    for level in levels:
+        kind = "pct" if isnan(level["bca_low"]) or isnan(level["bca_high"]) else "bca"
+        widths.append(level[kind + "_high"] - level[kind + "_low"])
+    return np.array(widths)
+
+
+def compute_adaptive_bootstraps(
+    draw_batch,  # A function of the index and the size of a batch, returning its bootstraps.
+    effsize: float,  # The effect size for the original sample.
+    acceleration: float,  # The acceleration factor of the BCa interval.
+    ci=95,  # A confidence level, or a list of them.
+    tolerance: float = _AUTO_TOLERANCE,  # The standard error of the limits at which to stop, as a fraction of the width of their interval. If None, the precision is not checked.
+    batch_size: int = _AUTO_BATCH_SIZE,  # The number of resamples added at a time.
+    max_resamples: int = _AUTO_MAX_RESAMPLES,  # The number of resamples at which to stop in any case.
+    deadline: float = None,  # A `time.perf_counter()` value after which no further batch is drawn.
+) -> np.ndarray:  # The bootstraps of all the batches drawn.
+    """
+    Grows the bootstraps of an effect size batch by batch, until the
+    Monte Carlo standard errors of the limits of every level in `ci` (see
+    `compute_interval_limits_se`) fall below `tolerance` times the width of
+    their interval, or `max_resamples` is reached, or `deadline` has
+    passed. At least one batch is always drawn.
+
+    The number of resamples thus follows the difficulty of the comparison:
+    skewed bootstrap distributions and limits far in the tails need more
+    resamples than well-behaved ones. Every batch is sorted on its own and
+    merged into the sorted bootstraps of the previous ones, from which the
+    limits are read, so no step sorts all the bootstraps again.
+    """
+    batches = []
+    ordered = np.empty(0)
+    resamples = 0
+    while resamples < max_resamples:
+        size = min(batch_size, max_resamples - resamples)
+        batches.append(np.asarray(draw_batch(len(batches), size)))
+        resamples += size
+
+        if deadline is not None and perf_counter() >= deadline:
+            break
+        if tolerance is not None:
+            ordered = _merge_sorted(ordered, np.sort(batches[-1]))
+            _, levels = compute_intervals(ordered, effsize, acceleration, ci, is_sorted=True)
+            limits_se = compute_interval_limits_se(ordered, levels, is_sorted=True)
+            if np.all(limits_se <= tolerance * _interval_widths(levels)[:, np.newaxis]):
+                break
+
+    return np.concatenate(batches)
+
+
+def _merge_sorted(a, b):
+    """
+    Merges two sorted arrays into one sorted array, in linear time. NaNs
+    stay at the end, as with `np.sort`.
+    """
+    positions = np.searchsorted(a, b, side="right") + np.arange(len(b))
+    out = np.empty(len(a) + len(b), dtype=np.result_type(a, b))
+    from_b = np.zeros(len(out), dtype=bool)
+    from_b[positions] = True
+    out[positions] = b
+    out[~from_b] = a
+    return out
+
+
+def _interval_table(levels, difference):
+    """
+    Returns the limits of the confidence levels computed by
+    `compute_intervals` as a `pandas.DataFrame` indexed by level. As for
+    the reported interval, a BCa limit that cannot be computed is set to
+    the effect size itself.
+    """
+    columns = ["ci", "bca_low", "bca_high", "bca_interval_idx",
+               "pct_low", "pct_high", "pct_interval_idx"]
+    out = pd.DataFrame(levels, columns=columns).set_index("ci")
+    for k, side in enumerate(["low", "high"]):
+        undefined = [isnan(idx[k]) for idx in out["bca_interval_idx"]]
+        out.loc[undefined, "bca_" + side] = difference
+    return out
+
 def calculate_group_var(control_var, control_N, test_var, test_N):
     return control_var / control_N + test_var / test_N
 
@@ -282,10 +1511,21 @@ def calculate_group_var(control_var, control_N, test_var, test_N):
 def calculate_weighted_delta(group_var, differences):
     """
     Compute the weighted deltas.
+
+    `differences` holds one row of deltas per experiment, such as its
+    bootstraps or permutations, and `group_var` either one pooled group
+    variance per experiment or one per delta. The weighted deltas of all
+    the columns are computed as a single weighted reduction over the
+    experiments.
     """
 
-    weight = 1 / group_var
-    denom = np.sum(weight)
-    num = np.sum(weight[i] * differences[i] for i in range(0, len(weight)))
+    differences = np.asarray(np.stack(differences), dtype=float)
+    weight = 1 / np.asarray(np.stack(group_var), dtype=float)
+    if weight.ndim < differences.ndim:
+        denom = np.sum(weight)
+        weight = weight.reshape(weight.shape + (1,) * (differences.ndim - weight.ndim))
+    else:
+        denom = np.sum(weight, axis=0)
+    num = np.sum(weight * differences, axis=0)
 
     return num / denom
@@ -61,17 +61,41 @@ def two_group_difference(control:list|tuple|np.ndarray, #Accepts lists, tuples,
     """
 
 
+    if effect_size == "median_diff":
+        _warn_median_diff()
+
+    return _two_group_difference(control, test, is_paired, effect_size)
+
+
+def _warn_median_diff():
+    """
+    Warns that the median difference may give unstable BCa intervals.
+    """
+    mes1 = "Using median as the statistic in bootstrapping may " + \
+            "result in a biased estimate and cause problems with " + \
+            "BCa confidence intervals. Consider using a different statistic, such as the mean.\n"
+    mes2 = "When plotting, please consider using percetile confidence intervals " + \
+            "by specifying `ci_type='percentile'`. For detailed information, " + \
+            "refer to https://github.com/ACCLAB/DABEST-python/issues/129 \n"
+    warnings.warn(message=mes1+mes2, category=UserWarning)
+
+
+def _two_group_difference(control:list|tuple|np.ndarray,
+                          test:list|tuple|np.ndarray,
+                          is_paired=None,
+                          effect_size:str="mean_diff"
+                         )->float:
+    """
+    Same as `two_group_difference`, but without the median_diff warning.
+    Used where the effect size of a single comparison is computed many
+    times, e.g. for every resample or permutation, so that the warning is
+    only raised once per comparison.
+    """
+
     if effect_size == "mean_diff":
         return func_difference(control, test, np.mean, is_paired)
 
     if effect_size == "median_diff":
-        mes1 = "Using median as the statistic in bootstrapping may " + \
-                "result in a biased estimate and cause problems with " + \
-                "BCa confidence intervals. Consider using a different statistic, such as the mean.\n"
-        mes2 = "When plotting, please consider using percetile confidence intervals " + \
-                "by specifying `ci_type='percentile'`. For detailed information, " + \
-                "refer to https://github.com/ACCLAB/DABEST-python/issues/129 \n"
-        warnings.warn(message=mes1+mes2, category=UserWarning)
         return func_difference(control, test, np.median, is_paired)
 
     if effect_size == "cohens_d":
@@ -115,14 +139,7 @@ def func_difference(control:list|tuple|np.ndarray, # NaNs are automatically disc
             err = "The two arrays supplied do not have the same length."
             raise ValueError(err)
 
-        control_nan = np.where(np.isnan(control))[0]
-        test_nan    = np.where(np.isnan(test))[0]
-
-        indexes_to_drop = np.unique(np.concatenate([control_nan,
-                                                    test_nan]))
-
-        good_indexes = [i for i in range(0, len(control))
-                        if i not in indexes_to_drop]
+        good_indexes = ~(np.isnan(control) | np.isnan(test))
 
         control = control[good_indexes]
         test    = test[good_indexes]
@@ -245,8 +262,8 @@ def cohens_h(control:list|tuple|np.ndarray,
     control = control[~np.isnan(control)]
     test = test[~np.isnan(test)]
 
-    prop_control = sum(control)/len(control)
-    prop_test = sum(test)/len(test)
+    prop_control = np.sum(control)/len(control)
+    prop_test = np.sum(test)/len(test)
 
     # Arcsine transformation
     phi_control = 2 * np.arcsin(np.sqrt(prop_control))
@@ -313,6 +330,56 @@ def cliffs_delta(control:list|tuple|np.ndarray,
 
 
 # %% ../../nbs/API/effsize.ipynb 11
+def _pooled_dense_ranks(control:np.ndarray, # NaNs are not allowed.
+                        test:np.ndarray # NaNs are not allowed.
+                       )->tuple: # The codes of `control`, the codes of `test`, and the number of distinct values.
+    """
+    Ranks the pooled control and test data once, replacing every value by
+    its dense rank (0, 1, ..., number of distinct values - 1). Resamples of
+    the two groups can then be compared through these integer codes only.
+    """
+    _, codes = np.unique(np.concatenate([control, test]), return_inverse=True)
+    return codes[:len(control)], codes[len(control):], int(codes.max()) + 1
+
+
+def _cliffs_delta_from_rank_sum(test_rank_sum, # Sum of the midranks of the test group within the pooled sample.
+                                control_n:int,
+                                test_n:int
+                               ):
+    """
+    Computes Cliff's delta from the rank sum of the test group, in the
+    same way as `cliffs_delta` does through `mannwhitneyu`.
+    """
+    U = test_rank_sum - test_n * (test_n + 1) / 2
+    return ((2 * U) / (control_n * test_n)) - 1
+
+
+def _batch_cliffs_delta(control_codes:np.ndarray, # 2D array with one resample of the control codes per row.
+                        test_codes:np.ndarray, # 2D array with one resample of the test codes per row.
+                        n_codes:int # The number of distinct values, as returned by `_pooled_dense_ranks`.
+                       )->np.ndarray: # Cliff's delta of each row.
+    """
+    Computes Cliff's delta for a whole batch of resamples at once.
+
+    The values are replaced by their codes from `_pooled_dense_ranks`, so no
+    sorting or ranking is needed. For every row, the control codes are
+    counted, and the Mann-Whitney U statistic is the sum, over the test
+    values, of the number of control values below them plus half of the
+    number of control values tied with them.
+    """
+    rows, control_n = control_codes.shape
+    test_n = test_codes.shape[-1]
+
+    offsets = np.arange(rows)[:, None] * n_codes
+    counts = np.bincount((control_codes + offsets).ravel(),
+                         minlength=rows * n_codes).reshape(rows, n_codes)
+
+    below = np.cumsum(counts, axis=1) - counts
+    U = np.take_along_axis(below + 0.5 * counts, test_codes, axis=1).sum(axis=1)
+
+    return ((2 * U) / (control_n * test_n)) - 1
+
+# %% ../../nbs/API/effsize.ipynb 12
 def _compute_standardizers(control, test):
     """
     Computes the pooled and average standard deviations for two datasets.
@@ -360,7 +427,7 @@ def _compute_standardizers(control, test):
 
     return pooled, average 
 
-# %% ../../nbs/API/effsize.ipynb 12
+# %% ../../nbs/API/effsize.ipynb 13
 def _compute_hedges_correction_factor(n1, 
                                       n2
                                      )->float:
@@ -393,7 +460,343 @@ def _compute_hedges_correction_factor(n1,
 
     return out
 
-# %% ../../nbs/API/effsize.ipynb 13
+# %% ../../nbs/API/effsize.ipynb 14
+def _batch_sums_of_squares(x:np.ndarray # 2D array with one resample per row.
+                          )->tuple: # The sums and the sums of squared deviations of each row.
+    """
+    Computes the sum and the sum of squared deviations of every row of `x`,
+    each in a single pass over the batch.
+    """
+    n = x.shape[-1]
+    sums = np.sum(x, axis=-1)
+    sums_of_squares = np.einsum("...i,...i->...", x, x)
+    squared_deviations = sums_of_squares - sums**2 / n
+
+    # A row of identical values has no spread; don't let rounding
+    # errors in the subtraction turn it into a tiny positive variance.
+    tolerance = 4 * n * np.finfo(float).eps * sums_of_squares
+    squared_deviations[squared_deviations <= tolerance] = 0
+
+    return sums, squared_deviations
+
+
+def _batch_standardized_difference(control:np.ndarray, # 2D array of control resamples, shifted by a constant.
+                                   test:np.ndarray, # 2D array of test resamples, shifted by a constant.
+                                   is_paired:str=None, # If not None, uses the average standard deviation.
+                                   effect_size:str="cohens_d", # Any one of the following effect sizes: ["cohens_d", "hedges_g", "delta_g"]
+                                   center_difference:float=0. # The test shift minus the control shift.
+                                  )->np.ndarray: # The effect size of each row.
+    """
+    Computes Cohen's d or Hedges' g for a batch of resamples from the sums
+    and sums of squares of each row, without forming the deviations.
+
+    Centring both groups on their means before resampling keeps the sums of
+    squares well conditioned; `center_difference` restores the difference
+    in means.
+    """
+    control_n = control.shape[-1]
+    test_n = test.shape[-1]
+
+    control_sums, control_ss = _batch_sums_of_squares(control)
+    test_sums, test_ss = _batch_sums_of_squares(test)
+
+    # For paired data the mean of the differences is the difference of the means.
+    M = test_sums / test_n - control_sums / control_n + center_difference
+
+    if is_paired:
+        divisor = np.sqrt((control_ss / (control_n - 1) + test_ss / (test_n - 1)) / 2)
+    else:
+        divisor = np.sqrt((control_ss + test_ss) / (control_n + test_n - 2))
+
+    if (divisor == 0).any():
+        raise ValueError("The divisor is zero, indicating no variability in the data.")
+
+    d = M / divisor
+    if effect_size == "cohens_d":
+        return d
+
+    # The correction factor only depends on the group sizes,
+    # which are the same for every resample.
+    return _compute_hedges_correction_factor(control_n, test_n) * d
+
+
+def _batch_two_group_difference(control:np.ndarray, # 2D array with one resample of the control group per row. NaNs are not allowed.
+                                test:np.ndarray, # 2D array with one resample of the test group per row. NaNs are not allowed.
+                                is_paired:str=None, # If not None, computes the paired effect size row by row.
+                                effect_size:str="mean_diff" # Any one of the following effect sizes: ["mean_diff", "median_diff", "cohens_d", "hedges_g", "delta_g"]
+                               )->np.ndarray: # The effect size of each row.
+    """
+    Computes `effect_size` for a whole batch of resamples at once, using
+    reductions along the last axis instead of a Python loop over the rows.
+
+    Each row gives the same value as `two_group_difference` would for
+    that resample.
+    """
+
+    if effect_size == "mean_diff":
+        if is_paired:
+            return np.mean(test - control, axis=-1)
+        return np.mean(test, axis=-1) - np.mean(control, axis=-1)
+
+    if effect_size == "median_diff":
+        # np.median selects the middle order statistic(s) of every row with
+        # a partial sort (np.partition) instead of sorting the rows.
+        if is_paired:
+            return np.median(test - control, axis=-1)
+        return np.median(test, axis=-1) - np.median(control, axis=-1)
+
+    if effect_size in ["cohens_d", "hedges_g", "delta_g"]:
+        control_center = np.mean(control)
+        test_center = np.mean(test)
+        return _batch_standardized_difference(control - control_center,
+                                              test - test_center,
+                                              is_paired, effect_size,
+                                              test_center - control_center)
+
+    err = "The effect size '{}' cannot be computed in batches.".format(effect_size)
+    raise ValueError(err)
+
+def _pooled_frequency_table(control:np.ndarray, # The control observations. NaNs are not allowed.
+                            control_weights:np.ndarray, # The number of times each control observation occurs.
+                            test:np.ndarray, # The test observations. NaNs are not allowed.
+                            test_weights:np.ndarray # The number of times each test observation occurs.
+                           )->tuple: # The sorted distinct values, and their counts in the control and test groups.
+    """
+    Compresses two groups of observations with frequency weights into the
+    distinct values of the pooled groups and the count of each value in
+    each group. Values with a total count of zero are dropped.
+    """
+    values, inverse = np.unique(np.concatenate([control, test]), return_inverse=True)
+    control_counts = np.bincount(inverse[:len(control)], weights=control_weights,
+                                 minlength=len(values))
+    test_counts = np.bincount(inverse[len(control):], weights=test_weights,
+                              minlength=len(values))
+    observed = control_counts + test_counts > 0
+    return (values[observed], control_counts[observed].astype(np.int64),
+            test_counts[observed].astype(np.int64))
+
+
+def _frequency_moments(values:np.ndarray, # The distinct values.
+                       counts:np.ndarray # 2D array of the counts of `values`, one group per row.
+                      )->tuple: # The sizes, means and sums of squared deviations of each row.
+    """
+    Computes the size, mean and sum of squared deviations of groups given
+    as counts of distinct values.
+    """
+    n = counts.sum(axis=-1)
+    means = np.einsum("ij,j->i", counts, values) / n
+    deviations = values - means[:, None]
+    return n, means, np.einsum("ij,ij->i", counts, deviations * deviations)
+
+
+def _frequency_order_statistic(values:np.ndarray, # The sorted distinct values.
+                               counts:np.ndarray, # 2D array of the counts of `values`, one group per row.
+                               positions:np.ndarray # The 0-based position of the order statistic in each row.
+                              )->np.ndarray:
+    """
+    Returns an order statistic of every row, i.e. the value at `positions`
+    once the group is expanded and sorted.
+    """
+    cumulative = np.cumsum(counts, axis=-1)
+    return values[(cumulative > positions[:, None]).argmax(axis=-1)]
+
+
+def _frequency_median(values:np.ndarray, # The sorted distinct values.
+                      counts:np.ndarray # 2D array of the counts of `values`, one group per row.
+                     )->np.ndarray: # The median of each row, as `np.median` of the expanded group.
+    """
+    Computes the median of groups given as counts of distinct values.
+    """
+    n = counts.sum(axis=-1)
+    low = _frequency_order_statistic(values, counts, (n - 1) // 2)
+    high = _frequency_order_statistic(values, counts, n // 2)
+    return (low + high) / 2
+
+
+def _frequency_quantile(values:np.ndarray, # The sorted distinct values.
+                        counts:np.ndarray, # The counts of `values`.
+                        q:float # The quantile to compute, between 0 and 1.
+                       )->float:
+    """
+    Computes a quantile of a group given as counts of distinct values, with
+    the linear interpolation of `np.quantile` on the expanded group.
+    """
+    position = (counts.sum() - 1) * q
+    low = int(np.floor(position))
+    low_value, high_value = _frequency_order_statistic(
+        values, np.atleast_2d(counts), np.array([low, low + 1 if position > low else low]))
+    return low_value + (position - low) * (high_value - low_value)
+
+
+def _frequency_two_group_difference(values:np.ndarray, # The sorted distinct values of the pooled groups.
+                                    control_counts:np.ndarray, # The counts of `values` in the control group, as a 1D array or a 2D array with one resample per row.
+                                    test_counts:np.ndarray, # The counts of `values` in the test group, with the same shape as `control_counts`.
+                                    effect_size:str="mean_diff" # Any one of the following effect sizes: ["mean_diff", "median_diff", "cohens_d", "cohens_h", "hedges_g", "delta_g", "cliffs_delta"]
+                                   ):
+    """
+    Computes an unpaired `effect_size` of two groups given as counts of
+    the same distinct values, without expanding the groups. The result is
+    the same as `two_group_difference` of the expanded groups, up to
+    rounding errors.
+
+    With 2D counts, every row is a resample of the two groups, and one
+    effect size is returned per row.
+    """
+    single = np.ndim(control_counts) == 1
+    control_counts = np.atleast_2d(control_counts)
+    test_counts = np.atleast_2d(test_counts)
+
+    if effect_size == "median_diff":
+        out = _frequency_median(values, test_counts) - _frequency_median(values, control_counts)
+
+    elif effect_size == "cliffs_delta":
+        control_n = control_counts.sum(axis=-1)
+        test_n = test_counts.sum(axis=-1)
+        # The Mann-Whitney U statistic of the test group, as in `_batch_cliffs_delta`.
+        below = np.cumsum(control_counts, axis=-1) - control_counts
+        U = np.einsum("ij,ij->i", below + 0.5 * control_counts, test_counts)
+        out = ((2 * U) / (control_n * test_n)) - 1
+
+    else:
+        control_n, control_mean, control_ss = _frequency_moments(values, control_counts)
+        test_n, test_mean, test_ss = _frequency_moments(values, test_counts)
+
+        if effect_size == "mean_diff":
+            out = test_mean - control_mean
+
+        elif effect_size == "cohens_h":
+            if not np.isin(values, [0, 1]).all():
+                raise ValueError("Input data must be binary.")
+            out = 2 * np.arcsin(np.sqrt(test_mean)) - 2 * np.arcsin(np.sqrt(control_mean))
+
+        elif effect_size in ["cohens_d", "hedges_g", "delta_g"]:
+            divisor = np.sqrt((control_ss + test_ss) / (control_n + test_n - 2))
+            if (divisor == 0).any():
+                raise ValueError("The divisor is zero, indicating no variability in the data.")
+            out = (test_mean - control_mean) / divisor
+
+            if effect_size != "cohens_d":
+                # Leave-one-out rows do not all have the same group sizes.
+                sizes, inverse = np.unique(np.stack([control_n, test_n]), axis=1,
+                                           return_inverse=True)
+                correction = np.array([_compute_hedges_correction_factor(n1, n2)
+                                       for n1, n2 in sizes.T])
+                out = correction[inverse.ravel()] * out
+
+        else:
+            err = "The effect size '{}' is not defined for frequency weights.".format(effect_size)
+            raise ValueError(err)
+
+    return out[0] if single else out
+
+def _frequency_midranks(counts:np.ndarray # The counts of sorted distinct values.
+                       )->np.ndarray: # The average rank of the observations of each value.
+    """
+    Returns the midranks of the distinct values, as `scipy.stats.rankdata`
+    would give to every observation of the expanded group.
+    """
+    return np.cumsum(counts) - (counts - 1) / 2
+
+
+def _frequency_ttest_ind(values:np.ndarray, # The sorted distinct values of the pooled groups.
+                         control_counts:np.ndarray,
+                         test_counts:np.ndarray,
+                         equal_var:bool=True # If False, performs Welch's t-test.
+                        )->tuple: # The statistic and the p-value.
+    """
+    Student's or Welch's t-test of two groups given as counts of distinct
+    values, as `scipy.stats.ttest_ind(control, test)` of the expanded groups.
+    """
+    from scipy.stats import ttest_ind_from_stats
+
+    n, means, ss = _frequency_moments(values, np.stack([control_counts, test_counts]))
+    sd = np.sqrt(ss / (n - 1))
+    result = ttest_ind_from_stats(means[0], sd[0], n[0], means[1], sd[1], n[1],
+                                  equal_var=equal_var)
+    return result.statistic, result.pvalue
+
+
+def _frequency_mannwhitneyu(values:np.ndarray, # The sorted distinct values of the pooled groups.
+                            control_counts:np.ndarray,
+                            test_counts:np.ndarray
+                           )->tuple: # The statistic and the p-value.
+    """
+    Two-sided Mann-Whitney U test of two groups given as counts of distinct
+    values, as `scipy.stats.mannwhitneyu(control, test)` of the expanded
+    groups. Groups with tied values use the normal approximation with tie
+    and continuity corrections; without ties, the expanded groups are the
+    distinct values themselves and are passed to scipy.
+    """
+    from scipy.stats import norm
+
+    counts = control_counts + test_counts
+    if (counts == 1).all():
+        result = mannwhitneyu(np.repeat(values, control_counts),
+                              np.repeat(values, test_counts), alternative="two-sided")
+        return result.statistic, result.pvalue
+
+    n1, n2 = control_counts.sum(), test_counts.sum()
+    n = n1 + n2
+    U1 = control_counts @ _frequency_midranks(counts) - n1 * (n1 + 1) / 2
+    U = max(U1, n1 * n2 - U1)
+    tie_term = np.sum(counts**3 - counts)
+    s = np.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (U - n1 * n2 / 2 - 0.5) / s
+    return U1, np.clip(2 * norm.sf(z), 0, 1)
+
+
+def _frequency_kruskal(values:np.ndarray, # The sorted distinct values of the pooled groups.
+                       control_counts:np.ndarray,
+                       test_counts:np.ndarray
+                      )->tuple: # The statistic and the p-value.
+    """
+    Kruskal-Wallis H-test of two groups given as counts of distinct values,
+    as `scipy.stats.kruskal(control, test)` of the expanded groups.
+    """
+    from scipy.stats import chi2
+
+    counts = control_counts + test_counts
+    n = counts.sum()
+    ties = 1 - np.sum(counts**3 - counts) / (n**3 - n)
+    if ties == 0:
+        raise ValueError("All numbers are identical in kruskal")
+
+    midranks = _frequency_midranks(counts)
+    ssbn = sum((group @ midranks)**2 / group.sum() for group in [control_counts, test_counts])
+    h = (12.0 / (n * (n + 1)) * ssbn - 3 * (n + 1)) / ties
+    return h, chi2.sf(h, 1)
+
+
+def _frequency_brunnermunzel(values:np.ndarray, # The sorted distinct values of the pooled groups.
+                             control_counts:np.ndarray,
+                             test_counts:np.ndarray
+                            )->tuple: # The statistic and the p-value.
+    """
+    Two-sided Brunner-Munzel test of two groups given as counts of distinct
+    values, as `scipy.stats.brunnermunzel(control, test)` of the expanded
+    groups.
+    """
+    from scipy.stats import t
+
+    pooled_ranks = _frequency_midranks(control_counts + test_counts)
+    nx, ny = control_counts.sum(), test_counts.sum()
+    rank_means, rank_vars = [], []
+    for counts, n in [(control_counts, nx), (test_counts, ny)]:
+        # The ranks of every observation within the pooled and the own group.
+        rankc, rank = pooled_ranks, _frequency_midranks(counts)
+        rankc_mean, rank_mean = counts @ rankc / n, counts @ rank / n
+        rank_means.append(rankc_mean)
+        rank_vars.append(counts @ (rankc - rank - rankc_mean + rank_mean)**2 / (n - 1))
+    Sx, Sy = rank_vars
+
+    wbfn = nx * ny * (rank_means[1] - rank_means[0])
+    wbfn /= (nx + ny) * np.sqrt(nx * Sx + ny * Sy)
+    df = (nx * Sx + ny * Sy)**2 / ((nx * Sx)**2 / (nx - 1) + (ny * Sy)**2 / (ny - 1))
+    p = t.cdf(wbfn, df)
+    return wbfn, 2 * np.min([p, 1 - p])
+
+# %% ../../nbs/API/effsize.ipynb 15
 def weighted_delta(difference, group_var):
     '''
     Compute the weighted deltas where the weight is the inverse of the
@@ -30,6 +30,13 @@ def load_plot_data(
     -------
     List: Contrast plot data based on specified parameters.
     """
+    from ._delta_objects import DeltaDeltaBatch
+
+    if isinstance(contrasts, DeltaDeltaBatch):
+        if contrast_type != "delta2":
+            raise ValueError("A `DeltaDeltaBatch` only supports the `delta2` contrast_type.")
+        return contrasts.delta_deltas(effect_size)
+
     effect_attr_map = {
         "mean_diff": "mean_diff",
         "median_diff": "median_diff",
@@ -101,8 +108,9 @@ def forest_plot(
 
     Parameters
     ----------
-    contrasts : List
-        List of contrast objects.
+    contrasts : List or DeltaDeltaBatch
+        List of contrast objects, or a `DeltaDeltaBatch` with one contrast per
+        experiment set.
     selected_indices : Optional[List], default=None
         Indices of specific contrasts to plot, if not plotting all.
     analysis_type : str
@@ -150,12 +158,13 @@ def forest_plot(
         The matplotlib figure object with the generated forest plot.
     """
     from .plot_tools import halfviolin
+    from ._delta_objects import DeltaDeltaBatch
 
     # Validate inputs
     if contrasts is None:
         raise ValueError("The `contrasts` parameter cannot be None")
     
-    if not isinstance(contrasts, list) or not contrasts:
+    if not isinstance(contrasts, (list, DeltaDeltaBatch)) or not len(contrasts):
         raise ValueError("The `contrasts` argument must be a non-empty list.")
     
     if selected_indices is not None and not isinstance(selected_indices, (list, type(None))):
@@ -209,6 +218,10 @@ def forest_plot(
     if not isinstance(horizontal, bool):
         raise TypeError("`horizontal` must be a boolean value.")
 
+    # The experiment sets of a batch label their contrasts by default.
+    if isinstance(contrasts, DeltaDeltaBatch) and contrast_labels is None:
+        contrast_labels = [str(name) for name in contrasts]
+
     # Load plot data
     contrast_plot_data = load_plot_data(contrasts, effect_size, contrast_type)
 
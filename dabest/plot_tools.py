@@ -75,6 +75,7 @@ def error_bar(
         1,
     ],  # The positions of the error bars for the sankey_error_bar method.
     method: str = "gapped_lines",  # The method to use for drawing the error bars. Options are: 'gapped_lines', 'proportional_error_bar', and 'sankey_error_bar'.
+    weights: str = None,  # Column of frequency weights, i.e. the number of observations that each row stands for.
     **kwargs: dict,
 ):
     """
@@ -115,15 +116,27 @@ def error_bar(
     else:
         group_order = pd.unique(data[x])
 
-    means = data.groupby(x)[y].mean().reindex(index=group_order)
+    if weights is None:
+        means = data.groupby(x)[y].mean().reindex(index=group_order)
 
-    if method in ["proportional_error_bar", "sankey_error_bar"]:
-        g = lambda x: np.sqrt(
-            (np.sum(x) * (len(x) - np.sum(x))) / (len(x) * len(x) * len(x))
+        if method in ["proportional_error_bar", "sankey_error_bar"]:
+            g = lambda x: np.sqrt(
+                (np.sum(x) * (len(x) - np.sum(x))) / (len(x) * len(x) * len(x))
+            )
+            sd = data.groupby(x)[y].apply(g)
+        else:
+            sd = data.groupby(x)[y].std().reindex(index=group_order)
+
+        medians = data.groupby(x)[y].median().reindex(index=group_order)
+        quantiles = (
+            data.groupby(x)[y].quantile([0.25, 0.75]).unstack().reindex(index=group_order)
         )
-        sd = data.groupby(x)[y].apply(g)
+        lower_quartiles = quantiles[0.25]
+        upper_quartiles = quantiles[0.75]
     else:
-        sd = data.groupby(x)[y].std().reindex(index=group_order)
+        means, sd, medians, lower_quartiles, upper_quartiles = _frequency_summaries(
+            data, x, y, weights, group_order, method
+        )
 
     lower_sd = means - sd
     upper_sd = means + sd
@@ -131,13 +144,6 @@ def error_bar(
     if (lower_sd < ax_ylims[0]).any() or (upper_sd > ax_ylims[1]).any():
         kwargs["clip_on"] = True
 
-    medians = data.groupby(x)[y].median().reindex(index=group_order)
-    quantiles = (
-        data.groupby(x)[y].quantile([0.25, 0.75]).unstack().reindex(index=group_order)
-    )
-    lower_quartiles = quantiles[0.25]
-    upper_quartiles = quantiles[0.75]
-
     if type == "mean_sd":
         central_measures = means
         lows = lower_sd
@@ -205,6 +211,47 @@ def error_bar(
             ax.add_line(mean_to_high)
 
 
+def _frequency_summaries(
+    data: pd.DataFrame,  # This DataFrame should be in 'long' format.
+    x: str,  # Column of the groups.
+    y: str,  # Column of the values.
+    weights: str,  # Column of frequency weights.
+    group_order,  # The groups, in plotting order.
+    method: str = "gapped_lines",  # As in `error_bar`.
+):
+    """
+    Computes the summaries drawn by `error_bar` for data with frequency
+    weights, from the counts of the distinct values of every group: the
+    means, the standard deviations (or the standard errors of the
+    proportions), the medians and the quartiles.
+    """
+    from ._stats_tools.effsize import (
+        _pooled_frequency_table,
+        _frequency_moments,
+        _frequency_quantile,
+    )
+
+    summaries = []
+    for name in group_order:
+        group = data[data[x] == name]
+        values, counts, _ = _pooled_frequency_table(
+            group[y].to_numpy(), group[weights].to_numpy(), [], []
+        )
+        n, means, ss = _frequency_moments(values, counts[None])
+        n, mean = n[0], means[0]
+        if method in ["proportional_error_bar", "sankey_error_bar"]:
+            sd = np.sqrt(mean * (1 - mean) / n)
+        else:
+            sd = np.sqrt(ss[0] / (n - 1))
+        summaries.append(
+            [mean, sd]
+            + [_frequency_quantile(values, counts, q) for q in [0.5, 0.25, 0.75]]
+        )
+
+    summaries = pd.DataFrame(summaries, index=group_order)
+    return tuple(summaries[column] for column in summaries.columns)
+
+
 def check_data_matches_labels(
     labels,  # list of input labels
     data,  # Pandas Series of input data
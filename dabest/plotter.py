@@ -62,10 +62,7 @@ def effectsize_df_plotter(effectsize_df, **plot_kwargs):
         sankeydiag,
         swarmplot,
     )
-    from ._stats_tools.effsize import (
-        _compute_standardizers,
-        _compute_hedges_correction_factor,
-    )
+    from ._stats_tools.effsize import _compute_hedges_correction_factor
 
     warnings.filterwarnings(
         "ignore", "This figure includes Axes that are not compatible with tight_layout"
@@ -98,6 +95,8 @@ def effectsize_df_plotter(effectsize_df, **plot_kwargs):
     mini_meta = effectsize_df.mini_meta
     effect_size = effectsize_df.effect_size
     proportional = effectsize_df.proportional
+    # Column of frequency weights; each row of `plot_data` is drawn once.
+    weights = dabest_obj.weights
 
     all_plot_groups = dabest_obj._all_plot_groups
     idx = dabest_obj.idx
@@ -466,33 +465,26 @@ def effectsize_df_plotter(effectsize_df, **plot_kwargs):
         temp_all_plot_groups = all_plot_groups if not proportional else plot_groups
 
         if not proportional:
-            # Plot the raw data as a slopegraph.
-            # Pivot the long (melted) data.
-            if color_col is None:
-                pivot_values = [yvar]
-            else:
-                pivot_values = [yvar, color_col]
-            pivoted_plot_data = pd.pivot(
-                data=plot_data,
-                index=dabest_obj.id_col,
-                columns=xvar,
-                values=pivot_values,
-            )
+            # Plot the raw data as a slopegraph, from the subject x group
+            # matrix of the Dabest object.
+            y_values = plot_data[yvar].to_numpy()
+            if color_col is not None:
+                color_values = plot_data[color_col].to_numpy()
             x_start = 0
             for ii, current_tuple in enumerate(temp_idx):
-                current_pair = pivoted_plot_data.loc[
-                    :, pd.MultiIndex.from_product([pivot_values, current_tuple])
-                ].dropna()
+                subject_rows, subjects = dabest_obj._subject_rows(current_tuple)
+                # Draw the subjects in the order of their ids.
+                subject_rows = subject_rows[pd.Index(subjects).argsort()]
                 grp_count = len(current_tuple)
                 # Iterate through the data for the current tuple.
-                for ID, observation in current_pair.iterrows():
+                for rows in subject_rows:
                     x_points = [t for t in range(x_start, x_start + grp_count)]
-                    y_points = observation[yvar].tolist()
+                    y_points = y_values[rows].tolist()
 
                     if color_col is None:
                         slopegraph_kwargs["color"] = ytick_color
                     else:
-                        color_key = observation[color_col][0]
+                        color_key = color_values[rows[0]]
                         if isinstance(color_key, (str, np.int64, np.float64)):
                             slopegraph_kwargs["color"] = plot_palette_raw[color_key]
                             slopegraph_kwargs["label"] = color_key
@@ -526,26 +518,15 @@ def effectsize_df_plotter(effectsize_df, **plot_kwargs):
                     delta_plot_data = delta_plot_data_temp[[xvar, yvar, delta_id_col]]
                     deltapts_args = {"marker": "^", "alpha": 0.5}
 
-                final_deltas = pd.DataFrame()
-                for i in idx:
-                    for j in i:
-                        if i.index(j) != 0:
-                            temp_df_exp = delta_plot_data[
-                                delta_plot_data[xvar].str.contains(j)
-                            ].reset_index(drop=True)
-                            if is_paired == "baseline":
-                                temp_df_cont = delta_plot_data[
-                                    delta_plot_data[xvar].str.contains(i[0])
-                                ].reset_index(drop=True)
-                            elif is_paired == "sequential":
-                                temp_df_cont = delta_plot_data[
-                                    delta_plot_data[xvar].str.contains(
-                                        i[i.index(j) - 1]
-                                    )
-                                ].reset_index(drop=True)
-                            delta_df = temp_df_exp.copy()
-                            delta_df[yvar] = temp_df_exp[yvar] - temp_df_cont[yvar]
-                            final_deltas = pd.concat([final_deltas, delta_df])
+                # The deltas of each comparison are aligned by subject.
+                y_values = plot_data[yvar].to_numpy()
+                final_deltas = []
+                for control_name, test_name in dabest_obj._comparisons:
+                    subject_rows, _ = dabest_obj._subject_rows([control_name, test_name])
+                    delta_df = delta_plot_data.iloc[subject_rows[:, 1]].reset_index(drop=True)
+                    delta_df[yvar] = y_values[subject_rows[:, 1]] - y_values[subject_rows[:, 0]]
+                    final_deltas.append(delta_df)
+                final_deltas = pd.concat(final_deltas)
 
                 # swarmplot() plots swarms based on current size of ax
                 # Therefore, since the ax size for Gardner-Altman plot changes later on, there has to be decreased jitter
@@ -613,9 +594,18 @@ def effectsize_df_plotter(effectsize_df, **plot_kwargs):
 
             # two_col_sankey = True if proportional == True and one_sankey == False and sankey == True and flow == False else False
 
+            # Order the observations of every group by subject, from the
+            # subject x group matrix of the Dabest object, so that the flows
+            # of the Sankey diagrams pair them by `id_col`.
+            subject_order = np.zeros(len(plot_data), dtype=int)
+            for current_tuple in idx:
+                subject_rows, _ = dabest_obj._subject_rows(current_tuple)
+                subject_order[subject_rows] = np.arange(len(subject_rows))[:, None]
+            sankey_data = plot_data.iloc[np.argsort(subject_order, kind="stable")]
+
             # Replace the paired proportional plot with sankey diagram
             sankeyplot = sankeydiag(
-                plot_data,
+                sankey_data,
                 xvar=xvar,
                 yvar=yvar,
                 left_idx=sankey_control_group,
@@ -692,8 +682,20 @@ def effectsize_df_plotter(effectsize_df, **plot_kwargs):
                 edgecolor=bar_color,
                 zorder=1,
             )
+            if weights is None:
+                bar2_df = plot_data
+            else:
+                bar2_df = pd.DataFrame(
+                    {
+                        xvar: all_plot_groups,
+                        yvar: [
+                            dabest_obj._group_statistic(name, "mean")
+                            for name in all_plot_groups
+                        ],
+                    }
+                )
             bar2 = sns.barplot(
-                data=plot_data,
+                data=bar2_df,
                 x=xvar,
                 y=yvar,
                 ax=rawdata_axes,
@@ -755,6 +757,7 @@ def effectsize_df_plotter(effectsize_df, **plot_kwargs):
                 type=group_summaries,
                 ax=rawdata_axes,
                 method="gapped_lines",
+                weights=weights,
                 **group_summary_kwargs
             )
 
@@ -772,11 +775,15 @@ def effectsize_df_plotter(effectsize_df, **plot_kwargs):
                 type=group_summaries,
                 ax=rawdata_axes,
                 method="proportional_error_bar",
+                weights=weights,
                 **group_summary_kwargs
             )
 
     # Add the counts to the rawdata axes xticks.
-    counts = plot_data.groupby(xvar).count()[yvar]
+    if weights is None:
+        counts = plot_data.groupby(xvar).count()[yvar]
+    else:
+        counts = plot_data.groupby(xvar)[weights].sum().astype(int)
     ticks_with_counts = []
     ticks_loc = rawdata_axes.get_xticks()
     rawdata_axes.xaxis.set_major_locator(matplotlib.ticker.FixedLocator(ticks_loc))
@@ -1071,21 +1078,11 @@ def effectsize_df_plotter(effectsize_df, **plot_kwargs):
         # Normalize ylims and despine the floating contrast axes.
         # Check that the effect size is within the swarm ylims.
         if effect_size_type in ["mean_diff", "cohens_d", "hedges_g", "cohens_h"]:
-            control_group_summary = (
-                plot_data.groupby(xvar)
-                .mean(numeric_only=True)
-                .loc[current_control, yvar]
-            )
-            test_group_summary = (
-                plot_data.groupby(xvar).mean(numeric_only=True).loc[current_group, yvar]
-            )
+            control_group_summary = dabest_obj._group_statistic(current_control, "mean")
+            test_group_summary = dabest_obj._group_statistic(current_group, "mean")
         elif effect_size_type == "median_diff":
-            control_group_summary = (
-                plot_data.groupby(xvar).median().loc[current_control, yvar]
-            )
-            test_group_summary = (
-                plot_data.groupby(xvar).median().loc[current_group, yvar]
-            )
+            control_group_summary = dabest_obj._group_statistic(current_control, "median")
+            test_group_summary = dabest_obj._group_statistic(current_group, "median")
 
         if swarm_ylim is None:
             swarm_ylim = rawdata_axes.get_ylim()
@@ -1118,20 +1115,22 @@ def effectsize_df_plotter(effectsize_df, **plot_kwargs):
                 which_std = 1
             else:
                 which_std = 0
-            temp_control = plot_data[plot_data[xvar] == current_control][yvar]
-            temp_test = plot_data[plot_data[xvar] == current_group][yvar]
-
-            stds = _compute_standardizers(temp_control, temp_test)
-            if is_paired:
-                pooled_sd = stds[1]
-            else:
-                pooled_sd = stds[0]
+            len_control = dabest_obj._group_statistic(current_control, "size")
+            len_test = dabest_obj._group_statistic(current_group, "size")
+
+            if effect_size_type != "cohens_h":
+                # The standardizers of `_compute_standardizers`.
+                control_var = dabest_obj._group_statistic(current_control, "var")
+                test_var = dabest_obj._group_statistic(current_group, "var")
+                if is_paired:
+                    pooled_sd = np.sqrt((control_var + test_var) / 2)
+                else:
+                    pooled_sd = np.sqrt(
+                        ((len_control - 1) * control_var + (len_test - 1) * test_var)
+                        / (len_control + len_test - 2)
+                    )
 
             if effect_size_type == "hedges_g":
-                gby_count = plot_data.groupby(xvar).count()
-                len_control = gby_count.loc[current_control, yvar]
-                len_test = gby_count.loc[current_group, yvar]
-
                 hg_correction_factor = _compute_hedges_correction_factor(
                     len_control, len_test
                 )
@@ -1140,7 +1139,7 @@ def effectsize_df_plotter(effectsize_df, **plot_kwargs):
 
             elif effect_size_type == "cohens_h":
                 ylim_scale_factor = (
-                    np.mean(temp_test) - np.mean(temp_control)
+                    test_group_summary - control_group_summary
                 ) / difference
 
             else:
@@ -3,7 +3,8 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from dabest.forest_plot import load_plot_data, extract_plot_data, forest_plot
-from data.mocked_data_test_forestplot import dummy_contrasts, default_forestplot_kwargs
+import dabest
+from data.mocked_data_test_forestplot import dummy_df, dummy_contrasts, default_forestplot_kwargs
 
 def test_forest_plot_no_input_parameters():
     error_msg = "The `contrasts` parameter cannot be None"
@@ -45,3 +46,19 @@ def test_forest_plot_input_error_handling(param_name, param_value, error_msg, er
     
     # Check the error message
     assert error_msg in str(excinfo.value)
+
+def test_forest_plot_delta2_batch():
+    batch = dabest.load_delta2_batch(dummy_df, x="Genotype", y="Y",
+                                     experiment="Treatment", experiment_set="Rep",
+                                     resamples=500)
+    fig = forest_plot(batch, effect_size="delta_g", custom_palette={"Rep2": "red"})
+
+    labels = [label.get_text() for label in fig.axes[0].get_xticklabels()]
+    assert labels == ["Rep1", "Rep2"]
+    assert [row.difference for row in load_plot_data(batch, "delta_g")] == \
+        batch.results[batch.results.effect_size == "delta_g"].difference.tolist()
+
+    with pytest.raises(ValueError) as excinfo:
+        forest_plot(batch, contrast_type="mini_meta")
+    assert "only supports the `delta2` contrast_type" in str(excinfo.value)
+    plt.close(fig)
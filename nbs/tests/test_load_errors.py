@@ -74,8 +74,87 @@ def test_wrong_params_combinations():
             delta2=True
         )
 
+    error_msg = "`paired` and `all_pairs` cannot be used at the same time."
+    with pytest.raises(ValueError) as excinfo:
+        my_data = load(
+            dummy_df, idx=("Control 1", "Test 1"), paired="baseline", all_pairs=True
+        )
+
+    assert error_msg in str(excinfo.value)
+
+    error_msg = "`sequential_permutations` only accepts the options `exceedances` and `precision`."
+    with pytest.raises(ValueError) as excinfo:
+        my_data = load(
+            dummy_df, idx=("Control 1", "Test 1"), sequential_permutations=dict(alpha=0.05)
+        )
+
+    assert error_msg in str(excinfo.value)
+
+    error_msg = "`sequential_permutations` and `exact_permutations` cannot be used with `delta2` or `mini_meta`."
+    with pytest.raises(ValueError) as excinfo:
+        my_data = load(
+            dummy_df, idx=(("Control 1", "Test 1"), ("Control 2", "Test 2")),
+            mini_meta=True, exact_permutations=True
+        )
+
+    assert error_msg in str(excinfo.value)
+
+    error_msg = "`weights` cannot be used with `paired` data."
+    with pytest.raises(ValueError) as excinfo:
+        my_data = load(
+            dummy_df, idx=("Control 1", "Test 1"), paired="baseline", id_col="ID",
+            weights="ID"
+        )
+
+    assert error_msg in str(excinfo.value)
+
+    error_msg = "`weights` cannot be used with `per_group_resamples` or `all_pairs`."
+    with pytest.raises(ValueError) as excinfo:
+        my_data = load(
+            dummy_df, idx=("Control 1", "Test 1"), all_pairs=True, weights="ID"
+        )
+
+    assert error_msg in str(excinfo.value)
+
+    error_msg = "`resamples='auto'` cannot be used with `delta2`, `mini_meta`, `per_group_resamples` or `all_pairs`."
+    with pytest.raises(ValueError) as excinfo:
+        my_data = load(
+            dummy_df, idx=(("Control 1", "Test 1"), ("Control 2", "Test 2")),
+            mini_meta=True, resamples="auto"
+        )
+
+    assert error_msg in str(excinfo.value)
+
+    with pytest.raises(ValueError) as excinfo:
+        my_data = load(
+            dummy_df, idx=("Control 1", "Test 1"), per_group_resamples=True, resamples="auto"
+        )
+
+    assert error_msg in str(excinfo.value)
+
+    error_msg = "`time_budget` cannot be used with `delta2`, `mini_meta`, `per_group_resamples` or `all_pairs`."
+    with pytest.raises(ValueError) as excinfo:
+        my_data = load(
+            dummy_df, idx=("Control 1", "Test 1"), all_pairs=True, time_budget=1
+        )
+
+    assert error_msg in str(excinfo.value)
+
 
 def test_param_validations():
+    error_msg = "`resamples` must be an integer or 'auto'."
+    with pytest.raises(ValueError) as excinfo:
+        my_data = load(dummy_df, idx=("Control 1", "Test 1"), resamples="adaptive")
+
+    assert error_msg in str(excinfo.value)
+
+    error_msg = "`time_budget` must be a positive number of seconds."
+    for time_budget in [0, -1, "1", True]:
+        with pytest.raises(ValueError) as excinfo:
+            my_data = load(dummy_df, idx=("Control 1", "Test 1"), time_budget=time_budget)
+
+        assert error_msg in str(excinfo.value)
+
     error_msg = "`idx` contains duplicated groups. Please remove any duplicates and try again.".format(N)
     with pytest.raises(ValueError) as excinfo:
         my_data = load(
@@ -213,4 +292,36 @@ def test_param_validations():
             x1_level=wrong_x1_level
         )
 
-    assert error_msg in str(excinfo.value)
\ No newline at end of file
+    assert error_msg in str(excinfo.value)
+    duplicated_ids = dummy_df.assign(ID=[1] + list(range(1, N)))
+    error_msg = "Each subject in `ID` must have at most one observation per group in paired data."
+    with pytest.raises(ValueError) as excinfo:
+        my_data = load(
+            duplicated_ids, idx=("Control 1", "Test 1"), paired="baseline", id_col="ID"
+        )
+
+    assert error_msg in str(excinfo.value)
+
+    long_df = dummy_df.melt(id_vars="ID", var_name="group", value_name="value")
+    error_msg = "Subject 1 of `ID` is not observed in every group of ('Control 1', 'Test 1')."
+    with pytest.raises(ValueError) as excinfo:
+        my_data = load(
+            long_df.drop(index=long_df[(long_df.group == "Test 1") & (long_df.ID == 1)].index),
+            x="group", y="value", idx=("Control 1", "Test 1"), paired="baseline", id_col="ID"
+        )
+
+    assert error_msg in str(excinfo.value)
+
+    error_msg = "counts is not a column in `data`. Please check."
+    with pytest.raises(IndexError) as excinfo:
+        my_data = load(dummy_df, idx=("Control 1", "Test 1"), weights="counts")
+
+    assert error_msg in str(excinfo.value)
+
+    error_msg = "The weights in `counts` must be non-negative whole numbers of observations."
+    with pytest.raises(ValueError) as excinfo:
+        my_data = load(
+            dummy_df.assign(counts=0.5), idx=("Control 1", "Test 1"), weights="counts"
+        )
+
+    assert error_msg in str(excinfo.value)
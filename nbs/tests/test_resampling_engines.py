@@ -0,0 +1,1070 @@
+import pytest
+import warnings
+import itertools
+import numpy as np
+import pandas as pd
+from numpy.random import PCG64, RandomState, SeedSequence
+
+from dabest._stats_tools import effsize
+from dabest._stats_tools import confint_1group as ci1g
+from dabest._stats_tools import confint_2group_diff as ci2g
+import dabest
+from dabest import load, TwoGroupsEffectSize, PermutationTest
+from data.mocked_data_test_01 import wellbeing, paired_wellbeing, likert_control, likert_treatment
+
+
+def _looped_bootstraps(x0, x1, is_paired, effect_size, resamples, random_seed=12345):
+    # Reference implementation: one resample at a time.
+    rng = RandomState(PCG64(random_seed))
+    out = []
+    for _ in range(resamples):
+        if is_paired:
+            idx = rng.choice(len(x0), len(x0), replace=True)
+            x0_sample, x1_sample = x0[idx], x1[idx]
+        else:
+            x0_sample = rng.choice(x0, len(x0), replace=True)
+            x1_sample = rng.choice(x1, len(x1), replace=True)
+        out.append(effsize.two_group_difference(x0_sample, x1_sample, is_paired, effect_size))
+    return np.array(out)
+
+
+@pytest.mark.parametrize("effect_size", ["mean_diff", "median_diff", "cohens_d", "hedges_g"])
+@pytest.mark.parametrize("is_paired", [None, "baseline"])
+def test_batched_bootstraps_match_looped(effect_size, is_paired):
+    if is_paired:
+        x0 = paired_wellbeing.pre.to_numpy(dtype=float)
+        x1 = paired_wellbeing.post.to_numpy(dtype=float)
+    else:
+        x0 = wellbeing.control.to_numpy(dtype=float)
+        x1 = wellbeing.expt.to_numpy(dtype=float)
+
+    expected = _looped_bootstraps(x0, x1, is_paired, effect_size, resamples=500)
+    batched = ci2g.compute_bootstrapped_diff(x0, x1, is_paired, effect_size, resamples=500)
+    assert batched == pytest.approx(expected)
+
+    # The bootstraps must not depend on the size of the batches.
+    small_batches = ci2g.compute_bootstrapped_diff(
+        x0, x1, is_paired, effect_size, resamples=500, memory_budget=1000
+    )
+    assert np.array_equal(batched, small_batches)
+
+
+@pytest.mark.parametrize("effect_size", ["mean_diff", "cohens_d", "hedges_g"])
+@pytest.mark.parametrize("is_paired", [None, "baseline"])
+def test_closed_form_jackknife_matches_leave_one_out(effect_size, is_paired):
+    if is_paired:
+        x0 = paired_wellbeing.pre.to_numpy(dtype=float)
+        x1 = paired_wellbeing.post.to_numpy(dtype=float)
+    else:
+        x0 = wellbeing.control.to_numpy(dtype=float)
+        x1 = wellbeing.expt.to_numpy(dtype=float)[:7]
+
+    expected = [
+        effsize.two_group_difference(x0[j0], x1[j1], is_paired, effect_size)
+        for j0, j1 in ci2g._create_two_group_jackknife_indexes(x0, x1, is_paired)
+    ]
+    jackknives = ci2g.compute_meandiff_jackknife(x0, x1, is_paired, effect_size)
+
+    assert jackknives == pytest.approx(expected)
+    assert ci2g._calc_accel(jackknives) == pytest.approx(ci2g._calc_accel(expected))
+
+
+def test_closed_form_1group_jackknife_of_means():
+    x = np.random.default_rng(12345).normal(size=500)
+
+    expected = [np.mean(x[j]) for j in ci2g.create_jackknife_indexes(x)]
+    jackknives = ci1g.compute_1group_jackknife(x, np.mean)
+
+    assert jackknives == pytest.approx(expected)
+
+
+def test_rank_based_cliffs_delta():
+    x0 = np.array(likert_control, dtype=float)
+    x1 = np.array(likert_treatment, dtype=float)
+
+    expected = _looped_bootstraps(x0, x1, None, "cliffs_delta", resamples=500)
+    bootstraps = ci2g.compute_bootstrapped_diff(x0, x1, None, "cliffs_delta", resamples=500)
+    assert np.array_equal(bootstraps, expected)
+
+    # Same reshuffles as the one-at-a-time permutation test.
+    rng = RandomState(PCG64(12345))
+    bag = np.concatenate([x0, x1])
+    expected = []
+    for _ in range(500):
+        shuffled = rng.permutation(bag)
+        expected.append(effsize.cliffs_delta(shuffled[:len(x0)], shuffled[len(x0):]))
+
+    perm_test = PermutationTest(x0, x1, "cliffs_delta", permutation_count=500)
+    assert np.array_equal(perm_test.permutations, expected)
+
+
+def test_median_diff_warns_once_per_comparison():
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        TwoGroupsEffectSize(wellbeing.control, wellbeing.expt, "median_diff",
+                            resamples=500, permutation_count=500)
+
+    median_warnings = [w for w in caught if "Using median" in str(w.message)]
+    assert len(median_warnings) == 1
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 6])
+def test_exact_median_distribution_matches_enumeration(n):
+    import itertools
+
+    x = np.array([0.3, -1.2, 0.3, 2.5, 0.9, -0.4])[:n]
+    values, probs = ci2g._exact_bootstrap_median_distribution(x)
+
+    medians = [np.median(x[list(idx)]) for idx in itertools.product(range(n), repeat=n)]
+    support, counts = np.unique(medians, return_counts=True)
+
+    np.testing.assert_allclose(values, support)
+    np.testing.assert_allclose(probs, counts / len(medians))
+
+
+@pytest.mark.parametrize("is_paired", [None, "baseline"])
+def test_exact_median_diff(is_paired):
+    control = paired_wellbeing.pre.values
+    test = paired_wellbeing.post.values
+
+    exact = TwoGroupsEffectSize(control, test, "median_diff", is_paired=is_paired,
+                                resampling="exact", permutation_count=500)
+    sampled = TwoGroupsEffectSize(control, test, "median_diff", is_paired=is_paired,
+                                  resamples=20000, permutation_count=500)
+
+    assert exact.resampling == "exact"
+    assert exact.bootstraps.shape == (5000,)
+    np.testing.assert_allclose([exact.pct_low, exact.pct_high],
+                               [sampled.pct_low, sampled.pct_high], atol=0.5)
+
+    with pytest.raises(ValueError):
+        TwoGroupsEffectSize(control, test, "mean_diff", resampling="exact")
+
+
+def test_exact_median_diff_of_large_groups():
+    import tracemalloc
+
+    rng = np.random.default_rng(13)
+    # Even sizes give the largest supports.
+    control, test = rng.normal(size=20000), rng.normal(0.1, 1, size=20000)
+    v0, p0 = ci2g._exact_bootstrap_median_distribution(control)
+    v1, p1 = ci2g._exact_bootstrap_median_distribution(test)
+    assert len(v0) * len(v1) > ci2g._EXACT_MAX_PAIRS
+
+    tracemalloc.start()
+    with pytest.warns(UserWarning, match="draws of each median"):
+        exact = ci2g.compute_exact_bootstrapped_median_diff(control, test, None)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 256 * 1024**2
+
+    assert exact.shape == (5000,)
+    assert np.all(np.diff(exact) >= 0)
+    assert exact.mean() == pytest.approx(v1 @ p1 - v0 @ p0, abs=0.01 * exact.std())
+
+    # Sampling from the exact distributions of the medians is much closer to
+    # the exact quantiles than resampling the data.
+    control, test = control[:200], test[:200]
+    v0, p0 = ci2g._exact_bootstrap_median_distribution(control)
+    v1, p1 = ci2g._exact_bootstrap_median_distribution(test)
+    values = np.subtract.outer(v1, v0).ravel()
+    order = np.argsort(values, kind="stable")
+    cumulative = np.cumsum(np.multiply.outer(p1, p0).ravel()[order])
+    levels = (np.arange(5000) + 0.5) / 5000 * cumulative[-1]
+    expected = values[order][np.searchsorted(cumulative, levels)]
+    with pytest.warns(UserWarning):
+        sampled = ci2g.compute_exact_bootstrapped_median_diff(control, test, None)
+    assert np.abs(sampled - expected).max() < 0.05 * expected.std()
+
+
+@pytest.mark.parametrize("effect_size", ["cohens_d", "hedges_g"])
+@pytest.mark.parametrize("is_paired", [None, "baseline"])
+def test_sufficient_statistic_kernels_with_large_offset(effect_size, is_paired):
+    # The sums of squares must stay accurate when the data sit far from zero.
+    x0 = paired_wellbeing.pre.to_numpy(dtype=float) + 1e6
+    x1 = paired_wellbeing.post.to_numpy(dtype=float) + 1e6
+
+    expected = _looped_bootstraps(x0, x1, is_paired, effect_size, resamples=200)
+    batched = ci2g.compute_bootstrapped_diff(x0, x1, is_paired, effect_size, resamples=200)
+    assert batched == pytest.approx(expected, rel=1e-9)
+
+
+def test_sufficient_statistic_kernel_zero_divisor():
+    constant = np.full((3, 4), 0.1)
+    with pytest.raises(ValueError):
+        effsize._batch_standardized_difference(constant, constant)
+
+
+@pytest.mark.parametrize("effect_size", ["mean_diff", "median_diff", "cohens_d", "hedges_g"])
+def test_per_group_resamples(effect_size):
+    rng = np.random.default_rng(0)
+    groups = ["Control", "T1", "T2"]
+    df = pd.DataFrame({g: pd.Series(rng.normal(i, 1, 30 + i)) for i, g in enumerate(groups)})
+
+    dabest_obj = load(df, idx=tuple(groups), resamples=1000, per_group_resamples=True)
+    results = getattr(dabest_obj, effect_size).results
+
+    statistic = ci2g._GROUP_BOOTSTRAP_STATISTICS[effect_size]
+    per_group = {}
+    for i, g in enumerate(groups):
+        x = df[g].dropna().to_numpy()
+        seed = SeedSequence(12345, spawn_key=(i,))
+        per_group[g] = (len(x), ci2g.compute_group_bootstraps(x, statistic, 1000, seed))
+
+    for row, test in zip(results.itertuples(), ["T1", "T2"]):
+        (control_n, control), (test_n, test_boots) = per_group["Control"], per_group[test]
+        expected = ci2g.combine_group_bootstraps(control, test_boots, control_n, test_n, effect_size)
+        assert np.array_equal(row.bootstraps, expected)
+
+
+def test_all_pairs_contrasts():
+    rng = np.random.default_rng(1)
+    groups = ["A", "B", "C", "D"]
+    df = pd.DataFrame({g: pd.Series(rng.normal(i, 1, 20 + i)) for i, g in enumerate(groups)})
+
+    all_pairs = load(df, idx=tuple(groups), resamples=1000, all_pairs=True)
+    results = all_pairs.cohens_d.results
+
+    expected_pairs = [("A", "B"), ("A", "C"), ("A", "D"), ("B", "C"), ("B", "D"), ("C", "D")]
+    assert list(zip(results.control, results.test)) == expected_pairs
+
+    # The vectorized contrasts match those assembled one pair at a time.
+    for row in results.itertuples():
+        one_pair = all_pairs._group_bootstrap_difference(row.control, row.test, "cohens_d")
+        assert np.allclose(row.bootstraps, one_pair)
+
+    with pytest.raises(ValueError):
+        all_pairs.cohens_d.plot()
+
+
+@pytest.mark.parametrize("paired", [None, "baseline"])
+def test_shared_resamples_match_standalone(paired):
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({"Control": rng.normal(0, 1, 15), "Test": np.round(rng.normal(1, 1, 15)),
+                       "ID": np.arange(15)})
+    dabest_obj = load(df, idx=("Control", "Test"), paired=paired, id_col="ID", resamples=1000,
+                      random_seed=7)
+
+    for effect_size in ["mean_diff", "cohens_d", "hedges_g", "delta_g"]:
+        row = getattr(dabest_obj, effect_size).results.iloc[0]
+        standalone = TwoGroupsEffectSize(df.Control, df.Test, effect_size, is_paired=paired,
+                                         resamples=1000, random_seed=7)
+        assert np.array_equal(row.bootstraps, standalone.bootstraps)
+        assert np.array_equal(row.permutations, standalone.permutations)
+        assert row.pvalue_permutation == standalone.pvalue_permutation
+
+
+@pytest.mark.parametrize("effect_size", ["mean_diff", "median_diff", "cohens_d", "hedges_g"])
+@pytest.mark.parametrize("is_paired", [None, "baseline"])
+def test_batched_permutations_match_looped(effect_size, is_paired):
+    x0 = np.array(likert_control[:6], dtype=float)
+    x1 = np.array(likert_treatment, dtype=float)
+    if is_paired:
+        x1 = x1[:6]
+
+    permutation_test = PermutationTest(x0, x1, effect_size, is_paired, permutation_count=300)
+
+    rng = RandomState(PCG64(12345))
+    control_sample, test_sample = np.array(x0), np.array(x1)
+    bag = np.concatenate([x0, x1])
+    expected = []
+    for _ in range(300):
+        if is_paired:
+            idx = rng.choice(len(x0), rng.randint(0, len(x0) + 1), replace=False)
+            control_sample[idx], test_sample[idx] = test_sample[idx], control_sample[idx].copy()
+        else:
+            shuffled = rng.permutation(bag)
+            control_sample, test_sample = shuffled[:len(x0)], shuffled[len(x0):]
+        expected.append(effsize._two_group_difference(control_sample, test_sample, None, effect_size))
+
+    assert np.array_equal(permutation_test.permutations, expected)
+
+
+def test_sign_flip_moments_match_permuted_rows():
+    from dabest._effsize_objects import _permutation_moments, _permutation_rows
+
+    x0 = np.array(paired_wellbeing["pre"], dtype=float) + 1e6
+    x1 = np.array(paired_wellbeing["post"], dtype=float) + 1e6
+
+    moments = _permutation_moments(x0, x1, "baseline", 400, legacy_rng=False)
+    rows = list(_permutation_rows(x0, x1, "baseline", 400, legacy_rng=False))
+    control_rows = np.concatenate([c for c, _ in rows])
+    test_rows = np.concatenate([t for _, t in rows])
+
+    # Every row swaps some pairs and keeps the others.
+    assert np.array_equal(control_rows + test_rows, np.tile(x0 + x1, (400, 1)))
+    assert np.allclose(moments[0], control_rows.mean(axis=1))
+    assert np.allclose(moments[1], test_rows.mean(axis=1))
+    assert np.allclose(moments[2], np.var(control_rows, axis=1, ddof=1))
+    assert np.allclose(moments[3], np.var(test_rows, axis=1, ddof=1))
+
+
+@pytest.mark.parametrize("effect_size, is_paired", [
+    ("mean_diff", None), ("mean_diff", "baseline"),
+    ("median_diff", None), ("median_diff", "baseline"),
+    ("hedges_g", None), ("hedges_g", "baseline"),
+    ("cliffs_delta", None),
+])
+def test_generator_permutations(effect_size, is_paired):
+    x0 = np.array(paired_wellbeing["pre"], dtype=float)
+    x1 = np.array(paired_wellbeing["post"], dtype=float)
+
+    first = PermutationTest(x0, x1, effect_size, is_paired, permutation_count=2000,
+                            legacy_rng=False)
+    second = PermutationTest(x0, x1, effect_size, is_paired, permutation_count=2000,
+                             legacy_rng=False)
+    legacy = PermutationTest(x0, x1, effect_size, is_paired, permutation_count=2000)
+
+    assert np.array_equal(first.permutations, second.permutations)
+    assert len(first.permutations) == len(first.permutations_var) == 2000
+    assert not np.array_equal(first.permutations, legacy.permutations)
+    # Under the null hypothesis, the permuted effect sizes are centred on zero.
+    assert abs(np.mean(first.permutations)) < 0.1 * np.std(first.permutations)
+
+
+@pytest.mark.parametrize("effect_size, is_paired", [
+    ("mean_diff", None), ("median_diff", None), ("cliffs_delta", None), ("hedges_g", "baseline"),
+])
+def test_sequential_permutations_stop_at_exceedances(effect_size, is_paired):
+    x0 = np.array(paired_wellbeing["pre"], dtype=float)
+    x1 = np.array(paired_wellbeing["post"], dtype=float)
+
+    full = PermutationTest(x0, x1, effect_size, is_paired, permutation_count=5000)
+    sequential = PermutationTest(x0, x1, effect_size, is_paired, permutation_count=5000,
+                                 sequential=True, exceedances=10)
+
+    # The sequential test runs the same permutations, up to the tenth
+    # exceedance.
+    used = sequential.permutations_used
+    threshold = abs(effsize._two_group_difference(x0, x1, is_paired, effect_size))
+    extreme = np.abs(full.permutations) > threshold
+    assert used == np.flatnonzero(extreme)[9] + 1
+    assert np.array_equal(sequential.permutations, full.permutations[:used])
+    assert sequential.pvalue == 10 / used
+    assert sequential.pvalue_se == pytest.approx(
+        sequential.pvalue * np.sqrt((1 - sequential.pvalue) / 10))
+
+
+def test_sequential_permutations_precision():
+    x0 = np.array(wellbeing["control"], dtype=float)
+    x1 = np.array(wellbeing["expt"], dtype=float) + 100
+
+    # No permutation is as extreme as the observed difference, so only the
+    # precision can stop the test.
+    perm_test = PermutationTest(x0, x1, "mean_diff", permutation_count=5000,
+                                sequential=True, precision=0.01)
+    assert perm_test.pvalue == 0
+    assert perm_test.permutations_used < 5000
+    assert perm_test.permutations_used % 100 == 0
+
+    full = PermutationTest(x0, x1, "mean_diff", permutation_count=5000, sequential=True)
+    assert full.permutations_used == full.permutation_count == 5000
+    assert full.pvalue_se == 0
+
+
+def test_sequential_permutations_in_results():
+    df = pd.DataFrame({"Control": wellbeing["control"], "Test": wellbeing["expt"]})
+    results = load(df, idx=("Control", "Test"), resamples=1000,
+                   sequential_permutations=dict(exceedances=5)).mean_diff.results
+    standalone = PermutationTest(df.Control, df.Test, "mean_diff", sequential=True, exceedances=5)
+
+    assert results.loc[0, "permutations_used"] == standalone.permutations_used < 5000
+    assert results.loc[0, "pvalue_permutation"] == standalone.pvalue
+    assert results.loc[0, "pvalue_permutation_se"] == standalone.pvalue_se
+    assert "permutations_used" not in load(df, idx=("Control", "Test")).mean_diff.results
+
+
+@pytest.mark.parametrize("effect_size, is_paired", [
+    ("mean_diff", None), ("median_diff", None), ("cohens_d", None), ("cliffs_delta", None),
+    ("mean_diff", "baseline"), ("median_diff", "baseline"), ("hedges_g", "baseline"),
+])
+def test_exact_permutations_match_enumeration(effect_size, is_paired):
+    x0 = np.array(wellbeing["control"][:6], dtype=float)
+    x1 = np.array(wellbeing["expt"][:6 if is_paired else 5], dtype=float)
+
+    if is_paired:
+        masks = np.array(list(itertools.product([False, True], repeat=6)))
+        groups = [(np.where(m, x1, x0), np.where(m, x0, x1)) for m in masks]
+    else:
+        bag = np.concatenate([x0, x1])
+        groups = []
+        for test_idx in itertools.combinations(range(11), 5):
+            m = np.isin(np.arange(11), test_idx)
+            groups.append((bag[~m], bag[m]))
+    expected = np.array([effsize._two_group_difference(c, t, None, effect_size)
+                         for c, t in groups])
+    observed = abs(effsize._two_group_difference(x0, x1, is_paired, effect_size))
+
+    perm_test = PermutationTest(x0, x1, effect_size, is_paired, exact=True)
+    assert perm_test.exact
+    assert perm_test.permutations_used == len(expected)
+    assert np.allclose(np.sort(perm_test.permutations), np.sort(expected))
+    assert perm_test.pvalue == np.mean(np.abs(expected) > observed * (1 + 1e-9))
+    assert perm_test.pvalue_se == 0
+
+
+@pytest.mark.parametrize("size", [None, 3])
+def test_exact_subsets_without_masks(size):
+    from dabest._effsize_objects import _exact_subsets
+    values = np.random.default_rng(19).normal(size=(7, 2))
+    masks, sums = _exact_subsets(values, size)
+    assert np.allclose(sums, masks @ values)
+    # The sums are the same, in the same order, without the masks.
+    no_masks, same_sums = _exact_subsets(values, size, masks=False)
+    assert no_masks is None
+    assert np.array_equal(sums, same_sums)
+
+
+def test_exact_permutations_fall_back_to_random():
+    x0 = np.array(paired_wellbeing["pre"], dtype=float)
+    x1 = np.array(paired_wellbeing["post"], dtype=float)
+    x0, x1 = np.concatenate([x0, x1]), np.concatenate([x1, x0 + 5])
+
+    perm_test = PermutationTest(x0, x1, "mean_diff", exact=True)
+    assert not perm_test.exact
+    assert perm_test.pvalue == PermutationTest(x0, x1, "mean_diff").pvalue
+
+    df = pd.DataFrame({"Control": wellbeing["control"], "Test": wellbeing["expt"]})
+    results = load(df, idx=("Control", "Test"), resamples=1000,
+                   exact_permutations=True).mean_diff.results
+    assert results.loc[0, "permutations_used"] == 184756
+
+
+def test_weighted_delta_reductions():
+    rng = np.random.default_rng(3)
+    differences = list(rng.normal(size=(12, 200)))
+    group_var = rng.uniform(0.5, 2, 12)
+    permutations_var = rng.uniform(0.5, 2, (12, 200))
+
+    expected = sum((1 / v) * d for d, v in zip(differences, group_var)) / np.sum(1 / group_var)
+    assert np.array_equal(ci2g.calculate_weighted_delta(group_var, differences), expected)
+
+    expected = [np.sum(np.array(differences)[:, i] / permutations_var[:, i]) /
+                np.sum(1 / permutations_var[:, i]) for i in range(200)]
+    assert np.allclose(ci2g.calculate_weighted_delta(permutations_var, differences), expected)
+
+
+def test_mini_meta_weighted_permutations():
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({f"{group}{i}": rng.normal(i * (group == "Test"), 1, 15)
+                       for i in range(10) for group in ("Control", "Test")})
+    idx = tuple((f"Control{i}", f"Test{i}") for i in range(10))
+    mean_diff = load(df, idx=idx, mini_meta=True, resamples=500).mean_diff
+    mini_meta_delta = mean_diff.mini_meta_delta
+
+    permutations = np.stack(mean_diff.results["permutations"])
+    weights = 1 / np.stack(mean_diff.results["permutations_var"])
+    expected = (weights * permutations).sum(axis=0) / weights.sum(axis=0)
+    assert np.allclose(mini_meta_delta.permutations_weighted_delta, expected)
+    assert mini_meta_delta.pvalue_permutation == np.mean(
+        np.abs(mini_meta_delta.permutations_weighted_delta) > abs(mini_meta_delta.difference))
+
+
+@pytest.mark.parametrize("lens, is_paired", [
+    ((8, 8, 8, 8), None), ((8, 10, 7, 9), None), ((9, 9, 9, 9), "baseline"), ((9, 9, 6, 6), "baseline"),
+])
+def test_batched_delta2_bootstraps_match_looped(lens, is_paired):
+    rng = np.random.default_rng(5)
+    x1, x2, x3, x4 = [rng.normal(size=n) for n in lens]
+
+    delta_g, _, deltadelta = ci2g.compute_delta2_bootstrapped_diff(x1, x2, x3, x4, is_paired,
+                                                                   resamples=300)
+
+    rng = RandomState(PCG64(12345))
+    expected = []
+    for _ in range(300):
+        if is_paired:
+            idx_1 = rng.choice(len(x1), len(x1), replace=True)
+            idx_2 = rng.choice(len(x3), len(x3), replace=True)
+            samples = x1[idx_1], x2[idx_1], x3[idx_2], x4[idx_2]
+        else:
+            samples = [rng.choice(x, len(x), replace=True) for x in (x1, x2, x3, x4)]
+        means = [np.mean(sample) for sample in samples]
+        expected.append((means[3] - means[2]) - (means[1] - means[0]))
+
+    assert np.array_equal(deltadelta, expected)
+    # Deltas' g only rescales the delta-deltas by the pooled standard deviation.
+    assert np.allclose(delta_g * (deltadelta[0] / delta_g[0]), deltadelta)
+
+
+@pytest.mark.parametrize("legacy_rng", [True, False])
+@pytest.mark.parametrize("is_paired", [None, "baseline"])
+@pytest.mark.parametrize("random_seed", [12345, SeedSequence(12345)])
+def test_delta2_batch_matches_separate_loads(is_paired, legacy_rng, random_seed):
+    rng = np.random.default_rng(6)
+    frames = []
+    # Two experiment sets share their group sizes; the third does not.
+    for name, n in [("A", 8), ("B", 8), ("C", 10)]:
+        for experiment in ["E1", "E2"]:
+            for genotype in ["W", "M"]:
+                frames.append(pd.DataFrame({
+                    "set": name, "genotype": genotype, "experiment": experiment,
+                    "id": ["{}{}{}".format(name, experiment, i) for i in range(n)],
+                    "y": rng.normal(size=n)}))
+    df = pd.concat(frames, ignore_index=True)
+
+    batch = dabest.load_delta2_batch(df, x=["genotype", "genotype"], y="y",
+                                     experiment="experiment", experiment_set="set",
+                                     paired=is_paired, id_col="id", resamples=500,
+                                     random_seed=random_seed, legacy_rng=legacy_rng)
+    assert list(batch) == ["A", "B", "C"]
+    assert len(batch.results) == 6
+
+    for i, name in enumerate(batch):
+        dabest_obj = load(df[df.set == name], x=["genotype", "genotype"], y="y",
+                          delta2=True, experiment="experiment",
+                          paired=is_paired, id_col="id", resamples=500,
+                          random_seed=random_seed, legacy_rng=legacy_rng)
+        for effect_size in ["mean_diff", "delta_g"]:
+            expected = getattr(dabest_obj, effect_size).delta_delta
+            result = batch.delta_deltas(effect_size)[i]
+            assert np.array_equal(result.bootstraps_delta_delta, expected.bootstraps_delta_delta)
+            assert np.array_equal(result.permutations_delta_delta,
+                                  expected.permutations_delta_delta)
+            for attr in ["difference", "bca_low", "bca_high", "pct_low", "pct_high",
+                         "pvalue_permutation"]:
+                assert result[attr] == getattr(expected, attr)
+
+
+@pytest.mark.parametrize("legacy_rng", [True, False])
+def test_paired_delta2_batch_aligns_subjects(legacy_rng):
+    rng = np.random.default_rng(8)
+    frames = []
+    for name, n in [("A", 8), ("B", 8), ("C", 10)]:
+        for experiment in ["E1", "E2"]:
+            for genotype in ["W", "M"]:
+                frames.append(pd.DataFrame({
+                    "set": name, "genotype": genotype, "experiment": experiment,
+                    "ID": ["{}{}{}".format(name, experiment, i) for i in range(n)],
+                    "y": rng.normal(size=n)}))
+    # The rows of the groups are not in the same subject order.
+    df = pd.concat(frames, ignore_index=True).sample(frac=1, random_state=3)
+    labels = dict(experiment_label=["E1", "E2"], x1_level=["W", "M"])
+
+    batch = dabest.load_delta2_batch(df, x=["genotype", "genotype"], y="y",
+                                     experiment="experiment", experiment_set="set",
+                                     paired="baseline", id_col="ID", resamples=500,
+                                     legacy_rng=legacy_rng, **labels)
+    for i, name in enumerate(batch):
+        dabest_obj = load(df[df.set == name], x=["genotype", "genotype"], y="y",
+                          delta2=True, experiment="experiment",
+                          paired="baseline", id_col="ID", resamples=500,
+                          legacy_rng=legacy_rng, **labels)
+        for effect_size in ["mean_diff", "delta_g"]:
+            expected = getattr(dabest_obj, effect_size).delta_delta
+            result = batch.delta_deltas(effect_size)[i]
+            assert np.array_equal(result.bootstraps_delta_delta, expected.bootstraps_delta_delta)
+            assert np.array_equal(result.permutations_delta_delta,
+                                  expected.permutations_delta_delta)
+            assert result["difference"] == expected.difference
+
+    duplicated = pd.concat([df, df.iloc[:1]])
+    with pytest.raises(ValueError, match="at most one observation per group"):
+        dabest.load_delta2_batch(duplicated, x=["genotype", "genotype"], y="y",
+                                 experiment="experiment", experiment_set="set",
+                                 paired="baseline", id_col="ID")
+    missing = df.drop(index=df[(df.set == "B") & (df.genotype == "M")].index[0])
+    with pytest.raises(ValueError, match="is not observed in every group"):
+        dabest.load_delta2_batch(missing, x=["genotype", "genotype"], y="y",
+                                 experiment="experiment", experiment_set="set",
+                                 paired="baseline", id_col="ID")
+
+
+def test_group_index_matches_scan():
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({"group": rng.choice(["a", "b", "c", "d"], size=200),
+                       "value": rng.normal(size=200)})
+    df.loc[rng.choice(200, size=10, replace=False), "value"] = np.nan
+    dabest_obj = load(df, x="group", y="value", idx=(("a", "b"), ("c", "d")))
+
+    plot_data = dabest_obj._plot_data
+    for name in ["a", "b", "c", "d"]:
+        expected = plot_data[plot_data["group"] == name]["value"].to_numpy()
+        assert np.array_equal(dabest_obj._group_data(name), expected)
+        assert np.array_equal(plot_data["value"].to_numpy()[dabest_obj._group_rows(name)],
+                              expected)
+
+
+@pytest.mark.parametrize("paired", ["baseline", "sequential"])
+def test_paired_data_aligned_by_subject(paired):
+    rng = np.random.default_rng(8)
+    n = 12
+    df = pd.DataFrame({"id": np.tile(np.arange(n), 3),
+                       "group": np.repeat(["a", "b", "c"], n),
+                       "value": rng.normal(size=3 * n)})
+    # Rows of the other groups listed in another subject order.
+    shuffled = pd.concat([df[df.group == "a"],
+                          df[df.group != "a"].sample(frac=1, random_state=1)])
+
+    results = [load(d, x="group", y="value", idx=("a", "b", "c"), paired=paired,
+                    id_col="id", resamples=500).mean_diff.results for d in (df, shuffled)]
+    for column in ["difference", "bca_low", "bca_high", "pvalue_permutation"]:
+        assert np.array_equal(results[0][column], results[1][column])
+
+
+def test_sankey_flows_aligned_by_subject():
+    import matplotlib.pyplot as plt
+
+    rng = np.random.default_rng(9)
+    n = 20
+    df = pd.DataFrame({"id": np.tile(np.arange(n), 2),
+                       "group": np.repeat(["a", "b"], n),
+                       "value": (rng.random(2 * n) < 0.5).astype(int)})
+    shuffled = pd.concat([df[df.group == "a"],
+                          df[df.group == "b"].sample(frac=1, random_state=1)])
+
+    vertices = []
+    for d in (df, shuffled):
+        fig = load(d, x="group", y="value", idx=("a", "b"), paired="baseline",
+                   id_col="id", proportional=True, resamples=100).mean_diff.plot()
+        vertices.append([c.get_paths()[0].vertices for c in fig.axes[0].collections])
+        plt.close(fig)
+    assert len(vertices[0]) == len(vertices[1])
+    for v0, v1 in zip(*vertices):
+        assert np.allclose(v0, v1)
+
+
+def test_paired_bootstraps_of_a_tuple():
+    rng = np.random.default_rng(9)
+    x = rng.normal(size=(15, 3))
+    pairs = [(0, 1), (0, 2), (1, 2)]
+    shared = ci2g.compute_paired_bootstrapped_diffs(x, pairs, ["mean_diff", "cohens_d"],
+                                                    resamples=400)
+    for (control, test), bootstraps in zip(pairs, shared):
+        expected = ci2g.compute_bootstrapped_diffs(x[:, control], x[:, test], "baseline",
+                                                   ["mean_diff", "cohens_d"], resamples=400)
+        for effect_size in ["mean_diff", "cohens_d"]:
+            assert np.array_equal(bootstraps[effect_size], expected[effect_size])
+
+
+@pytest.mark.parametrize("is_paired", [None, "baseline"])
+@pytest.mark.parametrize("effect_size", ["mean_diff", "cohens_h"])
+def test_proportion_bootstraps_match_resampling(is_paired, effect_size):
+    rng = np.random.default_rng(10)
+    x0 = (rng.random(50) < 0.4).astype(float)
+    x1 = (rng.random(50) < 0.6).astype(float)
+    counted = ci2g.compute_proportion_bootstrapped_diff(x0, x1, is_paired, effect_size,
+                                                        resamples=20000)
+    resampled = ci2g.compute_bootstrapped_diff(x0, x1, is_paired, effect_size,
+                                               resamples=20000)
+    assert counted.mean() == pytest.approx(resampled.mean(), abs=0.01)
+    assert counted.std() == pytest.approx(resampled.std(), rel=0.03)
+
+
+@pytest.mark.parametrize("is_paired", [None, "baseline"])
+def test_cohens_h_jackknife_closed_form(is_paired):
+    rng = np.random.default_rng(11)
+    x0 = (rng.random(20) < 0.3).astype(float)
+    x1 = (rng.random(20 if is_paired else 26) < 0.7).astype(float)
+    closed_form = ci2g.compute_meandiff_jackknife(x0, x1, is_paired, "cohens_h")
+    indexes = ci2g._create_two_group_jackknife_indexes(x0, x1, is_paired)
+    looped = [effsize.cohens_h(x0[i0], x1[i1]) for i0, i1 in indexes]
+    assert np.allclose(closed_form, looped, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("n_test", [7, 40])
+def test_cliffs_delta_jackknife_closed_form(n_test):
+    x0 = np.asarray(likert_control, dtype=float)[:25]
+    x1 = np.asarray(likert_treatment, dtype=float)[:n_test]
+    closed_form = ci2g.compute_meandiff_jackknife(x0, x1, None, "cliffs_delta")
+    indexes = ci2g._create_two_group_jackknife_indexes(x0, x1, None)
+    looped = [effsize.cliffs_delta(x0[i0], x1[i1]) for i0, i1 in indexes]
+    assert np.allclose(closed_form, looped, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("is_paired", [None, "baseline"])
+@pytest.mark.parametrize("effect_size", ["mean_diff", "cohens_h"])
+def test_proportion_permutations_match_reshuffles(is_paired, effect_size):
+    rng = np.random.default_rng(12)
+    x0 = (rng.random(40) < 0.4).astype(float)
+    x1 = (rng.random(40) < 0.65).astype(float)
+    counted = PermutationTest(x0, x1, effect_size, is_paired, 20000, proportional=True,
+                              legacy_rng=False)
+    reshuffled = PermutationTest(x0, x1, effect_size, is_paired, 20000)
+    assert counted.pvalue == pytest.approx(reshuffled.pvalue, abs=0.02)
+    assert counted.permutations.var() == pytest.approx(reshuffled.permutations.var(), rel=0.05)
+
+    # The legacy permutations reshuffle the observations as before.
+    legacy = PermutationTest(x0, x1, effect_size, is_paired, 20000, proportional=True)
+    assert np.array_equal(legacy.permutations, reshuffled.permutations)
+
+
+@pytest.mark.parametrize("is_paired", [None, "baseline"])
+def test_legacy_proportion_bootstraps_resample_observations(is_paired):
+    rng = np.random.default_rng(10)
+    x0 = (rng.random(30) < 0.4).astype(int)
+    x1 = (rng.random(30) < 0.6).astype(int)
+    df = pd.DataFrame({"id": np.tile(np.arange(30), 2), "group": np.repeat(["a", "b"], 30),
+                       "value": np.concatenate([x0, x1])})
+    result = load(df, x="group", y="value", idx=("a", "b"), proportional=True,
+                  paired=is_paired, id_col="id", resamples=500).mean_diff.results
+    expected = ci2g.compute_bootstrapped_diff(x0, x1, is_paired, "mean_diff", resamples=500)
+    assert np.array_equal(result["bootstraps"][0], expected)
+
+
+def test_mcnemar_table_from_counts():
+    df = pd.DataFrame({"id": np.tile(np.arange(8), 2),
+                       "group": np.repeat(["a", "b"], 8),
+                       "value": [0, 0, 0, 1, 1, 1, 1, 0,
+                                 0, 1, 1, 1, 0, 0, 1, 1]})
+    result = load(df, x="group", y="value", idx=("a", "b"), proportional=True,
+                  paired="baseline", id_col="id", resamples=500).mean_diff.results
+    # 1 (0, 0), 3 (0, 1), 2 (1, 0) and 2 (1, 1) pairs.
+    assert result["statistic_mcnemar"][0] == 2
+
+
+@pytest.mark.parametrize("effect_size", ["mean_diff", "median_diff", "cohens_d",
+                                         "hedges_g", "cliffs_delta"])
+def test_frequency_weights_match_expanded_data(effect_size):
+    rng = np.random.default_rng(13)
+    x0 = rng.integers(1, 6, 40).astype(float)
+    x1 = rng.integers(1, 6, 45).astype(float)
+    values, control_counts, test_counts = effsize._pooled_frequency_table(
+        x0, np.ones(40), x1, np.ones(45))
+
+    assert effsize._frequency_two_group_difference(
+        values, control_counts, test_counts, effect_size
+    ) == pytest.approx(effsize.two_group_difference(x0, x1, None, effect_size), abs=1e-12)
+
+    # Every observation of both groups is left out once.
+    jackknives, weights = ci2g.compute_frequency_jackknife(values, control_counts,
+                                                           test_counts, effect_size)
+    looped = [effsize.two_group_difference(np.delete(x0, i), x1, None, effect_size)
+              for i in range(40)]
+    looped += [effsize.two_group_difference(x0, np.delete(x1, i), None, effect_size)
+               for i in range(45)]
+    assert np.allclose(np.sort(np.repeat(jackknives, weights)), np.sort(looped),
+                       rtol=0, atol=1e-12)
+
+    counted = ci2g.compute_frequency_bootstrapped_diff(values, control_counts, test_counts,
+                                                       effect_size, resamples=20000)
+    resampled = ci2g.compute_bootstrapped_diff(x0, x1, None, effect_size, resamples=20000)
+    assert counted.std() == pytest.approx(resampled.std(), rel=0.05)
+
+
+def test_frequency_weights_statistical_tests():
+    rng = np.random.default_rng(14)
+    raw = pd.DataFrame({"group": np.repeat(["a", "b"], [120, 90]),
+                        "value": rng.integers(1, 8, 210).astype(float)})
+    counts = raw.groupby(["group", "value"]).size().rename("n").reset_index()
+    for effect_size, column in [("mean_diff", "pvalue_welch"),
+                                ("mean_diff", "pvalue_students_t"),
+                                ("mean_diff", "pvalue_mann_whitney"),
+                                ("median_diff", "pvalue_kruskal"),
+                                ("cliffs_delta", "pvalue_brunner_munzel")]:
+        expanded, weighted = [
+            getattr(load(df, x="group", y="value", idx=("a", "b"), resamples=500, **kwargs),
+                    effect_size).results
+            for df, kwargs in [(raw, {}), (counts, dict(weights="n"))]
+        ]
+        assert weighted["test_N"][0] == 90
+        assert weighted["difference"][0] == pytest.approx(expanded["difference"][0], abs=1e-12)
+        assert weighted[column][0] == pytest.approx(expanded[column][0], rel=1e-9)
+        assert weighted["pvalue_permutation"][0] == pytest.approx(
+            expanded["pvalue_permutation"][0], abs=0.05)
+
+
+def test_frequency_weights_of_proportions():
+    counts = dabest.prop_dataset({"a": [400, 100], "b": [30, 20]}, counts=True)
+    weighted = load(counts, x="group", y="value", idx=("a", "b"), weights="count",
+                    proportional=True, resamples=2000)
+    expanded = load(dabest.prop_dataset({"a": [400, 100], "b": [300, 200]}),
+                    idx=("a", "b"), proportional=True, resamples=2000)
+    assert weighted.mean_diff.results["difference"][0] == pytest.approx(0.2)
+    assert weighted.cohens_h.results["difference"][0] == pytest.approx(
+        effsize.cohens_h(np.repeat([0, 1], [400, 100]), np.repeat([0, 1], [30, 20])))
+    # Only the 4 distinct (group, value) rows are kept.
+    assert len(weighted._plot_data) == 4
+    assert len(expanded._plot_data) == 1000
+
+
+
+@pytest.mark.parametrize("constant", [False, True])
+def test_intervals_match_sorted_bootstraps(constant):
+    rng = np.random.default_rng(15)
+    bootstraps = np.full(3000, 0.5) if constant else rng.normal(0.3, 1, 3000)
+    bias, levels = ci2g.compute_intervals(bootstraps, 0.5, 0.01, [90, 95, 99.5])
+
+    assert bias == ci2g.norm.ppf(np.mean(bootstraps < 0.5))
+    sorted_bootstraps = np.sort(bootstraps)
+    for level in levels:
+        alpha = (100 - level["ci"]) / 100
+        bca_idx = ci2g.compute_interval_limits(bias, 0.01, 3000, level["ci"])
+        pct_idx = (int(alpha / 2 * 3000), int((1 - alpha / 2) * 3000))
+        assert level["pct_interval_idx"] == pct_idx
+        assert level["pct_low"] == sorted_bootstraps[pct_idx[0]]
+        assert level["pct_high"] == sorted_bootstraps[pct_idx[1]]
+        if constant:
+            assert np.isnan(level["bca_low"]) and np.isnan(level["bca_high"])
+        else:
+            assert level["bca_interval_idx"] == bca_idx
+            assert level["bca_low"] == sorted_bootstraps[bca_idx[0]]
+            assert level["bca_high"] == sorted_bootstraps[bca_idx[1]]
+
+
+def test_several_ci_levels_from_one_bootstrap_set():
+    columns = ["bca_low", "bca_high", "pct_low", "pct_high"]
+    several = load(wellbeing, idx=("control", "expt"), ci=[90, 95, 99],
+                   resamples=2000).mean_diff
+    assert "90%, 95%, 99% confidence intervals" in repr(several.dabest_obj)
+    assert several.results["ci"][0] == 90
+    assert list(several.intervals["ci"]) == [90, 95, 99]
+
+    for level in [90, 95, 99]:
+        single = load(wellbeing, idx=("control", "expt"), ci=level,
+                      resamples=2000).mean_diff.results
+        row = several.intervals[several.intervals.ci == level].iloc[0]
+        for column in columns:
+            assert row[column] == single[column][0]
+
+    # Other levels are derived from the same bootstraps, without resampling.
+    rederived = several.with_ci(80)
+    single = load(wellbeing, idx=("control", "expt"), ci=80,
+                  resamples=2000).mean_diff.results
+    assert rederived.results["ci"][0] == 80
+    assert rederived.results["bootstraps"][0] is several.results["bootstraps"][0]
+    assert several.results["ci"][0] == 90
+    for column in columns + ["pvalue_permutation", "pvalue_welch"]:
+        assert rederived.results[column][0] == single[column][0]
+
+
+def test_with_ci_of_delta_delta_and_mini_meta():
+    rng = np.random.default_rng(16)
+    df = pd.DataFrame({"genotype": np.tile(np.repeat(["W", "M"], 15), 2),
+                       "experiment": np.repeat(["E1", "E2"], 30),
+                       "y": rng.normal(size=60)})
+    kwargs = dict(x=["genotype", "experiment"], y="y", delta2=True,
+                  experiment="experiment", resamples=1000)
+    rederived = load(df, **kwargs).mean_diff.with_ci(99).delta_delta
+    expected = load(df, ci=99, **kwargs).mean_diff.delta_delta
+    for attr in ["bca_low", "bca_high", "pct_low", "pct_high"]:
+        assert getattr(rederived, attr) == getattr(expected, attr)
+
+    wide = pd.DataFrame(rng.normal(size=(20, 4)), columns=["A", "B", "C", "D"])
+    kwargs = dict(idx=(("A", "B"), ("C", "D")), mini_meta=True, resamples=1000)
+    rederived = load(wide, **kwargs).mean_diff.with_ci([99, 90]).mini_meta_delta
+    expected = load(wide, ci=90, **kwargs).mean_diff.mini_meta_delta
+    assert rederived.ci == 99
+    for attr in ["bca_low", "bca_high", "pct_low", "pct_high"]:
+        assert rederived.intervals.loc[90, attr] == getattr(expected, attr)
+
+
+@pytest.mark.parametrize("is_paired", [None, "baseline"])
+def test_spawned_streams_do_not_depend_on_chunks(is_paired):
+    rng = np.random.default_rng(17)
+    x0, x1 = rng.normal(size=30), rng.normal(size=30)
+    seed = SeedSequence(7)
+    bootstraps = ci2g.compute_bootstrapped_diff(x0, x1, is_paired, "mean_diff", 2500, seed)
+    chunked = ci2g.compute_bootstrapped_diff(x0, x1, is_paired, "mean_diff", 2500, seed,
+                                             memory_budget=5000)
+    assert np.array_equal(bootstraps, chunked)
+
+    # Each block only depends on its own child stream, so the blocks can be
+    # computed separately, e.g. by different workers.
+    _, batch_func = ci2g._bootstrap_batch_func(x0, x1, is_paired, "mean_diff")
+    children = SeedSequence(7).spawn(3)
+    def block(b, size):
+        stream = RandomState(PCG64(children[b]))
+        idx0, idx1 = next(ci2g._bootstrap_index_chunks([(stream, size)], 30, 30, is_paired))
+        return batch_func(idx0, idx1)
+    blocks = [block(b, size) for b, size in [(2, 500), (0, 1000), (1, 1000)]]
+    assert np.array_equal(bootstraps, np.concatenate([blocks[1], blocks[2], blocks[0]]))
+
+    for effect_size in ["mean_diff", "median_diff"]:
+        permutations = PermutationTest(x0, x1, effect_size, is_paired, 2500,
+                                       random_seed=seed).permutations
+        sequential = PermutationTest(x0, x1, effect_size, is_paired, 2500, random_seed=seed,
+                                     sequential=True, exceedances=2500).permutations
+        assert np.array_equal(permutations, sequential)
+
+    if is_paired:
+        return
+    # The resamples of frequency weighted groups do not depend on the chunks
+    # either.
+    c0, c1 = rng.integers(1, 6, 30), rng.integers(1, 6, 30)
+    table = effsize._pooled_frequency_table(x0, c0, x1, c1)
+    for random_seed, legacy_rng in itertools.product([12345, seed], [True, False]):
+        bootstraps, chunked = [
+            ci2g.compute_frequency_bootstrapped_diff(*table, "mean_diff", 2500, random_seed,
+                                                     memory_budget=memory_budget,
+                                                     legacy_rng=legacy_rng)
+            for memory_budget in [None, 500]
+        ]
+        assert np.array_equal(bootstraps, chunked)
+
+        permutations = PermutationTest(x0, x1, "mean_diff", None, 2500, random_seed=random_seed,
+                                       legacy_rng=legacy_rng, control_weights=c0,
+                                       test_weights=c1).permutations
+        sequential = PermutationTest(x0, x1, "mean_diff", None, 2500, random_seed=random_seed,
+                                     legacy_rng=legacy_rng, control_weights=c0,
+                                     test_weights=c1, sequential=True,
+                                     exceedances=2500).permutations
+        assert np.array_equal(permutations, sequential)
+
+
+def test_spawned_streams_per_comparison():
+    rng = np.random.default_rng(18)
+    df = pd.DataFrame({"A": rng.normal(size=20), "B": rng.normal(size=20)})
+    df["C"] = df["B"]
+    seed = SeedSequence(8)
+    results = load(df, idx=("A", "B", "C"), random_seed=seed, resamples=1000).mean_diff.results
+    # Identical comparisons draw from different streams.
+    assert not np.array_equal(results["bootstraps"][0], results["bootstraps"][1])
+
+    for k, test in enumerate(["B", "C"]):
+        alone = TwoGroupsEffectSize(df["A"], df[test], "mean_diff", resamples=1000,
+                                    random_seed=ci2g._spawn(seed, ci2g._COMPARISON_STREAMS, k))
+        assert np.array_equal(alone.bootstraps, results["bootstraps"][k])
+        assert alone.pvalue_permutation == results["pvalue_permutation"][k]
+
+    # The first comparison does not depend on the others.
+    alone = load(df, idx=("A", "B"), random_seed=seed, resamples=1000).mean_diff.results
+    assert np.array_equal(alone["bootstraps"][0], results["bootstraps"][0])
+
+
+@pytest.mark.parametrize("effect_size, is_paired", [
+    ("mean_diff", None), ("mean_diff", "baseline"), ("median_diff", None),
+    ("cliffs_delta", None), ("cohens_d", "baseline"),
+])
+def test_generator_bootstraps(effect_size, is_paired):
+    rng = np.random.default_rng(19)
+    x0, x1 = rng.normal(size=30), rng.normal(0.5, size=25 if not is_paired else 30)
+    bootstraps = ci2g.compute_bootstrapped_diff(x0, x1, is_paired, effect_size, 4000,
+                                                legacy_rng=False)
+    chunked = ci2g.compute_bootstrapped_diff(x0, x1, is_paired, effect_size, 4000,
+                                             memory_budget=5000, legacy_rng=False)
+    assert np.array_equal(bootstraps, chunked)
+
+    legacy = ci2g.compute_bootstrapped_diff(x0, x1, is_paired, effect_size, 4000)
+    assert np.array_equal(legacy, ci2g.compute_bootstrapped_diff(
+        x0, x1, is_paired, effect_size, 4000, legacy_rng=True))
+    assert not np.array_equal(bootstraps, legacy)
+    # Both streams sample the same bootstrap distribution.
+    assert abs(bootstraps.mean() - legacy.mean()) < 4 * legacy.std() / np.sqrt(4000) * np.sqrt(2)
+    assert abs(bootstraps.std() / legacy.std() - 1) < 0.1
+
+
+@pytest.mark.parametrize("paired", [None, "baseline"])
+def test_generator_rng_in_load(paired):
+    data, idx = (paired_wellbeing, ("pre", "post")) if paired else (wellbeing, ("control", "expt"))
+    kwargs = dict(idx=idx, paired=paired, id_col="ID" if paired else None, resamples=1000)
+    default = load(data, **kwargs).mean_diff.results
+    legacy = load(data, legacy_rng=True, **kwargs).mean_diff.results
+    assert np.array_equal(default["bootstraps"][0], legacy["bootstraps"][0])
+
+    dabest_obj = load(data, legacy_rng=False, **kwargs)
+    assert dabest_obj.legacy_rng is False
+    for effect_size in ["mean_diff", "hedges_g", "median_diff"]:
+        results = getattr(dabest_obj, effect_size).results
+        alone = TwoGroupsEffectSize(data[idx[0]], data[idx[1]], effect_size, is_paired=paired,
+                                    resamples=1000, legacy_rng=False)
+        # The shared bootstraps and permutations are those of the comparison alone.
+        assert np.allclose(alone.bootstraps, results["bootstraps"][0])
+        assert alone.pvalue_permutation == results["pvalue_permutation"][0]
+        assert not np.array_equal(results["bootstraps"][0], getattr(
+            load(data, **kwargs), effect_size).results["bootstraps"][0])
+
+
+def test_interval_limits_se_matches_replicates():
+    rng = np.random.default_rng(20)
+    replicates = np.sort(rng.normal(size=(400, 2000)), axis=1)
+    _, levels = ci2g.compute_intervals(replicates[0], 0., 0.)
+    low, high = levels[0]["pct_interval_idx"]
+    estimated = [ci2g.compute_interval_limits_se(r, levels)[0] for r in replicates]
+    assert np.allclose(np.mean(estimated, axis=0),
+                       [replicates[:, low].std(), replicates[:, high].std()], rtol=0.2)
+
+
+def test_sorted_bootstraps_of_adaptive_resamples():
+    rng = np.random.default_rng(23)
+    batches = [np.sort(rng.standard_cauchy(1000)) for _ in range(3)]
+    batches[1][-5:] = np.nan
+    ordered = np.empty(0)
+    for batch in batches:
+        ordered = ci2g._merge_sorted(ordered, batch)
+    expected = np.sort(np.concatenate(batches))
+    assert np.array_equal(ordered, expected, equal_nan=True)
+
+    bootstraps = rng.lognormal(size=3000)
+    for is_sorted, b in [(False, bootstraps), (True, np.sort(bootstraps))]:
+        bias, levels = ci2g.compute_intervals(b, 1., 0.01, [90, 95], is_sorted=is_sorted)
+        limits_se = ci2g.compute_interval_limits_se(b, levels, is_sorted=is_sorted)
+        if not is_sorted:
+            expected = bias, levels, limits_se
+    assert bias == expected[0]
+    assert levels == expected[1]
+    assert np.array_equal(limits_se, expected[2])
+
+
+def test_adaptive_resamples():
+    rng = np.random.default_rng(21)
+    control, test = rng.normal(size=30), rng.lognormal(0, 1, size=30)
+    result = TwoGroupsEffectSize(control, test, "mean_diff", resamples="auto")
+    assert result.resamples % 1000 == 0
+    assert len(result.bootstraps) == result.resamples
+    width = result.bca_high - result.bca_low
+    assert result.ci_limits_se <= 0.01 * width
+
+    # Every batch has its own stream, so a looser tolerance stops at a prefix.
+    loose = TwoGroupsEffectSize(control, test, "mean_diff", resamples="auto",
+                                resamples_tolerance=0.05)
+    assert loose.resamples < result.resamples
+    assert np.array_equal(loose.bootstraps, result.bootstraps[:loose.resamples])
+    first_batch = ci2g.compute_bootstrapped_diff(
+        control, test, None, "mean_diff", 1000, ci2g._spawn(SeedSequence(12345), 0))
+    assert np.array_equal(result.bootstraps[:1000], first_batch)
+
+    df = pd.DataFrame({"control": control, "test": test, "same": control + 0.1})
+    results = load(df, idx=("control", "test", "same"), resamples="auto").mean_diff.results
+    assert results["resamples"][0] == result.resamples
+    assert results["ci_limits_se"][0] == result.ci_limits_se
+    # A shifted copy of the control group is easier than a skewed group.
+    assert results["resamples"][1] < results["resamples"][0]
+
+
+def test_time_budget():
+    from time import perf_counter
+    rng = np.random.default_rng(22)
+    control, test = rng.normal(size=30), rng.lognormal(0, 1, size=30)
+    binary = (rng.random(30) < 0.4).astype(float), (rng.random(30) < 0.6).astype(float)
+
+    # An expired deadline still takes one chunk of permutations, which are
+    # the first permutations of a full test.
+    full = PermutationTest(control, test, "mean_diff", None)
+    expired = PermutationTest(control, test, "mean_diff", None, deadline=perf_counter())
+    assert expired.permutations_used == 100
+    assert np.array_equal(expired.permutations, full.permutations[:100])
+
+    # A tiny budget still takes the first batch of bootstraps, the first
+    # ones drawn without a budget.
+    result = TwoGroupsEffectSize(control, test, "mean_diff", time_budget=1e-9)
+    assert result.resamples == 1000
+    first_batch = ci2g.compute_bootstrapped_diff(control, test, None, "mean_diff", 1000)
+    assert np.array_equal(result.bootstraps, first_batch)
+    assert result.permutations_used == 100
+
+    # A generous budget is bounded by `resamples` and `permutation_count`,
+    # and gives the results drawn without a budget from the same seed.
+    for random_seed, legacy_rng in [(12345, True), (12345, False), (SeedSequence(12345), True),
+                                    (SeedSequence(12345), False)]:
+        for effect_size, proportional, data, is_paired in [
+            ("mean_diff", False, (control, test), "baseline"),
+            ("mean_diff", False, (control, test[:20]), None),
+            ("cohens_h", True, binary, "baseline"),
+        ]:
+            kwargs = dict(resamples=2500, permutation_count=500, random_seed=random_seed,
+                          legacy_rng=legacy_rng, is_paired=is_paired)
+            generous = TwoGroupsEffectSize(*data, effect_size, proportional,
+                                           time_budget=60, **kwargs)
+            assert generous.resamples == 2500
+            assert generous.permutations_used == 500
+            unbudgeted = TwoGroupsEffectSize(*data, effect_size, proportional, **kwargs)
+            assert np.array_equal(generous.bootstraps, unbudgeted.bootstraps)
+            assert np.array_equal(generous.permutations, unbudgeted.permutations)
+            assert generous.bca_low == unbudgeted.bca_low
+
+    df = pd.DataFrame({"control": control, "test": test})
+    results = load(df, idx=("control", "test"), time_budget=1e-9).mean_diff.results
+    assert results["resamples"][0] == 1000
+    for column in ["ci_limits_se", "permutations_used", "pvalue_permutation_se"]:
+        assert column in results.columns